@@ -0,0 +1,99 @@
+"""Benchmark do motor de liquidação (liquidacao.py).
+
+Gera um arquivo com `--instrucoes` transferências aleatórias entre `--contas` contas e mede
+a leitura em streaming e a liquidação. Para comparação, aplica as mesmas instruções uma a
+uma com Conta.transfere (só as `--sequencial` primeiras, extrapolando a vazão).
+
+    python benchmarks/bench_liquidacao.py --instrucoes 1000000 --formato jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cliente import Cliente  # noqa: E402
+from conta import Conta  # noqa: E402
+from liquidacao import Liquidacao, chave  # noqa: E402
+
+
+def make_contas(n, saldo):
+    return [Conta(Cliente(f'Cliente {i}', f'{i:011d}'), i % 10, i, f'pix{i}', saldo) for i in range(n)]
+
+
+def make_instrucoes(contas, n, seed):
+    rnd = random.Random(seed)
+    chaves = [f'{c.agencia}/{c.numero}' for c in contas]
+    for _ in range(n):
+        origem, destino = rnd.sample(chaves, 2)
+        yield origem, destino, rnd.randint(1, 50000) / 100
+
+
+def write_file(caminho, formato, instrucoes):
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        if formato == 'csv':
+            f.write('origem,destino,valor\n')
+            for origem, destino, valor in instrucoes:
+                f.write(f'{origem},{destino},{valor}\n')
+        else:
+            for origem, destino, valor in instrucoes:
+                f.write(json.dumps({'origem': origem, 'destino': destino, 'valor': valor}) + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--contas', type=int, default=10000)
+    parser.add_argument('--instrucoes', type=int, default=1000000)
+    parser.add_argument('--saldo', type=float, default=1000.0)
+    parser.add_argument('--formato', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--sequencial', type=int, default=100000,
+                        help='instruções aplicadas uma a uma com Conta.transfere para comparação')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    contas = make_contas(args.contas, args.saldo)
+    caminho = os.path.join(tempfile.mkdtemp(), f'instrucoes.{args.formato}')
+    write_file(caminho, args.formato, make_instrucoes(contas, args.instrucoes, args.seed))
+    print(f'{args.instrucoes} instruções, {args.contas} contas, arquivo {args.formato} '
+          f'({os.path.getsize(caminho) / 1e6:.1f} MB)')
+
+    start = time.perf_counter()
+    lote = Liquidacao('bench').carrega(caminho, args.formato)
+    carregado = time.perf_counter()
+    resultado = lote.liquida()
+    fim = time.perf_counter()
+    total = fim - start
+    print(f'leitura            {carregado - start:8.3f}s')
+    print(f'liquidação         {fim - carregado:8.3f}s')
+    print(f'total              {total:8.3f}s  {args.instrucoes / total:>12,.0f} instr/s')
+    print(f'aceitas {resultado.aceitas}, rejeitadas {resultado.rejeitadas}, '
+          f'histórico: {sum(len(c.historico) for c in contas)} entradas')
+    ok = not Conta.verifica_consistencia() and all(c.saldo >= 0 for c in contas)
+    print('conservação e saldos não negativos:', 'OK' if ok else 'FALHOU')
+    for c in contas:
+        c.encerra()
+
+    if args.sequencial:
+        contas = make_contas(args.contas, args.saldo)
+        por_chave = {(c.agencia, c.numero): c for c in contas}
+        n = min(args.sequencial, args.instrucoes)
+        instrucoes = list(make_instrucoes(contas, n, args.seed))
+        start = time.perf_counter()
+        for origem, destino, valor in instrucoes:
+            por_chave[chave(origem)].transfere(por_chave[chave(destino)], valor)
+        elapsed = time.perf_counter() - start
+        print(f'transfere (1 a 1)  {elapsed:8.3f}s  {n / elapsed:>12,.0f} instr/s  '
+              f'(sem leitura de arquivo, {n} instruções, '
+              f'histórico: {sum(len(c.historico) for c in contas)} entradas)')
+    os.remove(caminho)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
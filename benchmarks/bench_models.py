@@ -0,0 +1,108 @@
+"""Benchmark das conversões dos modelos (to_dict/from_dict).
+
+Compara a implementação anterior (dataclasses.asdict, `or` encadeado e try/except por
+linha) com os codecs especializados e com as conversões em lote (from_dicts/to_dicts).
+
+    python benchmarks/bench_models.py --rows 200000
+"""
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'funcionario', 'ifrn'))
+
+from empresa.models import Funcionario  # noqa: E402
+
+
+# Implementação anterior, mantida aqui só como referência de desempenho
+def legacy_to_dict(model):
+    data = asdict(model)
+    if data.get('created_at') and isinstance(data['created_at'], datetime):
+        data['created_at'] = data['created_at'].isoformat()
+    if data.get('updated_at') and isinstance(data['updated_at'], datetime):
+        data['updated_at'] = data['updated_at'].isoformat()
+    return data
+
+
+def legacy_from_dict(data):
+    created = data.get('created_at')
+    updated = data.get('updated_at')
+    try:
+        if isinstance(created, str):
+            created = datetime.fromisoformat(created)
+    except Exception:
+        created = created
+    try:
+        if isinstance(updated, str):
+            updated = datetime.fromisoformat(updated)
+    except Exception:
+        updated = updated
+    return Funcionario(
+        cpf=data.get('cpf') or data.get('id'),
+        pnome=data.get('pnome') or data.get('primeiro_nome') or '',
+        unome=data.get('unome') or data.get('ultimo_nome') or '',
+        data_nasc=data.get('data_nasc'),
+        endereco=data.get('endereco'),
+        salario=data.get('salario'),
+        sexo=data.get('sexo'),
+        cpf_supervisor=data.get('cpf_supervisor'),
+        numero_departamento=data.get('numero_departamento'),
+        created_at=created,
+        updated_at=updated,
+    )
+
+
+def make_rows(n):
+    stamp = '2025-10-17T12:30:00+00:00'
+    return [
+        {'cpf': f'{i:011d}', 'pnome': 'Ana', 'unome': 'Silva', 'data_nasc': '1990-01-01',
+         'endereco': 'Rua A', 'salario': 1000.0 + i, 'sexo': 'F', 'cpf_supervisor': None,
+         'numero_departamento': i % 50, 'created_at': stamp, 'updated_at': stamp}
+        for i in range(n)
+    ]
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows_count, repeat):
+    rows = make_rows(rows_count)
+    models = Funcionario.from_dicts(rows)
+    cases = [
+        ('from_dict (anterior)', lambda: [legacy_from_dict(r) for r in rows]),
+        ('from_dict', lambda: [Funcionario.from_dict(r) for r in rows]),
+        ('from_dicts (lote)', lambda: Funcionario.from_dicts(rows)),
+        ('to_dict (anterior)', lambda: [legacy_to_dict(m) for m in models]),
+        ('to_dict', lambda: [m.to_dict() for m in models]),
+        ('to_dicts (lote)', lambda: Funcionario.to_dicts(models)),
+    ]
+    results = {name: timed(fn, repeat) for name, fn in cases}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    print(f'{args.rows} linhas, melhor de {args.repeat}')
+    for name, seconds in results.items():
+        base = results['from_dict (anterior)'] if name.startswith('from') else results['to_dict (anterior)']
+        print(f'{name:22} {seconds * 1000:9.1f} ms  {args.rows / seconds:12,.0f} linhas/s  {base / seconds:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
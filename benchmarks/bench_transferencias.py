@@ -0,0 +1,127 @@
+"""Stress de transferências concorrentes entre contas (Conta.transfere).
+
+Roda `--threads` threads fazendo transferências aleatórias entre `--contas` contas e
+compara os locks por conta (adquiridos em ordem global) com um único lock global.
+Ao final confere que o saldo total foi conservado, que nenhum saldo ficou negativo e
+que os totais incrementais da classe batem com as contas (verifica_consistencia).
+
+Com o GIL, seções críticas só de CPU já rodam uma thread por vez e os dois modos ficam
+parecidos; `--latencia` simula E/S dentro da seção crítica (uma pausa a cada registro no
+histórico, como se ele fosse gravado em disco), que é onde os locks por conta deixam
+transferências entre contas diferentes andarem em paralelo.
+
+    python benchmarks/bench_transferencias.py --contas 1000 --threads 8 --ops 20000
+    python benchmarks/bench_transferencias.py --threads 8 --ops 500 --latencia 100
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cliente import Cliente  # noqa: E402
+from conta import Conta  # noqa: E402
+
+
+def make_contas(n, saldo, latencia=0.0):
+    contas = [Conta(Cliente(f'Cliente {i}', f'{i:011d}'), i % 10, i, f'pix{i}', saldo) for i in range(n)]
+    if latencia:
+        for c in contas:
+            c.historico.registra = com_latencia(c.historico.registra, latencia)
+    return contas
+
+
+# registro no histórico que espera `latencia` segundos (libera o GIL, como uma escrita em disco)
+def com_latencia(registra, latencia):
+    def registra_lento(*args, **kwargs):
+        time.sleep(latencia)
+        return registra(*args, **kwargs)
+    return registra_lento
+
+
+def run(contas, threads, ops, seed):
+    barreira = threading.Barrier(threads + 1)
+    falhas = []
+
+    def worker(k):
+        rnd = random.Random(seed + k)
+        maximo = contas[0].saldo
+        barreira.wait()
+        try:
+            for _ in range(ops):
+                origem, destino = rnd.sample(contas, 2)
+                origem.transfere(destino, rnd.randint(1, int(maximo)))
+        except Exception as e:  # pragma: no cover - só relatório
+            falhas.append(e)
+
+    ts = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for t in ts:
+        t.start()
+    barreira.wait()
+    start = time.perf_counter()
+    for t in ts:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if falhas:
+        raise falhas[0]
+    return elapsed
+
+
+def check(contas, esperado):
+    total = Conta.get_saldo_total()
+    soma = sum(c.saldo for c in contas)
+    negativos = sum(1 for c in contas if c.saldo < 0)
+    divergencias = Conta.verifica_consistencia()
+    ok = total == esperado and soma == esperado and not negativos and not divergencias
+    return ok, f'total={total} soma={soma} esperado={esperado} negativos={negativos} divergencias={len(divergencias)}'
+
+
+def bench(nome, contas, args, esperado):
+    elapsed = run(contas, args.threads, args.ops, args.seed)
+    transfers = args.threads * args.ops
+    ok, detalhe = check(contas, esperado)
+    print(f'{nome:<18} {transfers / elapsed:>12,.0f} transf/s  ({elapsed:.3f}s)  '
+          f'{"OK" if ok else "FALHOU"}  {detalhe}')
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--contas', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=20000, help='transferências por thread')
+    parser.add_argument('--saldo', type=int, default=1000, help='saldo inicial (inteiro, para conferência exata)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latencia', type=float, default=0.0,
+                        help='microssegundos de E/S simulada por registro no histórico (padrão: 0)')
+    args = parser.parse_args(argv)
+    if args.contas < 2:
+        parser.error('--contas deve ser pelo menos 2')
+
+    esperado = args.contas * args.saldo
+    latencia = args.latencia / 1e6
+    print(f'{args.contas} contas, {args.threads} threads x {args.ops} transferências'
+          + (f', {args.latencia:g} µs de E/S por registro' if latencia else ''))
+
+    contas = make_contas(args.contas, args.saldo, latencia)
+    ok = bench('lock por conta', contas, args, esperado)
+    for c in contas:
+        c.encerra()
+
+    contas = make_contas(args.contas, args.saldo, latencia)
+    global_lock = threading.RLock()
+    for c in contas:
+        c._lock = global_lock  # todas as contas compartilham o mesmo lock
+    ok = bench('lock global', contas, args, esperado) and ok
+    for c in contas:
+        c.encerra()
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
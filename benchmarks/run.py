@@ -0,0 +1,342 @@
+"""Suíte de benchmarks offline (MockClient, sem rede).
+
+Mede, para cada tamanho em `--sizes`:
+
+* dao.*        - CRUD do FuncionarioDAO sobre o MockClient: create_many/read_all/find em lote
+                 (linhas/s) e create/read/update/delete unitários (ops/s e latência p50/p95/p99)
+* models.*     - to_dicts/from_dicts e ida e volta (to_dict -> from_dict) de Funcionario
+* conta.*      - deposita/saca/transfere de Conta
+* bonificacoes.* - ControleDeBonificacoes.registra e registra_many
+
+O resultado vai para JSON (`--output`). Com `--compare base.json`, compara com uma execução
+anterior e termina com código 1 se alguma vazão cair (ou latência subir) mais que `--threshold`.
+
+    python benchmarks/run.py --sizes 1000,100000 --output atual.json
+    python benchmarks/run.py --sizes 1000,100000 --compare atual.json --threshold 0.15
+    python benchmarks/run.py --sizes 1000000 --only dao,models
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# classes bancárias e de bonificação (raiz do repositório); importadas antes de incluir
+# funcionario/ifrn no path, que tem um funcionario.py que esconderia o package funcionario/
+from cliente import Cliente  # noqa: E402
+from conta import Conta  # noqa: E402
+from funcionario.controle_de_bonificacoes import ControleDeBonificacoes  # noqa: E402
+from funcionario.funcionario import Funcionario as FuncionarioBonificado  # noqa: E402
+
+sys.path.insert(0, os.path.join(ROOT, 'funcionario', 'ifrn'))
+
+from empresa.config.mock_client import MockClient  # noqa: E402
+from empresa.dao.funcionario_dao import FuncionarioDAO  # noqa: E402
+from empresa.models import Funcionario  # noqa: E402
+
+# operações unitárias (create/read/update/delete) por tamanho - a latência é por chamada
+SAMPLE_OPS = 2000
+DEFAULT_SIZES = '1000,100000'
+DEFAULT_THRESHOLD = 0.10
+
+CASES = {}
+
+
+def case(group):
+    def register(fn):
+        CASES[f'{group}.{fn.__name__}'] = fn
+        return fn
+    return register
+
+
+# --- medição ---
+
+def throughput(fn, ops, repeat):
+    '''Melhor tempo de `repeat` execuções de fn() (que processa `ops` itens)'''
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return {'ops': ops, 'seconds': best, 'ops_per_s': ops / best if best else float('inf')}
+
+
+def latency(fn, args):
+    '''Chama fn(arg) para cada arg, medindo cada chamada'''
+    samples = []
+    gc.collect()
+    total_start = time.perf_counter()
+    for arg in args:
+        start = time.perf_counter_ns()
+        fn(arg)
+        samples.append(time.perf_counter_ns() - start)
+    total = time.perf_counter() - total_start
+    samples.sort()
+
+    def pct(p):
+        return samples[min(len(samples) - 1, int(p * len(samples)))] / 1000
+
+    return {
+        'ops': len(samples), 'seconds': total, 'ops_per_s': len(samples) / total if total else float('inf'),
+        'p50_us': pct(0.50), 'p95_us': pct(0.95), 'p99_us': pct(0.99),
+    }
+
+
+# --- dados ---
+
+def make_rows(n, offset=0):
+    stamp = '2025-10-17T12:30:00+00:00'
+    return [
+        {'cpf': f'{i:011d}', 'pnome': 'Ana', 'unome': 'Silva', 'data_nasc': '1990-01-01',
+         'endereco': 'Rua A', 'salario': 1000.0 + i % 5000, 'sexo': 'F', 'cpf_supervisor': None,
+         'numero_departamento': i % 50, 'created_at': stamp, 'updated_at': stamp}
+        for i in range(offset, offset + n)
+    ]
+
+
+def loaded_dao(size):
+    dao = FuncionarioDAO(MockClient())
+    dao.create_many(Funcionario.from_dicts(make_rows(size)))
+    return dao
+
+
+def sample_keys(size, ops, seed=42):
+    rnd = random.Random(seed)
+    return [f'{rnd.randrange(size):011d}' for _ in range(min(ops, size))]
+
+
+# --- casos ---
+
+@case('dao')
+def create_many(size, repeat):
+    models = Funcionario.from_dicts(make_rows(size))
+    return throughput(lambda: FuncionarioDAO(MockClient()).create_many(models), size, repeat)
+
+
+@case('dao')
+def create(size, repeat):
+    dao = loaded_dao(size)
+    models = Funcionario.from_dicts(make_rows(min(SAMPLE_OPS, size), offset=size))
+    return latency(dao.create, models)
+
+
+@case('dao')
+def read(size, repeat):
+    dao = loaded_dao(size)
+    return latency(dao.read, sample_keys(size, SAMPLE_OPS))
+
+
+@case('dao')
+def read_all(size, repeat):
+    dao = loaded_dao(size)
+    return throughput(dao.read_all, size, repeat)
+
+
+@case('dao')
+def find_indexed(size, repeat):
+    dao = loaded_dao(size)
+    # 50 departamentos: cada consulta devolve size/50 linhas pelo índice de numero_departamento
+    return throughput(lambda: [dao.by_departamento(d) for d in range(50)], size, repeat)
+
+
+@case('dao')
+def update(size, repeat):
+    dao = loaded_dao(size)
+    models = []
+    for cpf in sample_keys(size, SAMPLE_OPS):
+        model = Funcionario.from_dict(make_rows(1)[0])
+        model.cpf, model.salario = cpf, 2000.0
+        models.append(model)
+    return latency(lambda model: dao.update(model.cpf, model), models)
+
+
+@case('dao')
+def delete(size, repeat):
+    dao = loaded_dao(size)
+    keys = list(dict.fromkeys(sample_keys(size, SAMPLE_OPS)))
+    return latency(dao.delete, keys)
+
+
+@case('models')
+def to_dicts(size, repeat):
+    models = Funcionario.from_dicts(make_rows(size))
+    return throughput(lambda: Funcionario.to_dicts(models), size, repeat)
+
+
+@case('models')
+def from_dicts(size, repeat):
+    rows = make_rows(size)
+    return throughput(lambda: Funcionario.from_dicts(rows), size, repeat)
+
+
+@case('models')
+def round_trip(size, repeat):
+    models = Funcionario.from_dicts(make_rows(size))
+    return throughput(lambda: [Funcionario.from_dict(m.to_dict()) for m in models], size, repeat)
+
+
+def _contas(n):
+    return [Conta(Cliente(f'Cliente {i}', f'{i:011d}'), i % 10, i, f'pix{i}', 1000.0) for i in range(n)]
+
+
+def _encerra(contas):
+    for c in contas:
+        c.encerra()
+
+
+@case('conta')
+def deposita(size, repeat):
+    contas = _contas(100)
+    try:
+        return throughput(lambda: [contas[i % 100].deposita(1.0) for i in range(size)], size, repeat)
+    finally:
+        _encerra(contas)
+
+
+@case('conta')
+def saca(size, repeat):
+    contas = _contas(100)
+    try:
+        # metade dos saques é negada quando o saldo acaba (os dois caminhos entram na medida)
+        return throughput(lambda: [contas[i % 100].saca(1.0) for i in range(size)], size, repeat)
+    finally:
+        _encerra(contas)
+
+
+@case('conta')
+def transfere(size, repeat):
+    contas = _contas(100)
+    pares = [(contas[i % 100], contas[(i * 7 + 1) % 100]) for i in range(size)]
+    try:
+        return throughput(lambda: [o.transfere(d, 1.0) for o, d in pares], size, repeat)
+    finally:
+        _encerra(contas)
+
+
+class _Gerente(FuncionarioBonificado):
+    # mesma taxa de funcionario/gerente.py, que não é importável junto com o package
+    # (faz `from funcionario import Funcionario`)
+    __slots__ = ()
+    _taxa_bonificacao = 0.2
+
+
+def _funcionarios(size):
+    return [_Gerente(f'G{i}', f'{i:011d}', 5000.0 + i % 100) if i % 10 == 0
+            else FuncionarioBonificado(f'F{i}', f'{i:011d}', 1000.0 + i % 100) for i in range(size)]
+
+
+@case('bonificacoes')
+def registra(size, repeat):
+    objs = _funcionarios(size)
+
+    def run():
+        controle = ControleDeBonificacoes()
+        for obj in objs:
+            controle.registra(obj)
+        return controle.total
+    return throughput(run, size, repeat)
+
+
+@case('bonificacoes')
+def registra_many(size, repeat):
+    objs = _funcionarios(size)
+    return throughput(lambda: ControleDeBonificacoes().registra_many(objs), size, repeat)
+
+
+# --- execução e comparação ---
+
+def run(sizes, repeat, only=None):
+    results = {}
+    for size in sizes:
+        for name, fn in CASES.items():
+            if only and name.split('.')[0] not in only and name not in only:
+                continue
+            key = f'{name}@{size}'
+            results[key] = result = fn(size, repeat)
+            extra = f"  p50 {result['p50_us']:8.1f}us  p95 {result['p95_us']:8.1f}us  p99 {result['p99_us']:8.1f}us" \
+                if 'p50_us' in result else ''
+            print(f"{key:32} {result['ops_per_s']:>14,.0f} ops/s{extra}", flush=True)
+    return results
+
+
+# Métricas comparadas: vazão (maior é melhor) e latências (menor é melhor)
+# (o p99 fica só no relatório: com SAMPLE_OPS chamadas ele varia demais entre execuções)
+HIGHER_IS_BETTER = ('ops_per_s',)
+LOWER_IS_BETTER = ('p50_us', 'p95_us')
+
+
+def compare(baseline, current, threshold):
+    regressions = []
+    for key, result in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            if metric not in result or not base.get(metric):
+                continue
+            change = result[metric] / base[metric] - 1
+            worse = change < -threshold if metric in HIGHER_IS_BETTER else change > threshold
+            if worse:
+                regressions.append((key, metric, base[metric], result[metric], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'tamanhos separados por vírgula (padrão {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=3, help='execuções por caso de vazão (vale a melhor)')
+    parser.add_argument('--only', default='', help='grupos ou casos, ex.: dao,conta.transfere')
+    parser.add_argument('--output', help='arquivo JSON com os resultados')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON de uma execução anterior')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'variação relativa tolerada na comparação (padrão {DEFAULT_THRESHOLD})')
+    parser.add_argument('--list', action='store_true', help='lista os casos e sai')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print('\n'.join(CASES))
+        return 0
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    only = {s for s in args.only.split(',') if s}
+
+    results = run(sizes, args.repeat, only)
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Resultados salvos em {args.output}')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f'\nRegressões acima de {args.threshold:.0%}:')
+            for key, metric, before, after, change in regressions:
+                print(f'  {key} {metric}: {before:,.1f} -> {after:,.1f} ({change:+.1%})')
+            return 1
+        print(f'\nSem regressões acima de {args.threshold:.0%} em relação a {args.compare}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,29 +1,130 @@
-from historico import Historico
-from functools import reduce
+import math
+import threading
+import weakref
+from collections import deque
+from contextlib import ExitStack
+from itertools import count
+from historico import Historico, DEPOSITO, SAQUE, SAQUE_NEGADO, EXTRATO, TRANSFERENCIA
 
 class Conta:
 
-	# Atributo de classe
-	_total_contas = 0
-	_lista_contas = []
+	# Atributos de classe
+	# * Registro fraco: uma conta sem outras referências é coletada e sai do registro
+	# * Totais mantidos a cada operação, então as leituras abaixo são O(1)
+	# * Concorrência: cada conta tem seu lock; os totais da classe têm um lock próprio,
+	#   segurado só durante a atualização dos contadores
+	_registro = weakref.WeakValueDictionary()   # id interno -> conta
+	_por_chave = weakref.WeakValueDictionary()  # (agencia, numero) -> conta
+	_saldos = {}                                # id interno -> saldo (sobrevive à coleta para o ajuste final)
+	_agencias = {}                              # id interno -> agência
+	_saldo_total = 0
+	_saldo_por_agencia = {}
+	_contas_por_agencia = {}
+	_ids = count(1)
+	_lock_totais = threading.RLock()
+	# contas coletadas aguardando saída dos totais (o finalizador pode rodar em qualquer
+	# ponto de qualquer thread, então só enfileira; o ajuste é feito sob o lock)
+	_pendentes = deque()
 
 	# Métodos estáticos
 	@staticmethod
 	def total_contas():
-		return Conta._total_contas
+		with Conta._lock_totais:
+			Conta._processa_pendentes()
+			return len(Conta._saldos)
 
 	@staticmethod
 	def lista_contas():
-		return Conta._lista_contas
+		return list(Conta._registro.values())
 
 	@staticmethod
 	def get_saldo_total():
-		return reduce(lambda soma, conta: soma + conta.saldo, Conta._lista_contas, 0)
+		with Conta._lock_totais:
+			Conta._processa_pendentes()
+			return Conta._saldo_total
+
+	@staticmethod
+	def get_saldo_agencia(agencia):
+		with Conta._lock_totais:
+			Conta._processa_pendentes()
+			return Conta._saldo_por_agencia.get(agencia, 0)
+
+	@staticmethod
+	def total_contas_agencia(agencia):
+		with Conta._lock_totais:
+			Conta._processa_pendentes()
+			return Conta._contas_por_agencia.get(agencia, 0)
+
+	@staticmethod
+	def busca(agencia, numero):
+		return Conta._por_chave.get((agencia, numero))
+
+	# verifica_consistencia - recalcula os totais a partir das contas vivas e
+	# retorna a lista de divergências (vazia quando os totais incrementais estão corretos)
+	# (deve ser chamado sem operações em andamento)
+	@staticmethod
+	def verifica_consistencia(tolerancia=1e-6):
+		contas = Conta.lista_contas()
+		Conta.total_contas()  # processa as contas coletadas pendentes
+		divergencias = []
+		if len(contas) != Conta.total_contas():
+			divergencias.append(f'total_contas: {Conta.total_contas()} != {len(contas)} contas vivas')
+		total = math.fsum(c._saldo for c in contas)
+		if not math.isclose(total, Conta._saldo_total, abs_tol=tolerancia):
+			divergencias.append(f'saldo total: {Conta._saldo_total} != {total}')
+		por_agencia = {}
+		quantidade = {}
+		for c in contas:
+			por_agencia[c.agencia] = por_agencia.get(c.agencia, 0) + c._saldo
+			quantidade[c.agencia] = quantidade.get(c.agencia, 0) + 1
+			if not math.isclose(Conta._saldos.get(c._id, math.nan), c._saldo, abs_tol=tolerancia):
+				divergencias.append(f'saldo da conta {c.agencia}/{c.numero}: {Conta._saldos.get(c._id)} != {c._saldo}')
+		for agencia in set(por_agencia) | set(Conta._saldo_por_agencia):
+			esperado = por_agencia.get(agencia, 0)
+			if not math.isclose(Conta._saldo_por_agencia.get(agencia, 0), esperado, abs_tol=tolerancia):
+				divergencias.append(f'saldo da agência {agencia}: {Conta._saldo_por_agencia.get(agencia, 0)} != {esperado}')
+			if Conta._contas_por_agencia.get(agencia, 0) != quantidade.get(agencia, 0):
+				divergencias.append(f'contas da agência {agencia}: {Conta._contas_por_agencia.get(agencia, 0)} != {quantidade.get(agencia, 0)}')
+		return divergencias
 
 	# Métodos de classe
 	@classmethod
 	def total_contas_cm(cls):
-		return cls._total_contas
+		return cls.total_contas()
+
+	@staticmethod
+	def _registra(conta):
+		with Conta._lock_totais:
+			Conta._processa_pendentes()
+			conta._id = next(Conta._ids)
+			Conta._registro[conta._id] = conta
+			Conta._por_chave[(conta.agencia, conta.numero)] = conta
+			Conta._saldos[conta._id] = conta._saldo
+			Conta._agencias[conta._id] = conta.agencia
+			Conta._saldo_total += conta._saldo
+			Conta._saldo_por_agencia[conta.agencia] = Conta._saldo_por_agencia.get(conta.agencia, 0) + conta._saldo
+			Conta._contas_por_agencia[conta.agencia] = Conta._contas_por_agencia.get(conta.agencia, 0) + 1
+		# chamado quando a conta é coletada (ou em encerra())
+		conta._finalizador = weakref.finalize(conta, Conta._pendentes.append, conta._id)
+
+	@staticmethod
+	def _processa_pendentes():
+		# chamado com _lock_totais adquirido
+		while Conta._pendentes:
+			Conta._desregistra(Conta._pendentes.popleft())
+
+	@staticmethod
+	def _desregistra(id_conta):
+		saldo = Conta._saldos.pop(id_conta, None)
+		if saldo is None:
+			return
+		agencia = Conta._agencias.pop(id_conta)
+		Conta._saldo_total -= saldo
+		Conta._saldo_por_agencia[agencia] -= saldo
+		Conta._contas_por_agencia[agencia] -= 1
+		if not Conta._contas_por_agencia[agencia]:
+			del Conta._contas_por_agencia[agencia]
+			del Conta._saldo_por_agencia[agencia]
 
 	def __init__(self, cliente, agencia, numero, pix, saldo):
 		self.cliente = cliente # agregação
@@ -32,8 +133,35 @@ class Conta:
 		self.pix = pix
 		self._saldo = saldo
 		self.historico = Historico() # composição
-		Conta._total_contas += 1
-		Conta._lista_contas.append(self)
+		self._lock = threading.RLock()
+		Conta._registra(self)
+
+	# encerra - remove a conta do registro e dos totais imediatamente
+	def encerra(self):
+		with self._lock, Conta._lock_totais:
+			self._finalizador()
+			Conta._processa_pendentes()
+			Conta._registro.pop(self._id, None)
+			if Conta._por_chave.get((self.agencia, self.numero)) is self:
+				del Conta._por_chave[(self.agencia, self.numero)]
+
+	# Toda alteração de saldo passa por aqui para manter os totais da classe
+	# (chamado com o lock da conta adquirido)
+	def _ajusta_saldo(self, delta):
+		Conta._ajusta_saldos(((self, delta),))
+
+	# _ajusta_saldos - aplica [(conta, delta), ...] em uma única seção curta de _lock_totais,
+	# então os totais nunca mostram só uma das pernas de uma transferência
+	# (chamado com os locks das contas adquiridos)
+	@staticmethod
+	def _ajusta_saldos(pares):
+		with Conta._lock_totais:
+			for conta, delta in pares:
+				conta._saldo += delta
+				if conta._id in Conta._saldos:  # conta encerrada não entra mais nos totais
+					Conta._saldos[conta._id] = conta._saldo
+					Conta._saldo_total += delta
+					Conta._saldo_por_agencia[conta.agencia] += delta
 
 	## Decorator - property
 	@property
@@ -60,32 +188,47 @@ class Conta:
 	# 		self._saldo = saldo
 
 	def deposita(self, valor):
-		self._saldo += valor
-		self.historico.transacoes.append(f"✅ Depósito de R$ {valor:.2f}")
+		with self._lock:
+			self._ajusta_saldo(valor)
+			self.historico.registra(DEPOSITO, valor, self._saldo)
 
 	def saca(self, valor):
-		if self._saldo < valor:
-			self.historico.transacoes.append(
-					f"❌ Saldo insuficiente. Saque: R$ {valor:.2f} - Saldo R$ {self._saldo:.2f}"
-			)
-			return False
-		else:
-			self._saldo -= valor
-			self.historico.transacoes.append(f"⛔ Saque de R$ {valor:.2f}")
-			return True
+		with self._lock:
+			if self._saldo < valor:
+				self.historico.registra(SAQUE_NEGADO, valor, self._saldo)
+				return False
+			else:
+				self._ajusta_saldo(-valor)
+				self.historico.registra(SAQUE, valor, self._saldo)
+				return True
 
 	def extrato(self):
-		self.historico.transacoes.append(f"❗ Extrato. Saldo R$ {self._saldo:.2f}")
+		with self._lock:
+			self.historico.registra(EXTRATO, 0.0, self._saldo)
+			saldo = self._saldo
 		print(
-				f"Titular: {self.cliente.nome}\nCPF: {self.cliente.cpf}\nAgência: {self.agencia}\nNúmero: {self.numero}\nPIX: {self.pix}\nSaldo: {self._saldo:.2f}\n"
+				f"Titular: {self.cliente.nome}\nCPF: {self.cliente.cpf}\nAgência: {self.agencia}\nNúmero: {self.numero}\nPIX: {self.pix}\nSaldo: {saldo:.2f}\n"
 		)
 
+	# trava - adquire os locks das contas sempre na mesma ordem global (id interno,
+	# único e crescente), então duas transferências cruzadas nunca ficam em deadlock
+	@staticmethod
+	def trava(*contas):
+		pilha = ExitStack()
+		for conta in sorted({c._id: c for c in contas}.values(), key=lambda c: c._id):
+			pilha.enter_context(conta._lock)
+		return pilha
+
+	# transfere - atômica: saque e depósito acontecem com as duas contas travadas; as duas
+	# pernas entram nos totais juntas (_ajusta_saldos), sem segurar _lock_totais durante a
+	# transferência inteira, então transferências entre outras contas seguem em paralelo
 	def transfere(self, destino, valor):
-		self.historico.transacoes.append(
-			f"❗ Transferência para {destino.cliente.nome}"
-		)
-		if self.saca(valor):
-			destino.deposita(valor)
-			return True
-		else:
-			return False
\ No newline at end of file
+		with Conta.trava(self, destino):
+			self.historico.registra(TRANSFERENCIA, valor, self._saldo, destino.cliente.nome)
+			if self._saldo < valor:
+				self.historico.registra(SAQUE_NEGADO, valor, self._saldo)
+				return False
+			Conta._ajusta_saldos(((self, -valor), (destino, valor)))
+			self.historico.registra(SAQUE, valor, self._saldo)
+			destino.historico.registra(DEPOSITO, valor, destino._saldo)
+			return True
\ No newline at end of file
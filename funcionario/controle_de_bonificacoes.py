@@ -1,5 +1,52 @@
+from array import array
+from math import fsum
 from .funcionario import Funcionario
 
+try:
+  import numpy as np
+except ImportError:  # NumPy é opcional: sem ele as somas usam math.fsum
+  np = None
+
+
+# Soma de um array('d') de salários
+def _soma(salarios):
+  if np is not None:
+    return float(np.frombuffer(salarios, dtype='float64').sum()) if len(salarios) else 0.0
+  return fsum(salarios)
+
+
+class ResultadoBonificacoes:
+  '''
+  Resultado de ControleDeBonificacoes.registra_many
+  * subtotais - {nome da classe: total de bonificações}
+  * quantidades - {nome da classe: funcionários registrados}
+  * rejeitados - objetos que não são Funcionario (em vez de um print por objeto)
+  * total - soma dos subtotais deste lote
+  '''
+
+  __slots__ = ['subtotais', 'quantidades', 'rejeitados']
+
+  def __init__(self):
+    self.subtotais = {}
+    self.quantidades = {}
+    self.rejeitados = []
+
+  @property
+  def total(self):
+    return sum(self.subtotais.values())
+
+  def _acumula(self, classe, valor, quantidade):
+    self.subtotais[classe] = self.subtotais.get(classe, 0) + valor
+    self.quantidades[classe] = self.quantidades.get(classe, 0) + quantidade
+
+  def __str__(self):
+    linhas = [f'{classe}: R$ {valor:.2f} ({self.quantidades[classe]})' for classe, valor in self.subtotais.items()]
+    linhas.append(f'Total = R$ {self.total:.2f}')
+    if self.rejeitados:
+      linhas.append(f'Rejeitados: {len(self.rejeitados)}')
+    return '\n'.join(linhas)
+
+
 class ControleDeBonificacoes:
 
   __slots__ = ['_total']
@@ -15,6 +62,42 @@ class ControleDeBonificacoes:
     else:
       print(f'Instância de {obj.__class__.__name__} não implementa o método get_bonificacao()')
 
+  # registra_many - registra vários objetos de uma vez
+  # * agrupa por classe concreta e, para classes que só trocam a taxa (_taxa_bonificacao),
+  #   soma os salários em um array e faz uma única multiplicação pela taxa
+  # * classes que reescrevem get_bonificacao() são calculadas objeto a objeto
+  # * objetos que não são Funcionario vão para `rejeitados` no resultado
+  def registra_many(self, objs):
+    resultado = ResultadoBonificacoes()
+    salarios_por_classe = {}
+    for obj in objs:
+      classe = obj.__class__
+      salarios = salarios_por_classe.get(classe)
+      if salarios is None:
+        if not isinstance(obj, Funcionario):
+          resultado.rejeitados.append(obj)
+          continue
+        if classe.get_bonificacao is not Funcionario.get_bonificacao:
+          resultado._acumula(classe.__name__, obj.get_bonificacao(), 1)
+          continue
+        salarios = salarios_por_classe[classe] = array('d')
+      salarios.append(obj._salario)
+
+    for classe, salarios in salarios_por_classe.items():
+      resultado._acumula(classe.__name__, _soma(salarios) * classe._taxa_bonificacao, len(salarios))
+    self._total += resultado.total
+    return resultado
+
+  # registra_salarios - caminho por arrays: bonificação de um array de salários com a mesma taxa
+  # (ex.: a coluna 'salario' de um ColumnFrame). Retorna o subtotal registrado.
+  def registra_salarios(self, salarios, taxa = Funcionario._taxa_bonificacao):
+    if np is not None:
+      subtotal = float(np.asarray(salarios, dtype='float64').sum()) * taxa
+    else:
+      subtotal = fsum(salarios) * taxa
+    self._total += subtotal
+    return subtotal
+
   @property
   def total(self):
-    return self._total
\ No newline at end of file
+    return self._total
@@ -2,13 +2,16 @@ class Funcionario:
   
   __slots__ = ['_nome', '_cpf', '_salario']
 
+  # Percentual da bonificação sobre o salário (subclasses podem trocar só a taxa)
+  _taxa_bonificacao = 0.1
+
   def __init__(self, nome, cpf, salario):
     self._nome = nome
     self._cpf = cpf
     self._salario = salario
   
   def get_bonificacao(self):
-    return self._salario * 0.1
+    return self._salario * self._taxa_bonificacao
 
   def __str__(self):
     return f'Funcionario(Nome: {self._nome}, CPF: {self._cpf}, Salário: {self._salario:.2f})'
@@ -4,14 +4,14 @@ class Gerente(Funcionario):
 
   __slots__ = ['_senha', '_qtd_gerenciaveis']
 
+  # Reescrita da taxa: get_bonificacao() herdado passa a usar 20%
+  _taxa_bonificacao = 0.2
+
   def __init__(self, nome, cpf, salario, senha, qtd_gerenciaveis):
     super().__init__(nome, cpf, salario)
     self._senha = senha
     self._qtd_gerenciaveis = qtd_gerenciaveis
 
-  def get_bonificacao(self):
-    return self._salario * 0.2
-
   def __str__(self):
       return f'{super().__str__()}\nGerente(Senha: {self._senha}, Qtd. Ger.: {self._qtd_gerenciaveis})'
 
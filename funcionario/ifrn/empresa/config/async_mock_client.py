@@ -0,0 +1,42 @@
+"""Versão assíncrona do MockClient, para testar e medir os DAOs assíncronos sem rede.
+
+`execute()` é uma corrotina; `latency` (segundos) simula o tempo de ida e volta de cada
+requisição, o que permite comparar a vazão sequencial com a de `gather` localmente.
+"""
+
+import asyncio
+from typing import Optional
+
+from empresa.config.mock_client import MockClient, _MockTable
+
+
+class _AsyncMockTable:
+
+    def __init__(self, table: _MockTable, latency: float):
+        self._table = table
+        self._latency = latency
+
+    # métodos do query builder (select, eq, order, ...) são repassados e encadeáveis
+    def __getattr__(self, name: str):
+        method = getattr(self._table, name)
+
+        def chain(*args, **kwargs):
+            method(*args, **kwargs)
+            return self
+        return chain
+
+    async def execute(self):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return self._table.execute()
+
+
+class AsyncMockClient:
+    """Envolve um MockClient (ou LocalClient); os dados ficam no cliente síncrono `client`."""
+
+    def __init__(self, client: Optional[MockClient] = None, latency: float = 0.0):
+        self.client = client if client is not None else MockClient()
+        self.latency = latency
+
+    def table(self, name: str) -> _AsyncMockTable:
+        return _AsyncMockTable(self.client.table(name), self.latency)
@@ -1,38 +1,304 @@
 # Módulo de conexão com o Supabase
+# * O SDK do Supabase e o python-dotenv só são importados quando uma conexão é criada,
+#   para que importar este módulo (e o caminho do mock) continue barato
+import hashlib
+import json
 import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
 
-# Carrega as variáveis de ambiente
-load_dotenv()
+if TYPE_CHECKING:
+  from supabase import Client, AsyncClient
+
+# Tamanho padrão do pool de clients
+DEFAULT_POOL_SIZE = 4
+# Validade (segundos) do resultado do teste de conexão guardado em disco
+PROBE_CACHE_TTL = 300
+PROBE_CACHE_FILE = os.path.join(tempfile.gettempdir(), 'pabd2025-supabase-probe.json')
+
+_env_loaded = False
+
+
+# Carrega as variáveis de ambiente do .env (uma única vez, sob demanda)
+def load_environment() -> None:
+  global _env_loaded
+  if not _env_loaded:
+    try:
+      from dotenv import load_dotenv
+      load_dotenv()
+    except ImportError:
+      # sem python-dotenv, valem apenas as variáveis já definidas no ambiente
+      pass
+    _env_loaded = True
+
+
+def _create_client(url: str, key: str) -> 'Client':
+  from supabase import create_client
+  return create_client(url, key)
 
 class SupabaseConnection:
   '''
   Padrão de Projeto - Singleton
   * Garante apenas uma instância em toda a aplicação
+  * A criação é protegida por lock: threads concorrentes recebem a mesma instância
   '''
   _instance = None
+  _pool = None
+  _lock = threading.Lock()
+  _probe_cache: Dict[str, dict] = {}
   # Type Hint
   # * Garante o tipo de dado a ser atribuído a um atributo/variável
-  _client: Client = None
+  _client: 'Client' = None
+  _async_client: 'AsyncClient' = None
 
   # new - cria a instância da classe
   def __new__(cls):
     if cls._instance is None:
-      cls._instance = super(SupabaseConnection, cls).__new__(cls)
-      cls._instance._init_connection()
+      with cls._lock:
+        # double-checked locking: outra thread pode ter criado enquanto esperávamos
+        if cls._instance is None:
+          instance = super(SupabaseConnection, cls).__new__(cls)
+          instance._init_connection()
+          cls._instance = instance
     return cls._instance
   
   def _init_connection(self):
+    supabase_url, supabase_key = self._credentials()
+    self._client = _create_client(supabase_url, supabase_key)
+    print('Conexão com Supabase ✅')
+
+  @staticmethod
+  def _credentials():
+    load_environment()
     supabase_url = os.getenv('SUPABASE_URL')
     supabase_key = os.getenv('SUPABASE_KEY')
 
     if not supabase_url or not supabase_key:
       raise ValueError('Erro nas variáveis de ambiente ❌')
+    return supabase_url, supabase_key
+
+  # Client assíncrono (usado pelos DAOs async) - também único na aplicação
+  @classmethod
+  async def async_client(cls) -> 'AsyncClient':
+    if cls._async_client is None:
+      from supabase import acreate_client
+      supabase_url, supabase_key = cls._credentials()
+      cls._async_client = await acreate_client(supabase_url, supabase_key)
+      print('Conexão assíncrona com Supabase ✅')
+    return cls._async_client
+
+  # Modo pool - um SupabasePool compartilhado com `size` clients (cada um com sua sessão HTTP)
+  # * O tamanho só é usado na primeira chamada
+  @classmethod
+  def pool(cls, size: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = None) -> 'SupabasePool':
+    if cls._pool is None:
+      with cls._lock:
+        if cls._pool is None:
+          supabase_url, supabase_key = cls._credentials()
+          cls._pool = SupabasePool(lambda: _create_client(supabase_url, supabase_key), size, timeout)
+    return cls._pool
+
+  @property
+  def client(self) -> 'Client': # Type Hint
+    return self._client
+
+  # Indica se as variáveis de ambiente do Supabase estão definidas (não importa o SDK)
+  @staticmethod
+  def configured() -> bool:
+    load_environment()
+    return bool(os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_KEY'))
+
+  # Testa se o Supabase responde com as credenciais atuais
+  # * O resultado fica em memória e em disco por `ttl` segundos (por URL/chave), então
+  #   execuções seguidas não repetem a requisição de teste
+  # * Sem credenciais ou com falha em cache, retorna False sem importar o SDK
+  @classmethod
+  def probe(cls, ttl: float = PROBE_CACHE_TTL, cache_file: Optional[str] = PROBE_CACHE_FILE) -> bool:
+    if not cls.configured():
+      return False
+    cache_key = hashlib.sha256(f"{os.getenv('SUPABASE_URL')}|{os.getenv('SUPABASE_KEY')}".encode()).hexdigest()
+    cached = cls._probe_cache.get(cache_key)
+    if cached is None and cache_file:
+      try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+          cached = json.load(f).get(cache_key)
+      except (OSError, ValueError):
+        cached = None
+    if cached is not None and time.time() - cached['at'] < ttl:
+      cls._probe_cache[cache_key] = cached
+      return cached['ok']
+
+    ok = cls._probe_now()
+    cached = {'ok': ok, 'at': time.time()}
+    cls._probe_cache[cache_key] = cached
+    if cache_file:
+      try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+          json.dump({cache_key: cached}, f)
+      except OSError:
+        pass
+    return ok
+
+  @staticmethod
+  def _probe_now() -> bool:
+    try:
+      probe = SupabaseConnection().client.table('departamento').select('numero').limit(1).execute()
+      # se responder com status_code 401/403 ou payload de erro, considere inválido
+      bad_status = getattr(probe, 'status_code', None) in (401, 403)
+      bad_data = isinstance(getattr(probe, 'data', None), dict) and probe.data.get('code') in (401, 403)
+      return not (bad_status or bad_data)
+    except Exception:
+      return False
+
+
+class PoolTimeout(Exception):
+  '''Nenhum client ficou livre dentro do tempo de espera do pool'''
 
-    self._client = create_client(supabase_url, supabase_key)
-    print('Conexão com Supabase ✅')
+
+class SupabasePool:
+  '''
+  Pool de clients seguro entre threads
+  * Os clients são criados sob demanda até `size` e reaproveitados (keep-alive das sessões HTTP)
+  * `checkout`/`checkin` ou o context manager `connection()` emprestam um client por operação
+  * `table(nome)` tem a mesma interface do Client: o client é devolvido ao pool no `execute()`,
+    então os DAOs podem receber o pool no lugar de um Client
+  * `stats()` informa saturação e tempo de espera
+  '''
+
+  def __init__(self, factory: Callable[[], 'Client'], size: int = DEFAULT_POOL_SIZE,
+               timeout: Optional[float] = None):
+    if size < 1:
+      raise ValueError('size deve ser maior que zero')
+    self._factory = factory
+    self._size = size
+    self._timeout = timeout
+    self._idle = deque()
+    self._created = 0
+    self._in_use = 0
+    self._cond = threading.Condition()
+    # métricas
+    self._checkouts = 0
+    self._waits = 0
+    self._wait_seconds = 0.0
+    self._max_wait_seconds = 0.0
+    self._peak_in_use = 0
+    self._timeouts = 0
+
+  def checkout(self, timeout: Optional[float] = None) -> 'Client':
+    timeout = self._timeout if timeout is None else timeout
+    with self._cond:
+      create = False
+      if not self._idle and self._created >= self._size:
+        started = time.perf_counter()
+        self._waits += 1
+        ok = self._cond.wait_for(lambda: self._idle or self._created < self._size, timeout)
+        waited = time.perf_counter() - started
+        self._wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        if not ok:
+          self._timeouts += 1
+          raise PoolTimeout(f'Nenhum client livre após {timeout:.3f}s (pool com {self._size})')
+      if self._idle:
+        client = self._idle.pop()
+      else:
+        # reserva a vaga antes de criar o client fora do lock
+        self._created += 1
+        create = True
+      self._in_use += 1
+      self._checkouts += 1
+      self._peak_in_use = max(self._peak_in_use, self._in_use)
+    if create:
+      try:
+        client = self._factory()
+      except Exception:
+        with self._cond:
+          self._created -= 1
+          self._in_use -= 1
+          self._cond.notify()
+        raise
+    return client
+
+  def checkin(self, client: 'Client') -> None:
+    with self._cond:
+      self._idle.append(client)
+      self._in_use -= 1
+      self._cond.notify()
+
+  @contextmanager
+  def connection(self, timeout: Optional[float] = None) -> Iterator['Client']:
+    client = self.checkout(timeout)
+    try:
+      yield client
+    finally:
+      self.checkin(client)
+
+  # Mesma interface de Client.table - empresta um client até o execute()
+  def table(self, name: str) -> '_PooledQuery':
+    client = self.checkout()
+    return _PooledQuery(self, client, client.table(name))
 
   @property
-  def client(self) -> Client: # Type Hint
-    return self._client
\ No newline at end of file
+  def size(self) -> int:
+    return self._size
+
+  def stats(self) -> Dict[str, float]:
+    with self._cond:
+      return {
+        'size': self._size,
+        'created': self._created,
+        'in_use': self._in_use,
+        'idle': len(self._idle),
+        'saturation': self._in_use / self._size,
+        'peak_in_use': self._peak_in_use,
+        'checkouts': self._checkouts,
+        'waits': self._waits,
+        'timeouts': self._timeouts,
+        'wait_seconds_total': self._wait_seconds,
+        'wait_seconds_max': self._max_wait_seconds,
+        'wait_seconds_avg': self._wait_seconds / self._waits if self._waits else 0.0,
+      }
+
+
+class _PooledQuery:
+  '''
+  Query builder de um client emprestado pelo pool
+  * Repassa os métodos encadeáveis (select, eq, order, ...) ao builder real
+  * Devolve o client ao pool ao executar (ou se for descartado sem executar)
+  '''
+
+  def __init__(self, pool: SupabasePool, client: 'Client', builder):
+    self._pool = pool
+    self._client = client
+    self._builder = builder
+    self._released = False
+
+  def __getattr__(self, name: str):
+    if name.startswith('_'):
+      raise AttributeError(name)
+    attr = getattr(self._builder, name)
+    if not callable(attr):
+      return attr
+
+    def chain(*args, **kwargs):
+      self._builder = attr(*args, **kwargs)
+      return self
+    return chain
+
+  def execute(self):
+    try:
+      return self._builder.execute()
+    finally:
+      self._release()
+
+  def _release(self):
+    if not self._released:
+      self._released = True
+      self._pool.checkin(self._client)
+
+  def __del__(self):
+    if hasattr(self, '_pool'):
+      self._release()
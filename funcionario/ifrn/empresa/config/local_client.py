@@ -0,0 +1,259 @@
+"""Cliente local persistente: o MockClient gravado em disco.
+
+Mesma interface de `table().select/insert/upsert/update/delete/eq().execute()` do
+MockClient (e do Supabase), mas os dados sobrevivem entre execuções:
+
+* toda alteração é acrescentada a um log (`wal.jsonl`, uma linha JSON por alteração)
+  e o arquivo é descarregado ao final de cada `execute()`;
+* a cada `snapshot_every` alterações o estado é compactado em `snapshot.bin` e o log
+  é zerado;
+* ao abrir, o snapshot é mapeado em memória (mmap) e cada tabela só é desserializada
+  no primeiro acesso, então abrir um diretório com milhões de linhas custa apenas a
+  leitura do índice do snapshot e do log pendente;
+* valores gravados e filtros passam para a forma JSON (datas em texto ISO, como o
+  PostgREST devolve), então o estado em memória é o mesmo antes e depois de reabrir.
+
+Uso:
+    with LocalClient('dados/') as client:
+        FuncionarioDAO(client).create(...)
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from empresa.config.mock_client import MockClient, _MockTable, _MockTableStore
+
+SNAPSHOT_FILE = 'snapshot.bin'
+WAL_FILE = 'wal.jsonl'
+# Cabeçalho do snapshot; o rodapé guarda a posição do índice de tabelas
+_MAGIC = b'PABDSNP1'
+_FOOTER = struct.Struct('<Q')
+
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+# Valor na forma em que volta do log (e do PostgREST): datas em ISO, demais tipos em texto
+def _to_json(value: Any) -> Any:
+    if value.__class__ in _JSON_SCALARS:
+        return value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_to_json(v) for v in value]
+    return str(value)
+
+
+def _json_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    for value in row.values():
+        if value.__class__ not in _JSON_SCALARS:
+            return _to_json(row)
+    return row
+
+
+class _LocalTable(_MockTable):
+
+    ### Valores normalizados na entrada (payloads e filtros)
+    def insert(self, payload):
+        return super().insert(self._json_payload(payload))
+
+    def upsert(self, payload, *args, **kwargs):
+        return super().upsert(self._json_payload(payload), *args, **kwargs)
+
+    def update(self, payload):
+        return super().update(_json_row(payload))
+
+    def eq(self, field, value):
+        return super().eq(field, _to_json(value))
+
+    def neq(self, field, value):
+        return super().neq(field, _to_json(value))
+
+    def gt(self, field, value):
+        return super().gt(field, _to_json(value))
+
+    def gte(self, field, value):
+        return super().gte(field, _to_json(value))
+
+    def lt(self, field, value):
+        return super().lt(field, _to_json(value))
+
+    def lte(self, field, value):
+        return super().lte(field, _to_json(value))
+
+    def in_(self, field, values):
+        return super().in_(field, [_to_json(v) for v in values])
+
+    @staticmethod
+    def _json_payload(payload):
+        if isinstance(payload, list):
+            return [_json_row(row) for row in payload]
+        return _json_row(payload)
+
+    def execute(self):
+        with self.client._lock:
+            try:
+                return super().execute()
+            finally:
+                self.client._commit()
+
+
+class LocalClient(MockClient):
+    """MockClient persistido em `path` (diretório criado se não existir).
+
+    * `snapshot_every` - alterações no log antes de compactar automaticamente
+    * `fsync` - força `os.fsync` do log a cada `execute()` (mais durável, mais lento)
+    * `primary_keys`/`indexes`/`clock`/`sorted_indexes` - como no MockClient
+    """
+
+    def __init__(self, path: str, snapshot_every: int = 100_000, fsync: bool = False,
+                 primary_keys: Optional[Dict[str, str]] = None,
+                 indexes: Optional[Dict[str, List[str]]] = None,
+                 clock: Optional[Callable[[], datetime]] = None,
+                 sorted_indexes: Optional[Dict[str, List[str]]] = None):
+        super().__init__(primary_keys=primary_keys, indexes=indexes, clock=clock,
+                         sorted_indexes=sorted_indexes)
+        self._path = path
+        self._snapshot_every = snapshot_every
+        self._fsync = fsync
+        self._lock = threading.RLock()
+        self._snapshot_file = None
+        self._snapshot_map: Optional[mmap.mmap] = None
+        # tabela -> (posição, tamanho) do blob no snapshot, para carga sob demanda
+        self._snapshot_index: Dict[str, Tuple[int, int]] = {}
+        self._wal_entries = 0
+        os.makedirs(path, exist_ok=True)
+        self._open_snapshot()
+        self._replay_wal()
+        self._wal = open(os.path.join(path, WAL_FILE), 'a', encoding='utf-8')
+
+    def __enter__(self) -> 'LocalClient':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def table(self, name: str) -> _LocalTable:
+        return _LocalTable(self, name)
+
+    def _table_store(self, name: str) -> _MockTableStore:
+        table = self._tables.get(name)
+        if table is None:
+            if name in self._snapshot_index:
+                offset, size = self._snapshot_index[name]
+                table = pickle.loads(self._snapshot_map[offset:offset + size])
+                self._tables[name] = table
+            else:
+                table = super()._table_store(name)
+            table.listener = self._listener(name)
+        return table
+
+    ### Log de alterações
+
+    def _listener(self, name: str):
+        def log(op: str, rid: int, row: Optional[Dict[str, Any]]) -> None:
+            entry = {'t': name, 'o': op, 'id': rid}
+            if row is not None:
+                entry['r'] = row
+            # datas/datetimes viram texto ISO, como chegariam do Supabase
+            self._wal.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            self._wal_entries += 1
+        return log
+
+    def _commit(self) -> None:
+        self._wal.flush()
+        if self._fsync:
+            os.fsync(self._wal.fileno())
+        if self._wal_entries >= self._snapshot_every:
+            self.compact()
+
+    def _replay_wal(self) -> None:
+        wal_path = os.path.join(self._path, WAL_FILE)
+        if not os.path.exists(wal_path):
+            return
+        good = 0
+        with open(wal_path, 'rb') as wal:
+            for line in wal:
+                # última linha incompleta (processo interrompido no meio da escrita): sem o
+                # '\n' final ou com JSON inválido, descarta dali em diante
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                table = self._table_store(entry['t'])
+                table.apply(entry['o'], entry['id'], entry.get('r'))
+                self._wal_entries += 1
+                good += len(line)
+        if good < os.path.getsize(wal_path):
+            # corta o resto antes de reabrir em modo append; senão as próximas entradas ficariam
+            # depois da linha quebrada e seriam perdidas no replay seguinte
+            with open(wal_path, 'r+b') as wal:
+                wal.truncate(good)
+
+    ### Snapshot
+
+    def _open_snapshot(self) -> None:
+        snapshot_path = os.path.join(self._path, SNAPSHOT_FILE)
+        if not os.path.exists(snapshot_path) or os.path.getsize(snapshot_path) == 0:
+            return
+        self._snapshot_file = open(snapshot_path, 'rb')
+        self._snapshot_map = mmap.mmap(self._snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._snapshot_map[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f'Snapshot inválido em {snapshot_path}')
+        (index_offset,) = _FOOTER.unpack(self._snapshot_map[-_FOOTER.size:])
+        self._snapshot_index = pickle.loads(self._snapshot_map[index_offset:-_FOOTER.size])
+
+    def compact(self) -> None:
+        """Grava um novo snapshot com o estado atual e zera o log."""
+        with self._lock:
+            snapshot_path = os.path.join(self._path, SNAPSHOT_FILE)
+            tmp_path = snapshot_path + '.tmp'
+            index: Dict[str, Tuple[int, int]] = {}
+            with open(tmp_path, 'wb') as out:
+                out.write(_MAGIC)
+                for name in set(self._snapshot_index) | set(self._tables):
+                    if name in self._tables:
+                        blob = pickle.dumps(self._tables[name], protocol=pickle.HIGHEST_PROTOCOL)
+                    else:
+                        # tabela nunca acessada: copia o blob antigo sem desserializar
+                        offset, size = self._snapshot_index[name]
+                        blob = self._snapshot_map[offset:offset + size]
+                    index[name] = (out.tell(), len(blob))
+                    out.write(blob)
+                index_offset = out.tell()
+                out.write(pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+                out.write(_FOOTER.pack(index_offset))
+                out.flush()
+                os.fsync(out.fileno())
+            self._close_snapshot()
+            os.replace(tmp_path, snapshot_path)
+            # o log só é zerado depois que o snapshot novo está no lugar
+            self._wal.close()
+            self._wal = open(os.path.join(self._path, WAL_FILE), 'w', encoding='utf-8')
+            self._wal_entries = 0
+            self._open_snapshot()
+
+    def _close_snapshot(self) -> None:
+        if self._snapshot_map is not None:
+            self._snapshot_map.close()
+            self._snapshot_map = None
+        if self._snapshot_file is not None:
+            self._snapshot_file.close()
+            self._snapshot_file = None
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._wal.closed:
+                self._wal.flush()
+                self._wal.close()
+            self._close_snapshot()
@@ -0,0 +1,737 @@
+"""Cliente Supabase em memória (mock) para demonstrações e testes sem rede.
+
+Implementa a mesma interface encadeada do client do Supabase usada pelos DAOs:
+`client.table(nome).select/insert/upsert/update/delete(...).eq(...).execute()`.
+
+Consultas aceitam filtros encadeados (`eq`, `neq`, `gt`, `gte`, `lt`, `lte`, `in_`, `like`),
+`order`, `limit`/`range`, projeção de colunas e agregados (`salario.sum()`, `count()`). Igualdades usam os índices de valor e faixas
+e ordenações com limite usam índices ordenados (bisect), em O(log n + k) como um índice
+B-tree do Postgres, em vez de varrer a tabela.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+
+class _MockResponse:
+    def __init__(self, data=None, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+
+class _MockAPIError(Exception):
+    """Erro equivalente ao `APIError` do postgrest (ex.: violação de chave primária)."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.code = code
+
+
+# Chaves primárias e índices secundários padrão das tabelas do exemplo
+DEFAULT_PRIMARY_KEYS = {'funcionario': 'cpf', 'departamento': 'numero'}
+DEFAULT_INDEXES = {'funcionario': ['numero_departamento', 'cpf_supervisor'], 'departamento': ['gerente_cpf']}
+# Colunas com índice ordenado (faixas gt/gte/lt/lte e order + limit); a chave primária sempre tem
+DEFAULT_SORTED_INDEXES = {
+    'funcionario': ['salario', 'created_at', 'updated_at'],
+    'departamento': ['created_at', 'updated_at'],
+}
+# Filtros que viram faixa em um índice ordenado
+_RANGE_OPS = ('eq', 'gt', 'gte', 'lt', 'lte')
+_COMPARISONS = ('gt', 'gte', 'lt', 'lte')
+# Agregado no select: [alias:][coluna.]função()
+_AGGREGATE = re.compile(r'(?:(\w+):)?(?:(\w+)\.)?(count|sum|avg|min|max)\(\)')
+# Inserções pendentes incorporadas com insort; acima disso o índice ordenado é reordenado
+_INSORT_LIMIT = 256
+
+
+class ManualClock:
+    """Relógio controlado para testes: `MockClient(clock=ManualClock())`.
+
+    Cada chamada devolve o instante atual e avança `step` segundos (padrão 0: só muda com
+    `advance`), então as escritas recebem `updated_at` previsíveis.
+    """
+
+    def __init__(self, start: Optional[datetime] = None, step: float = 0.0):
+        self.now = start or datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.step = timedelta(seconds=step)
+
+    def __call__(self) -> datetime:
+        now = self.now
+        self.now += self.step
+        return now
+
+    def advance(self, seconds: float = 1.0) -> datetime:
+        self.now += timedelta(seconds=seconds)
+        return self.now
+
+
+class _SortedIndex:
+    """Índice ordenado de uma coluna: valores em ordem crescente com os ids internos.
+
+    Mantido de forma preguiçosa, para não pesar nas escritas em massa:
+
+    * só é montado na primeira consulta que o usa (ordenando a tabela uma vez);
+    * inserções vão para `pending` e entram na próxima consulta (insort, se forem poucas,
+      senão a lista é reordenada);
+    * remoções e alterações só trocam a geração vigente do id em `current`; a entrada antiga
+      continua na lista, é ignorada nas consultas e descartada na próxima reordenação.
+
+    Nulos ficam fora da lista (`nulls`). Se os valores não forem comparáveis entre si (ex.:
+    texto e número), o índice é desativado e as consultas voltam a varrer a tabela.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.built = False
+        self.usable = True
+        self._reset()
+
+    def _reset(self) -> None:
+        self.keys: List[Any] = []                      # valores, em ordem
+        self.entries: List[tuple] = []                 # (id interno, geração), na posição do valor
+        self.current: Dict[int, tuple] = {}            # id interno -> (valor, geração) vigente
+        self.nulls: Set[int] = set()
+        self.pending: List[tuple] = []                 # (valor, id interno, geração) fora de ordem
+        self.stale = 0
+        self._generation = 0
+
+    def add(self, rid: int, value: Any) -> None:
+        if not self.built:
+            return
+        self._generation += 1
+        self.current[rid] = (value, self._generation)
+        if value is None:
+            self.nulls.add(rid)
+        else:
+            self.pending.append((value, rid, self._generation))
+
+    def discard(self, rid: int) -> None:
+        if not self.built:
+            return
+        entry = self.current.pop(rid, None)
+        if entry is not None:
+            if entry[0] is None:
+                self.nulls.discard(rid)
+            else:
+                self.stale += 1
+
+    def settle(self, rows: Dict[int, Dict[str, Any]]) -> bool:
+        """Deixa o índice em ordem para consulta; False se ele não puder ser usado."""
+        if not self.usable:
+            return False
+        try:
+            if not self.built:
+                self.built = True
+                self._generation = 1
+                self.current = {rid: (row.get(self.field), 1) for rid, row in rows.items()}
+                self.nulls = {rid for rid, (value, _) in self.current.items() if value is None}
+                self._rebuild()
+            elif len(self.pending) > _INSORT_LIMIT or self.stale > len(self.keys) // 2 + _INSORT_LIMIT:
+                self._rebuild()
+            elif self.pending:
+                for value, rid, generation in self.pending:
+                    pos = bisect_right(self.keys, value)
+                    self.keys.insert(pos, value)
+                    self.entries.insert(pos, (rid, generation))
+                self.pending.clear()
+        except TypeError:
+            self.usable = False
+            self._reset()
+            return False
+        return True
+
+    def _rebuild(self) -> None:
+        items = sorted((value, rid, generation) for rid, (value, generation) in self.current.items()
+                       if value is not None)
+        self.keys = [item[0] for item in items]
+        self.entries = [(item[1], item[2]) for item in items]
+        self.pending.clear()
+        self.stale = 0
+
+    def bounds(self, lower: Any = None, lower_inclusive: bool = True,
+               upper: Any = None, upper_inclusive: bool = True) -> tuple:
+        """Posições [início, fim) das entradas dentro da faixa (None = sem limite)."""
+        keys = self.keys
+        start = 0 if lower is None else (bisect_left if lower_inclusive else bisect_right)(keys, lower)
+        end = len(keys) if upper is None else (bisect_right if upper_inclusive else bisect_left)(keys, upper)
+        return start, max(start, end)
+
+    def rids(self, start: int, end: int, desc: bool = False) -> Iterable[int]:
+        """Ids vigentes entre as posições, em ordem do valor (decrescente com `desc`)."""
+        current = self.current
+        entries = self.entries
+        positions = range(end - 1, start - 1, -1) if desc else range(start, end)
+        for pos in positions:
+            rid, generation = entries[pos]
+            entry = current.get(rid)
+            if entry is not None and entry[1] == generation:
+                yield rid
+
+
+class _MockTableStore:
+    """Linhas de uma tabela do MockClient com seus índices.
+
+    * `rows` - id interno (sequencial, na ordem de inserção) -> linha
+    * `pk_index` - valor da chave primária -> id interno
+    * `indexes` - campo indexado -> valor -> ids internos
+    * `sorted` - campo -> _SortedIndex (a chave primária sempre tem um)
+    * `next_numero` - sequência monotônica para a coluna `numero`
+    * `listener` - chamado após cada alteração como listener(operação, id interno, linha),
+      com operação 'insert', 'replace' ou 'remove' (usado pelo LocalClient para o log)
+    """
+
+    def __init__(self, primary_key: str, indexed_fields: List[str], sorted_fields: Iterable[str] = ()):
+        self.listener: Optional[Callable[[str, int, Optional[Dict[str, Any]]], None]] = None
+        self.primary_key = primary_key
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.pk_index: Dict[Any, int] = {}
+        self.indexes: Dict[str, Dict[Any, Set[int]]] = {f: {} for f in indexed_fields if f != primary_key}
+        self.sorted: Dict[str, _SortedIndex] = {f: _SortedIndex(f) for f in dict.fromkeys([primary_key, *sorted_fields])}
+        self.next_numero = 1
+        self._next_rid = 0
+
+    def lookup(self, field: str, value: Any) -> Optional[List[int]]:
+        """Ids internos com `field == value`, ou None se o campo não for indexado."""
+        if field == self.primary_key:
+            rid = self.pk_index.get(value)
+            return [] if rid is None else [rid]
+        index = self.indexes.get(field)
+        if index is None:
+            return None
+        return sorted(index.get(value, ()))
+
+    def sorted_index(self, field: str) -> Optional[_SortedIndex]:
+        """Índice ordenado de `field`, pronto para consulta, ou None."""
+        index = self.sorted.get(field)
+        if index is None or not index.settle(self.rows):
+            return None
+        return index
+
+    def find_rid(self, field: str, value: Any) -> Optional[int]:
+        rids = self.lookup(field, value)
+        if rids is None:
+            rids = [rid for rid, r in self.rows.items() if r.get(field) == value]
+        return rids[0] if rids else None
+
+    def insert(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        # atribui id incremental quando aplicável (numero) ou mantém cpf
+        if 'numero' in item and not item.get('numero'):
+            item['numero'] = self.next_numero
+        numero = item.get('numero')
+        if isinstance(numero, int) and numero >= self.next_numero:
+            self.next_numero = numero + 1
+        key = item.get(self.primary_key)
+        if key is not None and key in self.pk_index:
+            raise _MockAPIError(f'duplicate key value violates unique constraint ({self.primary_key})={key}', '23505')
+        rid = self._next_rid
+        self._next_rid += 1
+        self.rows[rid] = item
+        self._index(rid, item)
+        if self.listener is not None:
+            self.listener('insert', rid, item)
+        return item
+
+    def insert_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert de várias linhas em uma transação, como no Postgres: uma chave duplicada (na
+        tabela ou no próprio lote) rejeita o lote inteiro e nenhuma linha fica gravada."""
+        seen = set()
+        for item in items:
+            key = item.get(self.primary_key)
+            if key is None or (self.primary_key == 'numero' and not key):
+                continue
+            if key in self.pk_index or key in seen:
+                raise _MockAPIError(f'duplicate key value violates unique constraint ({self.primary_key})={key}', '23505')
+            seen.add(key)
+        inserted: List[Dict[str, Any]] = []
+        try:
+            for item in items:
+                inserted.append(self.insert(item))
+        except _MockAPIError:
+            # numero gerado que colidiu com um explícito mais adiante no lote: desfaz o que entrou
+            for item in reversed(inserted):
+                self.remove(self.pk_index[item[self.primary_key]])
+            raise
+        return inserted
+
+    def replace(self, rid: int, new: Dict[str, Any]) -> None:
+        old = self.rows[rid]
+        new_key = new.get(self.primary_key)
+        if new_key != old.get(self.primary_key) and new_key is not None and new_key in self.pk_index:
+            raise _MockAPIError(f'duplicate key value violates unique constraint ({self.primary_key})={new_key}', '23505')
+        self._reindex(rid, old, new)
+        if self.listener is not None:
+            self.listener('replace', rid, new)
+
+    def remove(self, rid: int) -> Dict[str, Any]:
+        row = self.rows.pop(rid)
+        self._unindex(rid, row)
+        if self.listener is not None:
+            self.listener('remove', rid, None)
+        return row
+
+    def apply(self, op: str, rid: int, row: Optional[Dict[str, Any]]) -> None:
+        """Reaplica uma alteração registrada pelo listener (sem validar nem notificar).
+
+        É idempotente: reaplicar um log já contido no snapshot não duplica linhas.
+        """
+        if op == 'insert':
+            if rid in self.rows:
+                self._unindex(rid, self.rows[rid])
+            self.rows[rid] = row
+            self._index(rid, row)
+            self._next_rid = max(self._next_rid, rid + 1)
+            numero = row.get('numero')
+            if isinstance(numero, int) and numero >= self.next_numero:
+                self.next_numero = numero + 1
+        elif op == 'replace':
+            if rid in self.rows:
+                self._reindex(rid, self.rows[rid], row)
+            else:
+                self.rows[rid] = row
+                self._index(rid, row)
+        elif op == 'remove' and rid in self.rows:
+            self._unindex(rid, self.rows.pop(rid))
+
+    # o listener e os índices ordenados não fazem parte do estado persistido (snapshots do
+    # LocalClient); os índices são remontados na primeira consulta depois de carregar
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['listener'] = None
+        state['sorted'] = list(self.sorted)
+        return state
+
+    def __setstate__(self, state):
+        fields = state.get('sorted') or [state['primary_key']]
+        self.__dict__.update(state)
+        self.sorted = {f: _SortedIndex(f) for f in fields}
+
+    def _index(self, rid: int, row: Dict[str, Any], sorted_too: bool = True) -> None:
+        key = row.get(self.primary_key)
+        if key is not None:
+            self.pk_index[key] = rid
+        for field, index in self.indexes.items():
+            index.setdefault(row.get(field), set()).add(rid)
+        if sorted_too:
+            for field, index in self.sorted.items():
+                if index.built:
+                    index.add(rid, row.get(field))
+
+    def _unindex(self, rid: int, row: Dict[str, Any], sorted_too: bool = True) -> None:
+        key = row.get(self.primary_key)
+        if key is not None and self.pk_index.get(key) == rid:
+            del self.pk_index[key]
+        for field, index in self.indexes.items():
+            bucket = index.get(row.get(field))
+            if bucket is not None:
+                bucket.discard(rid)
+                if not bucket:
+                    del index[row.get(field)]
+        if sorted_too:
+            for index in self.sorted.values():
+                if index.built:
+                    index.discard(rid)
+
+    # Troca a linha `rid`; os índices ordenados só mudam nas colunas cujo valor mudou
+    def _reindex(self, rid: int, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        self._unindex(rid, old, sorted_too=False)
+        self.rows[rid] = new
+        self._index(rid, new, sorted_too=False)
+        for field, index in self.sorted.items():
+            if index.built and old.get(field) != new.get(field):
+                index.discard(rid)
+                index.add(rid, new.get(field))
+
+
+class _MockTable:
+    def __init__(self, client: 'MockClient', name: str):
+        self.client = client
+        self.name = name
+        self._operation = None
+        self._payload = None
+        self._filters = []
+        self._order = []
+        self._limit = None
+        self._offset = 0
+        self._on_conflict = None
+        self._columns = None
+        self._aggregates = []
+
+    def select(self, *columns: str, **kwargs):
+        self._operation = 'select'
+        # projeção: 'cpf,salario' ou select('cpf', 'salario'); '*' devolve tudo
+        names = [c.strip() for c in ','.join(columns).split(',') if c.strip()]
+        # agregados do PostgREST: 'salario.sum()', 'total:salario.sum()', 'count()'; as demais
+        # colunas viram o agrupamento
+        self._aggregates = []
+        plain = []
+        for name in names:
+            match = _AGGREGATE.fullmatch(name)
+            if match is None:
+                plain.append(name)
+            else:
+                alias, column, function = match.groups()
+                self._aggregates.append((alias or function, function, column))
+        self._columns = None if not plain or '*' in plain else plain
+        return self
+
+    def insert(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]]):
+        self._operation = 'insert'
+        self._payload = payload
+        return self
+
+    def upsert(self, payload: Union[Dict[str, Any], List[Dict[str, Any]]], on_conflict: str = 'id', **kwargs):
+        self._operation = 'upsert'
+        self._payload = payload
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, payload: Dict[str, Any]):
+        self._operation = 'update'
+        self._payload = payload
+        return self
+
+    def delete(self):
+        self._operation = 'delete'
+        return self
+
+    # cada filtro guarda (operador, campo, valor, teste); igualdades podem usar os índices de
+    # valor e comparações (eq/gt/gte/lt/lte) os índices ordenados
+    # * como no SQL, comparações com nulo são falsas (exceto eq, mantido como antes)
+    def eq(self, field: str, value: Any):
+        self._filters.append(('eq', field, value, lambda v: v == value))
+        return self
+
+    def neq(self, field: str, value: Any):
+        self._filters.append(('neq', field, value, lambda v: v is not None and v != value))
+        return self
+
+    def gt(self, field: str, value: Any):
+        self._filters.append(('gt', field, value, lambda v: v is not None and v > value))
+        return self
+
+    def gte(self, field: str, value: Any):
+        self._filters.append(('gte', field, value, lambda v: v is not None and v >= value))
+        return self
+
+    def lt(self, field: str, value: Any):
+        self._filters.append(('lt', field, value, lambda v: v is not None and v < value))
+        return self
+
+    def lte(self, field: str, value: Any):
+        self._filters.append(('lte', field, value, lambda v: v is not None and v <= value))
+        return self
+
+    def in_(self, field: str, values: List[Any]):
+        accepted = set(values)
+        self._filters.append(('in', field, accepted, lambda v: v in accepted))
+        return self
+
+    # LIKE do SQL: '%' casa qualquer sequência e '_' um único caractere
+    def like(self, field: str, pattern: str):
+        regex = re.compile(''.join(
+            '.*' if ch == '%' else '.' if ch == '_' else re.escape(ch) for ch in pattern
+        ), re.DOTALL)
+        self._filters.append(('like', field, pattern, lambda v: isinstance(v, str) and regex.fullmatch(v) is not None))
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs):
+        self._limit = size
+        return self
+
+    # intervalo inclusivo, como no PostgREST: range(0, 9) devolve 10 linhas
+    def range(self, start: int, end: int, **kwargs):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        return all(test(row.get(field)) for _, field, _, test in self._filters)
+
+    def _candidates(self, table: _MockTableStore) -> List[int]:
+        """Ids internos a examinar: o índice mais seletivo disponível (de valor para eq/in,
+        ordenado para faixas) ou a tabela inteira, na ordem de inserção."""
+        best = self._hashed(table)
+        if best is not None and len(best) <= 1:
+            return best
+        # só campos com comparação (gt/gte/lt/lte); igualdades ficam com os índices de valor
+        for op, field, _, _ in self._filters:
+            if op not in _COMPARISONS:
+                continue
+            found = self._range(table, field)
+            if found is not None and (best is None or found[2] - found[1] < len(best)):
+                index, start, end = found
+                best = sorted(index.rids(start, end))
+        return list(table.rows) if best is None else best
+
+    # Melhor candidato pelos índices de valor (eq/in), ou None
+    def _hashed(self, table: _MockTableStore) -> Optional[List[int]]:
+        best = None
+        for op, field, value, _ in self._filters:
+            if op == 'eq':
+                rids = table.lookup(field, value)
+            elif op == 'in' and table.lookup(field, None) is not None:
+                rids = sorted({rid for v in value for rid in table.lookup(field, v)})
+            else:
+                continue
+            if rids is not None and (best is None or len(rids) < len(best)):
+                best = rids
+        return best
+
+    # Faixa de `field` pelos filtros eq/gt/gte/lt/lte dele: (índice, início, fim) no índice
+    # ordenado, em O(log n); None se o campo não tiver índice ordenado
+    def _range(self, table: _MockTableStore, field: str):
+        index = table.sorted_index(field)
+        if index is None:
+            return None
+        lower = upper = None
+        lower_inclusive = upper_inclusive = True
+        try:
+            for op, f, value, _ in self._filters:
+                if f != field or op not in _RANGE_OPS or value is None:
+                    continue
+                if op != 'lt' and op != 'lte' and (lower is None or value > lower or (value == lower and op == 'gt')):
+                    lower, lower_inclusive = value, op != 'gt'
+                if op != 'gt' and op != 'gte' and (upper is None or value < upper or (value == upper and op == 'lt')):
+                    upper, upper_inclusive = value, op != 'lt'
+            return (index, *index.bounds(lower, lower_inclusive, upper, upper_inclusive))
+        except TypeError:
+            # filtro de tipo diferente dos valores da coluna: fica para a varredura
+            return None
+
+    def _matching(self, table: _MockTableStore) -> List[int]:
+        return [rid for rid in self._candidates(table) if self._matches(table.rows[rid])]
+
+    # Linhas do select, já ordenadas e sem a projeção
+    # * Com `order` + `limit` e índice ordenado na primeira coluna da ordenação, percorre o
+    #   índice e para ao completar offset + limit linhas (O(log n + k))
+    # * Senão filtra os candidatos (_candidates) e ordena
+    def _select(self, table: _MockTableStore) -> List[Dict[str, Any]]:
+        if self._order and self._limit is not None:
+            rows = self._select_ordered(table, self._offset + self._limit)
+            if rows is not None:
+                return rows
+        if self._filters:
+            rows = [table.rows[rid] for rid in self._matching(table)]
+        else:
+            rows = list(table.rows.values())
+        return self._sort(rows)
+
+    def _select_ordered(self, table: _MockTableStore, needed: int) -> Optional[List[Dict[str, Any]]]:
+        column, desc = self._order[0]
+        if any(op == 'eq' and f == column and v is None for op, f, v, _ in self._filters):
+            return None
+        found = self._range(table, column)
+        if found is None:
+            return None
+        index, start, end = found
+        # um filtro de valor seletivo (ex.: eq em um departamento) sai mais barato filtrando e
+        # ordenando os poucos candidatos do que percorrendo o índice até achar `needed` linhas
+        hashed = self._hashed(table)
+        if hashed is not None and len(hashed) * needed < end - start:
+            return None
+        bounded = any(f == column and op in _RANGE_OPS for op, f, _, _ in self._filters)
+        nulls = [] if bounded else sorted(index.nulls)
+        skipped = 0
+        if self._offset and index.stale == 0 and all(f == column and op in _RANGE_OPS for op, f, _, _ in self._filters):
+            skipped, start, end, nulls = self._skip(index, start, end, nulls, desc)
+            needed -= skipped
+        # nulos por último em ordem crescente e primeiro em decrescente, como no Postgres
+        ordered = (nulls, index.rids(start, end, desc)) if desc else (index.rids(start, end), nulls)
+        rows = table.rows
+        result = []
+        boundary = None
+        for rids in ordered:
+            for rid in rids:
+                row = rows[rid]
+                if not self._matches(row):
+                    continue
+                value = row.get(column)
+                # completo: `needed` linhas e o fim do empate na primeira coluna (as demais
+                # colunas da ordenação desempatam no _sort)
+                if len(result) >= needed and value != boundary:
+                    return self._sort(result, self._offset - skipped)
+                result.append(row)
+                boundary = value
+        return self._sort(result, self._offset - skipped)
+
+    # Uma linha por grupo (colunas do select sem agregado) com os agregados, como o GROUP BY
+    # do PostgREST. Agrupando por uma coluna com índice de valor, os grupos vêm prontos do índice.
+    def _aggregate(self, table: _MockTableStore) -> List[Dict[str, Any]]:
+        groups = self._columns or []
+        if len(groups) == 1 and groups[0] in table.indexes:
+            rows = table.rows
+            matches = self._matches
+            buckets = (
+                ((value,), [rows[rid] for rid in rids if matches(rows[rid])])
+                for value, rids in table.indexes[groups[0]].items()
+            )
+        else:
+            grouped: Dict[tuple, List[Dict[str, Any]]] = {}
+            source = [table.rows[rid] for rid in self._matching(table)] if self._filters else table.rows.values()
+            for row in source:
+                grouped.setdefault(tuple(row.get(c) for c in groups), []).append(row)
+            buckets = grouped.items()
+        result = []
+        for key, members in buckets:
+            if members:
+                result.append(dict(zip(groups, key), **_aggregate_values(members, self._aggregates)))
+        if not groups and not result:
+            # sem GROUP BY o Postgres devolve uma linha mesmo sem registros (count 0, sum nulo)
+            result.append(_aggregate_values([], self._aggregates))
+        return result
+
+    # Sem outros filtros e sem entradas invalidadas no índice, a posição no índice é a posição
+    # no resultado: pula direto para o empate (mesmo valor) que contém a linha `offset`, sem
+    # percorrer as anteriores (paginação com range). Retorna (linhas puladas, início, fim, nulos).
+    def _skip(self, index: _SortedIndex, start: int, end: int, nulls: List[int], desc: bool) -> tuple:
+        keys = index.keys
+        offset = self._offset
+        if desc:
+            if offset < len(nulls):
+                return 0, start, end, nulls
+            k = offset - len(nulls)
+            if k >= end - start:
+                return len(nulls) + end - start, start, start, []
+            tie_end = bisect_right(keys, keys[end - 1 - k], start, end)
+            return len(nulls) + end - tie_end, start, tie_end, []
+        if offset >= end - start:
+            return end - start, end, end, nulls
+        tie_start = bisect_left(keys, keys[start + offset], start, end)
+        return tie_start - start, tie_start, end, nulls
+
+    # ordenações encadeadas: aplica da última para a primeira (sort é estável); depois offset/limit
+    def _sort(self, rows: List[Dict[str, Any]], offset: Optional[int] = None) -> List[Dict[str, Any]]:
+        if self._order:
+            for column, desc in reversed(self._order):
+                # nulos por último, como o padrão do Postgres em ordem crescente
+                rows.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        if offset is None:
+            offset = self._offset
+        if offset or self._limit is not None:
+            rows = rows[offset:None if self._limit is None else offset + self._limit]
+        return rows
+
+    def execute(self):
+        table = self.client._table_store(self.name)
+        if self._operation == 'select':
+            if self._aggregates:
+                return _MockResponse(self._sort(self._aggregate(table)))
+            rows = self._select(table)
+            if self._columns:
+                rows = [{c: r.get(c) for c in self._columns} for r in rows]
+            else:
+                rows = [dict(r) for r in rows]
+            return _MockResponse(rows)
+
+        now = self.client._now()
+        if self._operation == 'insert':
+            # aceita um dict ou uma lista de dicts (insert em massa)
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            inserted = table.insert_many([_stamp(dict(row), now, created=True) for row in rows])
+            return _MockResponse([dict(row) for row in inserted], 201)
+
+        if self._operation == 'upsert':
+            rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            key = self._on_conflict
+            result = []
+            for row in rows:
+                rid = table.find_rid(key, row.get(key)) if row.get(key) is not None else None
+                if rid is None:
+                    item = table.insert(_stamp(dict(row), now, created=True))
+                else:
+                    item = dict(table.rows[rid])
+                    item.update(row)
+                    if now is not None:
+                        # com relógio, created_at continua o da linha original
+                        item['created_at'] = table.rows[rid].get('created_at')
+                    table.replace(rid, _stamp(item, now))
+                result.append(dict(item))
+            return _MockResponse(result, 201)
+
+        if self._operation == 'update':
+            updated = []
+            if self._filters:
+                for rid in self._matching(table):
+                    new = dict(table.rows[rid])
+                    new.update(self._payload)
+                    table.replace(rid, _stamp(new, now))
+                    updated.append(dict(new))
+            return _MockResponse(updated)
+
+        if self._operation == 'delete':
+            removed = []
+            if self._filters:
+                removed = [table.remove(rid) for rid in self._matching(table)]
+            return _MockResponse(removed)
+
+
+# Agregados de um grupo de linhas; nulos são ignorados (count() sem coluna conta as linhas)
+def _aggregate_values(rows: List[Dict[str, Any]], aggregates: List[tuple]) -> Dict[str, Any]:
+    result = {}
+    for alias, function, column in aggregates:
+        if column is None:
+            result[alias] = len(rows)
+            continue
+        values = [v for v in (row.get(column) for row in rows) if v is not None]
+        if function == 'count':
+            result[alias] = len(values)
+        elif not values:
+            result[alias] = None
+        elif function == 'sum':
+            result[alias] = sum(values)
+        elif function == 'avg':
+            result[alias] = sum(values) / len(values)
+        else:
+            result[alias] = min(values) if function == 'min' else max(values)
+    return result
+
+
+# Preenche created_at/updated_at com o relógio do client (sem relógio, a linha fica como veio)
+def _stamp(row: Dict[str, Any], now: Optional[str], created: bool = False) -> Dict[str, Any]:
+    if now is not None:
+        if created and not row.get('created_at'):
+            row['created_at'] = now
+        row['updated_at'] = now
+    return row
+
+
+class MockClient:
+    """Cliente em memória com a mesma interface de `table()` do Supabase.
+
+    * `primary_keys` - tabela -> coluna da chave primária (padrão: DEFAULT_PRIMARY_KEYS, senão 'id')
+    * `indexes` - tabela -> colunas com índice secundário (padrão: DEFAULT_INDEXES)
+    * `sorted_indexes` - tabela -> colunas com índice ordenado (padrão: DEFAULT_SORTED_INDEXES)
+    * `clock` - função que devolve o datetime atual; quando informada, as escritas preenchem
+      `created_at` (insert) e `updated_at` (insert/upsert/update) em ISO, como os defaults e
+      triggers do banco (ver ManualClock para testes)
+    """
+
+    def __init__(self, primary_keys: Optional[Dict[str, str]] = None,
+                 indexes: Optional[Dict[str, List[str]]] = None,
+                 clock: Optional[Callable[[], datetime]] = None,
+                 sorted_indexes: Optional[Dict[str, List[str]]] = None):
+        self._primary_keys = dict(DEFAULT_PRIMARY_KEYS, **(primary_keys or {}))
+        self._indexes = dict(DEFAULT_INDEXES, **(indexes or {}))
+        self._sorted_indexes = dict(DEFAULT_SORTED_INDEXES, **(sorted_indexes or {}))
+        self._tables: Dict[str, _MockTableStore] = {}
+        self._clock = clock
+
+    def _now(self) -> Optional[str]:
+        return self._clock().isoformat() if self._clock is not None else None
+
+    def _table_store(self, name: str) -> _MockTableStore:
+        table = self._tables.get(name)
+        if table is None:
+            table = _MockTableStore(self._primary_keys.get(name, 'id'), self._indexes.get(name, []),
+                                    self._sorted_indexes.get(name, []))
+            self._tables[name] = table
+        return table
+
+    def table(self, name: str) -> _MockTable:
+        return _MockTable(self, name)
@@ -0,0 +1,235 @@
+'''
+  *** AsyncBaseDAO ***
+  Versão assíncrona (asyncio) do BaseDAO, para o client assíncrono do Supabase
+  Mesmo contrato de to_model/to_dict e mesmas operações CRUD, com `await`
+'''
+
+import asyncio
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import (Any, AsyncIterator, Awaitable, Dict, Generic, Iterable, List, Optional,
+                    Sequence, TypeVar, Union)
+
+from empresa.dao.base_dao import (DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE, BatchFailure, BulkWriteError,
+                                  apply_order, apply_where)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Quantidade padrão de requisições simultâneas em gather()
+DEFAULT_CONCURRENCY = 10
+
+
+# Executa as awaitables com no máximo `limit` em andamento ao mesmo tempo e devolve os
+# resultados na ordem da entrada. A entrada é consumida sob demanda, então pode ser um
+# generator com milhões de itens sem criar todas as corrotinas de uma vez.
+async def gather_limited(aws: Iterable[Awaitable[R]], limit: int = DEFAULT_CONCURRENCY,
+                         return_exceptions: bool = False) -> List[Union[R, BaseException]]:
+  if limit < 1:
+    raise ValueError('limit deve ser maior que zero')
+  iterator = enumerate(aws)
+  results: Dict[int, Any] = {}
+
+  async def worker():
+    for index, aw in iterator:
+      try:
+        results[index] = await aw
+      except Exception as e:
+        if not return_exceptions:
+          raise
+        results[index] = e
+
+  workers = [asyncio.ensure_future(worker()) for _ in range(limit)]
+  try:
+    await asyncio.gather(*workers)
+  except BaseException:
+    for task in workers:
+      task.cancel()
+    # fecha as corrotinas que nem chegaram a ser aguardadas
+    for _, aw in iterator:
+      if asyncio.iscoroutine(aw):
+        aw.close()
+    raise
+  return [results[i] for i in range(len(results))]
+
+
+class AsyncBaseDAO(ABC, Generic[T]):
+
+  def __init__(self, client, table_name: str, id_field: str = 'id',
+               concurrency: int = DEFAULT_CONCURRENCY):
+    self._client = client
+    self._table_name = table_name
+    self._id_field = id_field
+    # Limite padrão de requisições simultâneas dos helpers gather/*_each
+    self._concurrency = concurrency
+
+  # Do formato JSON (dict) para modelo de dados (T)
+  @abstractmethod
+  def to_model(self, data: dict) -> T:
+    pass
+
+  # Do modelo de dados (T) para formato JSON (dict)
+  @abstractmethod
+  def to_dict(self, model: T) -> dict:
+    pass
+
+  # Conversões em lote - os DAOs podem sobrescrever com versões especializadas do modelo
+  def to_models(self, rows: List[dict]) -> List[T]:
+    return [self.to_model(item) for item in rows]
+
+  def to_dicts(self, models: List[T]) -> List[dict]:
+    return [self.to_dict(model) for model in models]
+
+  @property
+  def id_field(self) -> str:
+    return self._id_field
+
+  @property
+  def table_name(self) -> str:
+    return self._table_name
+
+  def id_of(self, model: T):
+    return getattr(model, self._id_field, None)
+
+  def _first(self, response) -> Optional[T]:
+    if response.data:
+      data = response.data[0] if isinstance(response.data, list) else response.data
+      return self.to_model(data)
+    return None
+
+  ### Create
+  async def create(self, model: T) -> Optional[T]:
+    try:
+      response = await self._client.table(self._table_name).insert(self.to_dict(model)).execute()
+      return self._first(response)
+    except Exception as e:
+      print(f'Erro ao criar registro em {self._table_name}: {e}')
+      return None
+
+  ### Create/Upsert (em massa) - mesma semântica de BaseDAO.create_many/upsert_many
+  async def create_many(self, models: Iterable[T], batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+    return await self._write_many(models, batch_size, lambda table, rows: table.insert(rows))
+
+  async def upsert_many(self, models: Iterable[T], on_conflict: Optional[str] = None,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+    conflict = on_conflict or self._id_field
+    return await self._write_many(models, batch_size, lambda table, rows: table.upsert(rows, on_conflict=conflict))
+
+  async def _write_many(self, models: Iterable[T], batch_size: int, build) -> List[T]:
+    if batch_size < 1:
+      raise ValueError('batch_size deve ser maior que zero')
+    iterator = iter(models)
+    batches = []
+    while True:
+      batch = list(islice(iterator, batch_size))
+      if not batch:
+        break
+      batches.append(batch)
+
+    async def send(batch):
+      response = await build(self._client.table(self._table_name), self.to_dicts(batch)).execute()
+      data = response.data or []
+      return [data] if isinstance(data, dict) else data
+
+    # os lotes são enviados em paralelo, respeitando o limite de concorrência
+    results = await gather_limited((send(b) for b in batches), self._concurrency, return_exceptions=True)
+    created: List[T] = []
+    failures: List[BatchFailure] = []
+    start = 0
+    for index, (batch, result) in enumerate(zip(batches, results)):
+      if isinstance(result, Exception):
+        failures.append(BatchFailure(index, start, len(batch), result))
+      else:
+        created.extend(self.to_models(result))
+      start += len(batch)
+    if failures:
+      raise BulkWriteError(self._table_name, created, failures)
+    return created
+
+  ### Read
+  async def read(self, id_value, id_field: Optional[str] = None) -> Optional[T]:
+    id_field = id_field or self._id_field
+    try:
+      response = await (self._client.table(self._table_name).select('*')
+                        .eq(id_field, id_value).limit(1).execute())
+      return self._first(response)
+    except Exception as e:
+      print(f'Erro ao buscar registro {id_value} em {self._table_name}: {e}')
+      return None
+
+  async def read_all(self) -> List[T]:
+    try:
+      response = await self._client.table(self._table_name).select('*').execute()
+      return self.to_models(response.data or [])
+    except Exception as e:
+      print(f'Erro ao buscar todos os registros: {e}')
+      return []
+
+  async def find(self, where: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+                 order_by: Optional[Union[str, Sequence[str]]] = None, limit: Optional[int] = None) -> List[T]:
+    try:
+      query = self._client.table(self._table_name).select(','.join(columns) if columns else '*')
+      query = apply_order(apply_where(query, where), order_by)
+      if limit is not None:
+        query = query.limit(limit)
+      response = await query.execute()
+      return self.to_models(response.data or [])
+    except Exception as e:
+      print(f'Erro ao consultar {self._table_name} com filtros {where}: {e}')
+      return []
+
+  # Percorre a tabela por páginas (keyset na chave primária), como BaseDAO.iter_all
+  async def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[T]:
+    if page_size < 1:
+      raise ValueError('page_size deve ser maior que zero')
+    key = self._id_field
+    last = None
+    while True:
+      query = self._client.table(self._table_name).select('*')
+      if last is not None:
+        query = query.gt(key, last)
+      rows = (await query.order(key).limit(page_size).execute()).data or []
+      for model in self.to_models(rows):
+        yield model
+      if len(rows) < page_size:
+        return
+      last = rows[-1][key]
+
+  ### Update
+  async def update(self, id_value, model: T, id_field: Optional[str] = None) -> Optional[T]:
+    id_field = id_field or self._id_field
+    try:
+      response = await (self._client.table(self._table_name).update(self.to_dict(model))
+                        .eq(id_field, id_value).execute())
+      return self._first(response)
+    except Exception as e:
+      print(f'Erro ao atualizar registro {id_value} em {self._table_name}: {e}')
+      return None
+
+  ### Delete
+  async def delete(self, id_value, id_field: Optional[str] = None) -> bool:
+    id_field = id_field or self._id_field
+    try:
+      response = await self._client.table(self._table_name).delete().eq(id_field, id_value).execute()
+      if getattr(response, 'data', None):
+        return True
+      return getattr(response, 'status_code', None) in (200, 204)
+    except Exception as e:
+      print(f'Erro ao deletar registro {id_value} em {self._table_name}: {e}')
+      return False
+
+  ### Concorrência
+  # Aguarda as operações com no máximo `limit` (padrão: `concurrency` do DAO) simultâneas
+  async def gather(self, aws: Iterable[Awaitable[R]], limit: Optional[int] = None,
+                   return_exceptions: bool = False) -> List[R]:
+    return await gather_limited(aws, limit or self._concurrency, return_exceptions)
+
+  # Atalhos: uma requisição por item, em paralelo, resultados na ordem da entrada
+  async def create_each(self, models: Iterable[T], limit: Optional[int] = None) -> List[Optional[T]]:
+    return await self.gather((self.create(m) for m in models), limit)
+
+  async def read_each(self, id_values: Iterable[Any], limit: Optional[int] = None) -> List[Optional[T]]:
+    return await self.gather((self.read(v) for v in id_values), limit)
+
+  async def update_each(self, models: Iterable[T], limit: Optional[int] = None) -> List[Optional[T]]:
+    return await self.gather((self.update(self.id_of(m), m) for m in models), limit)
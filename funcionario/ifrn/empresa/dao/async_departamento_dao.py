@@ -0,0 +1,20 @@
+from typing import List
+from empresa.dao.async_base_dao import AsyncBaseDAO
+from empresa.models.departamento import Departamento
+
+class AsyncDepartamentoDAO(AsyncBaseDAO[Departamento]):
+
+  def __init__(self, client, concurrency: int = 10):
+    super().__init__(client, 'departamento', id_field='numero', concurrency=concurrency)
+
+  def to_model(self, data: dict) -> Departamento:
+    return Departamento.from_dict(data)
+
+  def to_dict(self, model: Departamento) -> dict:
+    return model.to_dict()
+
+  def to_models(self, rows: List[dict]) -> List[Departamento]:
+    return Departamento.from_dicts(rows)
+
+  def to_dicts(self, models: List[Departamento]) -> List[dict]:
+    return Departamento.to_dicts(models)
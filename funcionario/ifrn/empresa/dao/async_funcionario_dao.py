@@ -0,0 +1,24 @@
+from typing import List, Optional, Sequence
+from empresa.dao.async_base_dao import AsyncBaseDAO
+from empresa.models.funcionario import Funcionario
+
+class AsyncFuncionarioDAO(AsyncBaseDAO[Funcionario]):
+
+  def __init__(self, client, concurrency: int = 10):
+    super().__init__(client, 'funcionario', id_field='cpf', concurrency=concurrency)
+
+  def to_model(self, data: dict) -> Funcionario:
+    return Funcionario.from_dict(data)
+
+  def to_dict(self, model: Funcionario) -> dict:
+    return model.to_dict()
+
+  def to_models(self, rows: List[dict]) -> List[Funcionario]:
+    return Funcionario.from_dicts(rows)
+
+  def to_dicts(self, models: List[Funcionario]) -> List[dict]:
+    return Funcionario.to_dicts(models)
+
+  # Funcionários de um departamento
+  async def by_departamento(self, numero: int, columns: Optional[Sequence[str]] = None) -> List[Funcionario]:
+    return await self.find(where={'numero_departamento': numero}, columns=columns, order_by='cpf')
@@ -5,17 +5,108 @@
 '''
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic
-from supabase import Client
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar, Generic, Union
+
+from empresa.dao.metrics import Metrics, get_default_metrics
+from empresa.models._conversao import format_datetime
+
+# usados apenas nas anotações de tipo (o SDK não é carregado em tempo de execução)
+if TYPE_CHECKING:
+  from supabase import Client
+  from empresa.dao.frame import ColumnFrame
 
 # TypeVar - tornar a classe genérica
 T = TypeVar('T')
 
+# Tamanho padrão dos lotes enviados em create_many/upsert_many
+DEFAULT_BATCH_SIZE = 500
+# Tamanho padrão das páginas lidas em iter_all (abaixo do limite de linhas do PostgREST)
+DEFAULT_PAGE_SIZE = 1000
+# Coluna com o instante da última alteração (read_since)
+UPDATED_AT = 'updated_at'
+
+# Operadores aceitos em `where` -> método do query builder do Supabase
+FILTER_OPERATORS = {
+  'eq': 'eq',
+  'neq': 'neq',
+  'in': 'in_',
+  'gt': 'gt',
+  'gte': 'gte',
+  'lt': 'lt',
+  'lte': 'lte',
+  'like': 'like',
+}
+
+# Funções aceitas em BaseDAO.aggregate (as mesmas dos agregados do PostgREST)
+AGGREGATE_FUNCTIONS = ('count', 'sum', 'avg', 'min', 'max')
+# Erro do PostgREST para agregados desabilitados ("Use of aggregate functions is not allowed")
+AGGREGATES_DISABLED = 'PGRST123'
+
+
+# Aplica os filtros de `where` (formato descrito em BaseDAO.find) ao query builder
+def apply_where(query, where: Optional[Dict[str, Any]]):
+  for column, condition in (where or {}).items():
+    if isinstance(condition, tuple) and len(condition) == 2 and condition[0] in FILTER_OPERATORS:
+      operator, value = condition
+    elif isinstance(condition, (list, tuple, set, frozenset)):
+      operator, value = 'in', condition
+    else:
+      operator, value = 'eq', condition
+    if operator == 'in':
+      value = list(value)
+    query = getattr(query, FILTER_OPERATORS[operator])(column, value)
+  return query
+
+
+# Aplica `order_by` (coluna ou lista de colunas; prefixo '-' para decrescente) ao query builder
+def apply_order(query, order_by: Optional[Union[str, Sequence[str]]]):
+  for column in ([order_by] if isinstance(order_by, str) else order_by or []):
+    if column.startswith('-'):
+      query = query.order(column[1:], desc=True)
+    else:
+      query = query.order(column)
+  return query
+
+
+@dataclass
+class BatchFailure:
+  '''Falha de um lote em uma operação em massa'''
+  batch_index: int  # posição do lote (0, 1, 2, ...)
+  start: int        # índice do primeiro modelo do lote na entrada
+  size: int         # quantidade de modelos no lote
+  error: Exception
+
+
+class BulkWriteError(Exception):
+  '''
+  Lançada ao final de create_many/upsert_many quando algum lote falhou.
+  * `created` - modelos gravados com sucesso, na ordem da entrada
+  * `failures` - lista de BatchFailure, um por lote que falhou
+  '''
+
+  def __init__(self, table_name: str, created: list, failures: List[BatchFailure]):
+    self.table_name = table_name
+    self.created = created
+    self.failures = failures
+    total = sum(f.size for f in failures)
+    super().__init__(f'{len(failures)} lote(s) falharam em {table_name} ({total} registros): {failures[0].error}')
+
+
 class BaseDAO(ABC, Generic[T]):
 
-  def __init__(self, client: Client, table_name: str):
+  # `client` pode ser um Client do Supabase ou um SupabasePool (mesma interface de table())
+  # `metrics` - instrumentação das operações (padrão: get_default_metrics(), sem efeito)
+  def __init__(self, client: 'Client', table_name: str, id_field: str = 'id',
+               metrics: Optional[Metrics] = None):
     self._client = client
     self._table_name = table_name
+    # Chave primária da tabela (usada como on_conflict padrão no upsert)
+    self._id_field = id_field
+    self._metrics = metrics
+    # False depois que o servidor recusa agregados (PGRST123): aggregate vai direto ao cliente
+    self._server_aggregates = True
 
 
   # Do formato JSON (dict) para modelo de dados (T)
@@ -27,59 +118,493 @@ class BaseDAO(ABC, Generic[T]):
   @abstractmethod
   def to_dict(self, model: T) -> dict:
     pass
+
+  # Instrumentação - toda operação que vai ao banco roda dentro de
+  #   with self._operation('nome') as op: ...
+  # (op.payload(dados enviados), op.rows(linhas retornadas)); o `with` fica dentro do `try`,
+  # então as exceções tratadas nos `except` abaixo também são contadas como erro
+  def _operation(self, name: str):
+    return (self._metrics or get_default_metrics()).operation(self._table_name, name)
+
+  @property
+  def metrics(self) -> Metrics:
+    return self._metrics or get_default_metrics()
+
+  @metrics.setter
+  def metrics(self, metrics: Optional[Metrics]) -> None:
+    self._metrics = metrics
+
+  # Conversões em lote - os DAOs podem sobrescrever com versões especializadas do modelo
+  def to_models(self, rows: List[dict]) -> List[T]:
+    return [self.to_model(item) for item in rows]
+
+  def to_dicts(self, models: List[T]) -> List[dict]:
+    return [self.to_dict(model) for model in models]
+
   ### Create
   # Insere um registro a partir do modelo e retorna o modelo criado
   def create(self, model: T) -> Optional[T]:
     try:
-      payload = self.to_dict(model)
-      response = self._client.table(self._table_name).insert(payload).execute()
-      if response.data:
-        # response.data pode ser lista ou dict dependendo do client
-        data = response.data[0] if isinstance(response.data, list) else response.data
-        return self.to_model(data)
-      return None
+      with self._operation('create') as op:
+        payload = self.to_dict(model)
+        op.payload(payload)
+        response = self._client.table(self._table_name).insert(payload).execute()
+        if response.data:
+          # response.data pode ser lista ou dict dependendo do client
+          data = response.data[0] if isinstance(response.data, list) else response.data
+          op.rows(1)
+          return self.to_model(data)
+        return None
     except Exception as e:
       print(f'Erro ao criar registro em {self._table_name}: {e}')
       return None
 
+  ### Create (em massa)
+  # Insere vários registros enviando payloads com várias linhas, em lotes de `batch_size`.
+  # Retorna os modelos criados na ordem da entrada; se algum lote falhar, os demais
+  # ainda são enviados e ao final é lançada BulkWriteError com o que foi criado e as falhas.
+  def create_many(self, models: Iterable[T], batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+    return self._write_many('create_many', models, batch_size, lambda table, rows: table.insert(rows))
+
+  ### Upsert (em massa)
+  # Como create_many, mas atualiza as linhas que já existem com o mesmo valor em `on_conflict`
+  # (padrão: a chave primária do DAO)
+  def upsert_many(self, models: Iterable[T], on_conflict: Optional[str] = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+    conflict = on_conflict or self._id_field
+    return self._write_many('upsert_many', models, batch_size,
+                            lambda table, rows: table.upsert(rows, on_conflict=conflict))
+
+  # Cada lote é uma requisição e é medido como uma operação `operation`
+  def _write_many(self, operation: str, models: Iterable[T], batch_size: int, build) -> List[T]:
+    if batch_size < 1:
+      raise ValueError('batch_size deve ser maior que zero')
+    created: List[T] = []
+    failures: List[BatchFailure] = []
+    iterator = iter(models)
+    start = 0
+    batch_index = 0
+    while True:
+      batch = list(islice(iterator, batch_size))
+      if not batch:
+        break
+      try:
+        with self._operation(operation) as op:
+          rows = self.to_dicts(batch)
+          op.payload(rows)
+          response = build(self._client.table(self._table_name), rows).execute()
+          data = response.data or []
+          if isinstance(data, dict):
+            data = [data]
+          op.rows(len(data))
+          created.extend(self.to_models(data))
+      except Exception as e:
+        failures.append(BatchFailure(batch_index, start, len(batch), e))
+      start += len(batch)
+      batch_index += 1
+    if failures:
+      raise BulkWriteError(self._table_name, created, failures)
+    return created
+
+  ### Read (por chave)
+  # Retorna o registro identificado por `id_field` (padrão: chave primária do DAO) ou None
+  def read(self, id_value, id_field: Optional[str] = None) -> Optional[T]:
+    id_field = id_field or self._id_field
+    try:
+      with self._operation('read') as op:
+        response = self._client.table(self._table_name).select('*').eq(id_field, id_value).limit(1).execute()
+        if response.data:
+          data = response.data[0] if isinstance(response.data, list) else response.data
+          op.rows(1)
+          return self.to_model(data)
+        return None
+    except Exception as e:
+      print(f'Erro ao buscar registro {id_value} em {self._table_name}: {e}')
+      return None
+
+  # Chave primária do DAO e o seu valor em um modelo
+  @property
+  def id_field(self) -> str:
+    return self._id_field
+
+  @property
+  def table_name(self) -> str:
+    return self._table_name
+
+  # os modelos usam os mesmos nomes das colunas como atributos
+  def id_of(self, model: T):
+    return getattr(model, self._id_field, None)
+
   ### Read
   # Retorna todos os valores de uma tabela
   def read_all(self) -> List[T]:
     try:
-      response = self._client.table(self._table_name).select('*').execute()
-      if response.data:
-        return [self.to_model(item) for item in response.data]
-      return []
+      with self._operation('read_all') as op:
+        response = self._client.table(self._table_name).select('*').execute()
+        if response.data:
+          op.rows(len(response.data))
+          return self.to_models(response.data)
+        return []
     except Exception as e:
       print(f'Erro ao buscar todos os registros: {e}')
       return []
+
+  ### Read (com filtros)
+  # Consulta com filtros e projeção executados no servidor.
+  # * `where` - {campo: valor} para igualdade ou {campo: (operador, valor)}, com operador
+  #   em FILTER_OPERATORS; uma lista/tupla/set como valor direto equivale a ('in', valores).
+  # * `columns` - colunas a buscar (padrão: todas); os demais campos do modelo ficam vazios.
+  # * `order_by` - coluna ou lista de colunas; prefixo '-' para ordem decrescente.
+  # * `limit` - máximo de linhas retornadas.
+  def find(self, where: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+           order_by: Optional[Union[str, Sequence[str]]] = None, limit: Optional[int] = None) -> List[T]:
+    try:
+      with self._operation('find') as op:
+        query = self._client.table(self._table_name).select(','.join(columns) if columns else '*')
+        query = apply_order(apply_where(query, where), order_by)
+        if limit is not None:
+          query = query.limit(limit)
+        response = query.execute()
+        if response.data:
+          op.rows(len(response.data))
+          return self.to_models(response.data)
+        return []
+    except Exception as e:
+      print(f'Erro ao consultar {self._table_name} com filtros {where}: {e}')
+      return []
+
+  ### Relações (carregamento antecipado)
+  # Preenche o atributo `attr` de cada modelo com o registro de `related_dao` cuja chave é o
+  # valor de `fk_field`. As chaves distintas são buscadas com filtros `in` (uma consulta por
+  # lote de `batch_size`), em vez de uma consulta por modelo (N+1).
+  # * `known` - modelos de `related_dao` já carregados, usados sem nova consulta
+  def load_related(self, models: List[T], fk_field: str, related_dao: 'BaseDAO', attr: str,
+                   known: Iterable[Any] = (), batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+    found = {related_dao.id_of(m): m for m in known}
+    missing = list(dict.fromkeys(
+      key for key in (getattr(m, fk_field, None) for m in models)
+      if key is not None and key not in found))
+    for start in range(0, len(missing), batch_size):
+      for related in related_dao.find(where={related_dao.id_field: missing[start:start + batch_size]}):
+        found[related_dao.id_of(related)] = related
+    for model in models:
+      key = getattr(model, fk_field, None)
+      setattr(model, attr, found.get(key) if key is not None else None)
+    return models
+
+  ### Read (paginado)
+  # Percorre a tabela página por página e devolve os modelos sob demanda (generator),
+  # mantendo em memória apenas uma página por vez.
+  # * Sem `order_by`: paginação por chave (keyset) na chave primária - cada página pede
+  #   `id_field > último valor visto`, o que não degrada em tabelas grandes.
+  # * Com `order_by`: paginação por faixa (`range`) sobre a coluna informada, desempatando
+  #   pela chave primária para que as fronteiras entre páginas sejam estáveis.
+  def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE, order_by: Optional[str] = None) -> Iterator[T]:
+    for rows in self._iter_pages(page_size, order_by):
+      yield from self.to_models(rows)
+
+  def _iter_rows(self, page_size: int, order_by: Optional[str] = None,
+                 columns: str = '*', where: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    for rows in self._iter_pages(page_size, order_by, columns, where):
+      yield from rows
+
+  # Gera as páginas (listas de dicts) da tabela, opcionalmente filtradas por `where`
+  # * Na paginação por chave, `columns` precisa incluir a chave primária
+  # * Cada página é medida como uma operação 'read_page'
+  def _iter_pages(self, page_size: int, order_by: Optional[str] = None,
+                  columns: str = '*', where: Optional[Dict[str, Any]] = None) -> Iterator[List[Dict[str, Any]]]:
+    if page_size < 1:
+      raise ValueError('page_size deve ser maior que zero')
+    if order_by is None:
+      key = self._id_field
+      last = None
+      while True:
+        query = apply_where(self._client.table(self._table_name).select(columns), where)
+        if last is not None:
+          query = query.gt(key, last)
+        with self._operation('read_page') as op:
+          rows = query.order(key).limit(page_size).execute().data or []
+          op.rows(len(rows))
+        if rows:
+          yield rows
+        if len(rows) < page_size:
+          return
+        last = rows[-1][key]
+    else:
+      start = 0
+      while True:
+        with self._operation('read_page') as op:
+          rows = (apply_where(self._client.table(self._table_name).select(columns), where)
+                  .order(order_by).order(self._id_field)
+                  .range(start, start + page_size - 1).execute().data or [])
+          op.rows(len(rows))
+        if rows:
+          yield rows
+        if len(rows) < page_size:
+          return
+        start += page_size
     
+  ### Read (colunar)
+  # Lê apenas `columns` em páginas e monta um ColumnFrame (um array por coluna, textos
+  # codificados por dicionário), sem criar um modelo por linha. Útil para relatórios:
+  #   frame = dao.read_columns(['numero_departamento', 'salario'])
+  #   frame.groupby('numero_departamento').sum('salario')
+  def read_columns(self, columns: Sequence[str], where: Optional[Dict[str, Any]] = None,
+                   page_size: int = DEFAULT_PAGE_SIZE) -> 'ColumnFrame':
+    from empresa.dao.frame import ColumnFrameBuilder
+    fetched = list(columns)
+    if self._id_field not in fetched:
+      # a paginação por chave precisa da chave primária em cada página
+      fetched.append(self._id_field)
+    builder = ColumnFrameBuilder(columns)
+    for rows in self._iter_pages(page_size, columns=','.join(fetched), where=where):
+      builder.extend(rows)
+    return builder.build()
+
+  ### Read (incremental)
+  # Registros alterados depois de `since` (datetime ou texto ISO; None = todos), em ordem de
+  # `updated_at`. Base da sincronização incremental (ver empresa/dao/replica.py).
+  def read_since(self, since, page_size: int = DEFAULT_PAGE_SIZE) -> List[T]:
+    models: List[T] = []
+    for rows in self._iter_since(since, page_size):
+      models.extend(self.to_models(rows))
+    return models
+
+  # Páginas (listas de dicts) com `updated_at > since`, ordenadas por (updated_at, chave)
+  # * `inclusive=True` usa `updated_at >= since`: quem retoma de uma marca d'água relê as linhas
+  #   daquele instante, pois outra linha pode ter sido gravada com o mesmo updated_at depois
+  #   da última leitura (a Replica descarta as versões que já aplicou)
+  # * Paginação por chave em updated_at: uma página cheia não termina no meio de um instante
+  #   (as linhas do último instante ficam para a próxima página); se a página inteira tem o
+  #   mesmo updated_at, esse instante é percorrido pela chave primária
+  def _iter_since(self, since, page_size: int = DEFAULT_PAGE_SIZE,
+                  columns: str = '*', inclusive: bool = False) -> Iterator[List[Dict[str, Any]]]:
+    if page_size < 1:
+      raise ValueError('page_size deve ser maior que zero')
+    key = self._id_field
+    last = format_datetime(since)
+    while True:
+      query = self._client.table(self._table_name).select(columns)
+      if last is not None:
+        # só a primeira consulta inclui o instante: nas seguintes ele já foi lido por inteiro
+        query = query.gte(UPDATED_AT, last) if inclusive else query.gt(UPDATED_AT, last)
+        inclusive = False
+      with self._operation('read_since') as op:
+        rows = query.order(UPDATED_AT).order(key).limit(page_size).execute().data or []
+        op.rows(len(rows))
+      if len(rows) < page_size:
+        if rows:
+          yield rows
+        return
+      instant = rows[-1].get(UPDATED_AT)
+      cut = len(rows)
+      while cut and rows[cut - 1].get(UPDATED_AT) == instant:
+        cut -= 1
+      if cut:
+        yield rows[:cut]
+        last = rows[cut - 1].get(UPDATED_AT)
+        continue
+      # página inteira no mesmo instante
+      after = None
+      while True:
+        query = self._client.table(self._table_name).select(columns).eq(UPDATED_AT, instant)
+        if after is not None:
+          query = query.gt(key, after)
+        with self._operation('read_since') as op:
+          rows = query.order(key).limit(page_size).execute().data or []
+          op.rows(len(rows))
+        if rows:
+          yield rows
+        if len(rows) < page_size:
+          break
+        after = rows[-1][key]
+      last = instant
+
+  ### Agregação
+  # Agregados calculados no servidor: só as linhas agregadas (uma por grupo) voltam.
+  # * `group_by` - coluna ou lista de colunas (None: um único grupo com a tabela toda)
+  # * `metrics` - {coluna: [funções]} com funções de AGGREGATE_FUNCTIONS; '*' aceita só
+  #   'count' (linhas do grupo). Padrão: {'*': ['count']}
+  # * `where` - filtros no formato do find
+  # Retorna [{colunas do grupo..., '<coluna>_<função>': valor, 'count': linhas}], ex.:
+  #   dao.aggregate('numero_departamento', {'salario': ['sum', 'avg'], '*': ['count']})
+  #   -> [{'numero_departamento': 1, 'salario_sum': 9000.0, 'salario_avg': 4500.0, 'count': 2}, ...]
+  # Usa os agregados do PostgREST (select=numero_departamento,salario_sum:salario.sum(),...),
+  # que precisam estar habilitados no projeto (pgrst.db_aggregates_enabled); se estiverem
+  # desabilitados (PGRST123), calcula no cliente lendo só as colunas envolvidas, página por
+  # página, e o DAO não tenta mais o servidor. Outros erros são impressos e retornam [].
+  def aggregate(self, group_by: Optional[Union[str, Sequence[str]]] = None,
+                metrics: Optional[Dict[str, Sequence[str]]] = None, where: Optional[Dict[str, Any]] = None,
+                page_size: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+    groups = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    specs = _aggregate_specs(metrics or {'*': ['count']})
+    select = ','.join(groups + [
+      f'{alias}:{function}()' if column is None else f'{alias}:{column}.{function}()'
+      for alias, function, column in specs
+    ])
+    if self._server_aggregates:
+      try:
+        with self._operation('aggregate') as op:
+          data = apply_where(self._client.table(self._table_name).select(select), where).execute().data or []
+          op.rows(len(data))
+          return data
+      except Exception as e:
+        if getattr(e, 'code', None) != AGGREGATES_DISABLED:
+          print(f'Erro ao agregar {self._table_name}: {e}')
+          return []
+        self._server_aggregates = False
+        print(f'Agregação desabilitada no servidor ({e}); {self._table_name} será agregada no cliente')
+    try:
+      columns = list(dict.fromkeys(groups + [c for _, _, c in specs if c is not None] + [self._id_field]))
+      rows = self._iter_rows(page_size, columns=','.join(columns), where=where)
+      return _accumulate(rows, groups, specs)
+    except Exception as e:
+      print(f'Erro ao agregar {self._table_name}: {e}')
+      return []
+
   ### Update
-  # Atualiza um registro identificado por `id_field` (padrão 'id') e retorna o modelo atualizado
-  def update(self, id_value, model: T, id_field: str = 'id') -> Optional[T]:
+  # Atualiza um registro identificado por `id_field` (padrão: chave primária do DAO) e retorna o modelo atualizado
+  def update(self, id_value, model: T, id_field: Optional[str] = None) -> Optional[T]:
+    id_field = id_field or self._id_field
     try:
-      payload = self.to_dict(model)
-      response = self._client.table(self._table_name).update(payload).eq(id_field, id_value).execute()
-      if response.data:
-        data = response.data[0] if isinstance(response.data, list) else response.data
-        return self.to_model(data)
-      return None
+      with self._operation('update') as op:
+        payload = self.to_dict(model)
+        op.payload(payload)
+        response = self._client.table(self._table_name).update(payload).eq(id_field, id_value).execute()
+        if response.data:
+          data = response.data[0] if isinstance(response.data, list) else response.data
+          op.rows(1)
+          return self.to_model(data)
+        return None
     except Exception as e:
       print(f'Erro ao atualizar registro {id_value} em {self._table_name}: {e}')
       return None
   
+  ### Update (parcial / em massa)
+  # Envia apenas `fields` ({coluna: valor}) para os registros com `id_field` em `id_values`
+  # (padrão: chave primária do DAO), com um `update ... in (...)` por lote de `batch_size` ids.
+  # Retorna os modelos atualizados; se algum lote falhar, os demais ainda são enviados e ao
+  # final é lançada BulkWriteError com os modelos atualizados e as falhas.
+  def update_fields(self, id_values: Iterable[Any], fields: Dict[str, Any], id_field: Optional[str] = None,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+    id_field = id_field or self._id_field
+
+    def send(ids):
+      with self._operation('update_fields') as op:
+        op.payload(fields)
+        data = self._client.table(self._table_name).update(fields).in_(id_field, ids).execute().data or []
+        if isinstance(data, dict):
+          data = [data]
+        op.rows(len(data))
+        return self.to_models(data)
+    return self._by_id_batches(id_values, batch_size, send)
+
+  ### Delete (em massa)
+  # Remove os registros com `id_field` em `id_values`, um `delete ... in (...)` por lote.
+  # Retorna os ids removidos (BulkWriteError, como em update_fields, se algum lote falhar).
+  def delete_many(self, id_values: Iterable[Any], id_field: Optional[str] = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> List[Any]:
+    id_field = id_field or self._id_field
+
+    def send(ids):
+      with self._operation('delete_many') as op:
+        data = self._client.table(self._table_name).delete().in_(id_field, ids).execute().data or []
+        if isinstance(data, dict):
+          data = [data]
+        op.rows(len(data))
+        return [row.get(id_field) for row in data]
+    return self._by_id_batches(id_values, batch_size, send)
+
+  def _by_id_batches(self, id_values: Iterable[Any], batch_size: int, send) -> list:
+    if batch_size < 1:
+      raise ValueError('batch_size deve ser maior que zero')
+    done: list = []
+    failures: List[BatchFailure] = []
+    ids = list(dict.fromkeys(id_values))
+    for batch_index, start in enumerate(range(0, len(ids), batch_size)):
+      batch = ids[start:start + batch_size]
+      try:
+        done.extend(send(batch))
+      except Exception as e:
+        failures.append(BatchFailure(batch_index, start, len(batch), e))
+    if failures:
+      raise BulkWriteError(self._table_name, done, failures)
+    return done
+
   ### Delete
-  # Remove um registro identificado por `id_field` (padrão 'id'). Retorna True se removido com sucesso.
-  def delete(self, id_value, id_field: str = 'id') -> bool:
+  # Remove um registro identificado por `id_field` (padrão: chave primária do DAO). Retorna True se removido com sucesso.
+  def delete(self, id_value, id_field: Optional[str] = None) -> bool:
+    id_field = id_field or self._id_field
     try:
-      response = self._client.table(self._table_name).delete().eq(id_field, id_value).execute()
-      # Considera sucesso se não houver exceção e response.data for truthy (lista ou dict)
-      if hasattr(response, 'data') and response.data:
-        return True
-      # Alguns clientes retornam lista vazia; considerar como sucesso se status_code for 204 ou 200
-      if hasattr(response, 'status_code') and response.status_code in (200, 204):
-        return True
-      return False
+      with self._operation('delete') as op:
+        response = self._client.table(self._table_name).delete().eq(id_field, id_value).execute()
+        # Considera sucesso se não houver exceção e response.data for truthy (lista ou dict)
+        if hasattr(response, 'data') and response.data:
+          op.rows(len(response.data) if isinstance(response.data, list) else 1)
+          return True
+        # Alguns clientes retornam lista vazia; considerar como sucesso se status_code for 204 ou 200
+        if hasattr(response, 'status_code') and response.status_code in (200, 204):
+          return True
+        return False
     except Exception as e:
       print(f'Erro ao deletar registro {id_value} em {self._table_name}: {e}')
-      return False
\ No newline at end of file
+      return False
+
+
+# (alias, função, coluna) de cada agregado pedido; coluna None para count() das linhas
+def _aggregate_specs(metrics: Dict[str, Sequence[str]]) -> List[tuple]:
+  specs = []
+  for column, functions in metrics.items():
+    for function in ([functions] if isinstance(functions, str) else functions):
+      if function not in AGGREGATE_FUNCTIONS:
+        raise ValueError(f'Função de agregação desconhecida: {function} (use {", ".join(AGGREGATE_FUNCTIONS)})')
+      if column == '*':
+        if function != 'count':
+          raise ValueError(f"'*' aceita apenas count, não {function}")
+        specs.append(('count', 'count', None))
+      else:
+        specs.append((f'{column}_{function}', function, column))
+  return specs
+
+
+# Agregação no cliente (quando o servidor não tem os agregados habilitados): um acumulador
+# [valores não nulos, total/mínimo/máximo] por agregado e grupo, sem guardar as linhas
+def _accumulate(rows: Iterable[Dict[str, Any]], groups: List[str], specs: List[tuple]) -> List[Dict[str, Any]]:
+  states: Dict[tuple, List[list]] = {}
+  for row in rows:
+    key = tuple(row.get(g) for g in groups)
+    state = states.get(key)
+    if state is None:
+      state = states[key] = [[0, None] for _ in specs]
+    for (_, function, column), slot in zip(specs, state):
+      if column is None:
+        slot[0] += 1
+        continue
+      value = row.get(column)
+      if value is None:
+        continue
+      slot[0] += 1
+      current = slot[1]
+      if current is None:
+        slot[1] = value
+      elif function in ('sum', 'avg'):
+        slot[1] = current + value
+      elif function == 'min' and value < current:
+        slot[1] = value
+      elif function == 'max' and value > current:
+        slot[1] = value
+  if not groups and not states:
+    # sem agrupamento o resultado tem sempre uma linha (count 0, demais nulos)
+    states[()] = [[0, None] for _ in specs]
+  result = []
+  for key, state in states.items():
+    row = dict(zip(groups, key))
+    for (alias, function, _), (count, value) in zip(specs, state):
+      if function == 'count':
+        row[alias] = count
+      elif function == 'avg':
+        row[alias] = value / count if count else None
+      else:
+        row[alias] = value
+    result.append(row)
+  return result
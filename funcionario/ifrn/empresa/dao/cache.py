@@ -0,0 +1,232 @@
+'''
+  *** Cache de DAOs ***
+  Identity map com TTL e descarte LRU, e um DAO que lê através dele (read-through)
+'''
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from empresa.dao.base_dao import BaseDAO, BulkWriteError
+
+T = TypeVar('T')
+
+# (tabela, campo identificador, valor)
+CacheKey = Tuple[str, str, Hashable]
+
+
+class IdentityMap:
+  '''
+  Mapa de identidade limitado e seguro entre threads.
+  * `max_size` - quantidade máxima de entradas; a menos usada recentemente é descartada
+  * `ttl` - segundos de validade de cada entrada (None = não expira)
+  * `clock` - função de tempo (padrão time.monotonic), substituível em testes
+  * Geração por tabela: toda invalidação a incrementa; um put feito com a geração lida antes
+    da consulta ao banco é descartado se ela mudou no meio (a linha lida pode estar velha)
+  '''
+
+  def __init__(self, max_size: int = 1024, ttl: Optional[float] = 60.0,
+               clock: Callable[[], float] = time.monotonic):
+    if max_size < 1:
+      raise ValueError('max_size deve ser maior que zero')
+    self._max_size = max_size
+    self._ttl = ttl
+    self._clock = clock
+    self._entries: 'OrderedDict[CacheKey, Tuple[Any, float]]' = OrderedDict()
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+    self._expirations = 0
+    self._invalidations = 0
+    self._generations: Dict[str, int] = {}
+    self._epoch = 0  # incrementado por clear(), vale para todas as tabelas
+
+  def get(self, key: CacheKey) -> Optional[Any]:
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self._misses += 1
+        return None
+      value, expires_at = entry
+      if expires_at is not None and self._clock() >= expires_at:
+        del self._entries[key]
+        self._expirations += 1
+        self._misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self._hits += 1
+      return value
+
+  # Geração atual da tabela (ler antes de ir ao banco e passar para put)
+  def generation(self, table: str) -> int:
+    with self._lock:
+      return self._epoch + self._generations.get(table, 0)
+
+  def put(self, key: CacheKey, value: Any, generation: Optional[int] = None) -> None:
+    expires_at = None if self._ttl is None else self._clock() + self._ttl
+    with self._lock:
+      if generation is not None and generation != self._epoch + self._generations.get(key[0], 0):
+        return  # houve escrita na tabela durante a leitura
+      self._entries[key] = (value, expires_at)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self._max_size:
+        self._entries.popitem(last=False)
+        self._evictions += 1
+
+  def invalidate(self, key: CacheKey) -> None:
+    with self._lock:
+      self._bump(key[0])
+      if self._entries.pop(key, None) is not None:
+        self._invalidations += 1
+
+  # Remove as entradas de uma tabela (quando não dá para saber quais chaves mudaram);
+  # com `keep_field`, mantém as indexadas por esse campo (ex.: a chave primária)
+  def invalidate_table(self, table: str, keep_field: Optional[str] = None) -> None:
+    with self._lock:
+      self._bump(table)
+      for key in [k for k in self._entries if k[0] == table and k[1] != keep_field]:
+        del self._entries[key]
+        self._invalidations += 1
+
+  def _bump(self, table: str) -> None:
+    self._generations[table] = self._generations.get(table, 0) + 1
+
+  def clear(self) -> None:
+    with self._lock:
+      self._epoch += 1
+      self._entries.clear()
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  # Contadores de uso do cache
+  def stats(self) -> Dict[str, int]:
+    with self._lock:
+      return {
+        'size': len(self._entries),
+        'hits': self._hits,
+        'misses': self._misses,
+        'evictions': self._evictions,
+        'expirations': self._expirations,
+        'invalidations': self._invalidations,
+      }
+
+
+class CachedDAO(Generic[T]):
+  '''
+  Envolve um BaseDAO com um IdentityMap (opt-in):
+  * read - consulta o cache antes de ir ao banco e guarda o resultado
+  * create/create_many/upsert_many - populam o cache com os modelos retornados
+  * update/delete/update_fields/delete_many - invalidam as entradas afetadas depois da escrita
+    (e as lidas por outros campos, read(x, id_field=...), que não dá para localizar pela chave)
+  Os demais métodos (find, iter_all, ...) são repassados ao DAO sem cache.
+  O mesmo IdentityMap pode ser compartilhado entre DAOs e threads.
+  '''
+
+  def __init__(self, dao: BaseDAO[T], identity_map: Optional[IdentityMap] = None):
+    self._dao = dao
+    self._map = identity_map if identity_map is not None else IdentityMap()
+
+  @property
+  def identity_map(self) -> IdentityMap:
+    return self._map
+
+  def stats(self) -> Dict[str, int]:
+    return self._map.stats()
+
+  def __getattr__(self, name: str):
+    return getattr(self._dao, name)
+
+  def _key(self, id_value, id_field: Optional[str] = None) -> CacheKey:
+    return (self._dao.table_name, id_field or self._dao.id_field, id_value)
+
+  def _remember(self, models: Iterable[T]) -> None:
+    for model in models:
+      id_value = self._dao.id_of(model)
+      if id_value is not None:
+        self._map.put(self._key(id_value), model)
+
+  def read(self, id_value, id_field: Optional[str] = None) -> Optional[T]:
+    key = self._key(id_value, id_field)
+    model = self._map.get(key)
+    if model is None:
+      generation = self._map.generation(self._dao.table_name)
+      model = self._dao.read(id_value, id_field)
+      if model is not None:
+        self._map.put(key, model, generation)
+    return model
+
+  def create(self, model: T) -> Optional[T]:
+    created = self._dao.create(model)
+    if created is not None:
+      self._remember([created])
+    return created
+
+  def create_many(self, models: Iterable[T], **kwargs) -> List[T]:
+    return self._write_many(self._dao.create_many, models, **kwargs)
+
+  def upsert_many(self, models: Iterable[T], **kwargs) -> List[T]:
+    return self._write_many(self._dao.upsert_many, models, **kwargs)
+
+  def _write_many(self, write, models: Iterable[T], **kwargs) -> List[T]:
+    try:
+      created = write(models, **kwargs)
+    except BulkWriteError as e:
+      self._remember(e.created)
+      raise
+    self._remember(created)
+    return created
+
+  # As invalidações vêm depois da escrita: uma leitura concorrente que tenha buscado a linha
+  # antiga antes disso tem o put descartado pela geração da tabela
+  def update(self, id_value, model: T, id_field: Optional[str] = None) -> Optional[T]:
+    updated = None
+    try:
+      updated = self._dao.update(id_value, model, id_field)
+      return updated
+    finally:
+      self._forget([id_value], id_field)
+      # a chave primária também pode estar em cache quando o update é por outro campo
+      self._forget_models(m for m in (model, updated) if m is not None)
+
+  def delete(self, id_value, id_field: Optional[str] = None) -> bool:
+    try:
+      return self._dao.delete(id_value, id_field)
+    finally:
+      self._forget([id_value], id_field)
+
+  def update_fields(self, id_values: Iterable[Any], fields: Dict[str, Any], id_field: Optional[str] = None,
+                    **kwargs) -> List[T]:
+    ids = list(id_values)
+    updated: List[T] = []
+    try:
+      updated = self._dao.update_fields(ids, fields, id_field, **kwargs)
+      return updated
+    except BulkWriteError as e:
+      updated = e.created
+      raise
+    finally:
+      self._forget(ids, id_field)
+      # por outro campo, a chave primária dos atualizados também pode estar em cache
+      self._forget_models(updated)
+
+  def delete_many(self, id_values: Iterable[Any], id_field: Optional[str] = None, **kwargs) -> List[Any]:
+    ids = list(id_values)
+    try:
+      return self._dao.delete_many(ids, id_field, **kwargs)
+    finally:
+      if id_field is not None and id_field != self._dao.id_field:
+        # o delete só devolve o campo usado, não a chave primária das linhas removidas
+        self._map.invalidate_table(self._dao.table_name)
+      else:
+        self._forget(ids)
+
+  def _forget(self, ids: Iterable[Any], id_field: Optional[str] = None) -> None:
+    for id_value in ids:
+      self._map.invalidate(self._key(id_value, id_field))
+    self._map.invalidate_table(self._dao.table_name, keep_field=self._dao.id_field)
+
+  def _forget_models(self, models: Iterable[T]) -> None:
+    self._forget(i for i in map(self._dao.id_of, models) if i is not None)
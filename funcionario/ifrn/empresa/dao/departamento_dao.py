@@ -1,14 +1,32 @@
-from supabase import Client
+from typing import TYPE_CHECKING, List, Optional, Sequence
 from empresa.dao.base_dao import BaseDAO
+from empresa.dao.metrics import Metrics
 from empresa.models.departamento import Departamento
 
+if TYPE_CHECKING:
+  from supabase import Client
+
 class DepartamentoDAO(BaseDAO[Departamento]):
 
-  def __init__(self, client: Client):
-    super().__init__(client, 'departamento')
+  def __init__(self, client: 'Client', metrics: Optional[Metrics] = None):
+    super().__init__(client, 'departamento', id_field='numero', metrics=metrics)
 
   def to_model(self, data: dict) -> Departamento:
     return Departamento.from_dict(data)
 
   def to_dict(self, model: Departamento) -> dict:
-    return model.to_dict()
\ No newline at end of file
+    return model.to_dict()
+
+  def to_models(self, rows: List[dict]) -> List[Departamento]:
+    return Departamento.from_dicts(rows)
+
+  def to_dicts(self, models: List[Departamento]) -> List[dict]:
+    return Departamento.to_dicts(models)
+
+  # Departamentos gerenciados por um funcionário
+  def by_gerente(self, gerente_cpf: str, columns: Optional[Sequence[str]] = None) -> List[Departamento]:
+    return self.find(where={'gerente_cpf': gerente_cpf}, columns=columns, order_by='numero')
+
+  # Departamentos de uma localização (aceita curingas do LIKE, ex.: 'Bloco%')
+  def by_localizacao(self, localizacao: str, columns: Optional[Sequence[str]] = None) -> List[Departamento]:
+    return self.find(where={'localizacao': ('like', localizacao)}, columns=columns, order_by='numero')
\ No newline at end of file
@@ -0,0 +1,427 @@
+'''
+  *** Exportação / importação de tabelas ***
+  Backup e migração de uma tabela inteira com memória limitada (uma página/lote por vez)
+  * export_table - percorre a tabela em páginas (paginação por chave do BaseDAO) e grava cada
+    página de uma vez em JSONL, CSV ou Parquet (pyarrow, opcional), com gzip opcional; o
+    arquivo só aparece com o nome final quando a exportação termina
+  * import_table - lê o arquivo em blocos, valida cada linha com o from_dict do modelo e grava
+    em lotes (upsert_many ou create_many); com `checkpoint`, o progresso é salvo a cada bloco e
+    uma nova execução continua de onde a anterior parou
+  O formato vem da extensão (.jsonl/.ndjson, .csv, .parquet, com .gz opcional nos dois
+  primeiros) ou do parâmetro `format`.
+'''
+
+import csv
+import gzip
+import io
+import json
+import os
+from dataclasses import MISSING, dataclass, field, fields
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, get_args, get_type_hints
+
+from empresa.dao.base_dao import DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE, BaseDAO
+from empresa.dao.session import _model_type
+
+FORMATS = ('jsonl', 'csv', 'parquet')
+_EXTENSIONS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl', '.csv': 'csv', '.parquet': 'parquet'}
+# Linhas acumuladas antes de fechar um row group do Parquet (páginas pequenas geram arquivos lentos)
+PARQUET_ROW_GROUP = 64 * 1024
+# Motivos de rejeição guardados no resultado (as demais rejeições só são contadas)
+MAX_REASONS = 1000
+
+
+@dataclass
+class ExportResult:
+  path: str
+  format: str
+  rows: int
+  pages: int
+
+
+@dataclass
+class ImportResult:
+  '''
+  Resultado de import_table
+  * `read` - registros lidos do arquivo nesta execução (sem os já processados no checkpoint)
+  * `skipped` - registros pulados por já constarem no checkpoint
+  * `reasons` - {nº do registro (1, 2, ...): motivo}, até MAX_REASONS
+  '''
+  read: int = 0
+  written: int = 0
+  rejected: int = 0
+  skipped: int = 0
+  reasons: Dict[int, str] = field(default_factory=dict)
+
+
+def detect_format(path: str) -> Tuple[str, bool]:
+  '''Formato e compressão (gzip) de um caminho pela extensão, ex.: 'f.csv.gz' -> ('csv', True)'''
+  base, ext = os.path.splitext(path.lower())
+  gzipped = ext == '.gz'
+  if gzipped:
+    ext = os.path.splitext(base)[1]
+  fmt = _EXTENSIONS.get(ext)
+  if fmt is None:
+    raise ValueError(f'Extensão não reconhecida em {path} (use {", ".join(_EXTENSIONS)} ou informe format)')
+  return fmt, gzipped
+
+
+def _resolve(path: str, format: Optional[str], compress: Optional[bool]) -> Tuple[str, bool]:
+  if format is None:
+    format, gzipped = detect_format(path)
+  else:
+    gzipped = path.lower().endswith('.gz')
+  if format not in FORMATS:
+    raise ValueError(f'Formato desconhecido: {format} (use {", ".join(FORMATS)})')
+  if compress is not None:
+    gzipped = compress
+  if format == 'parquet' and gzipped:
+    raise ValueError('Parquet já é comprimido por coluna; use compression= em vez de .gz')
+  return format, gzipped
+
+
+def _open_text(path: str, mode: str, gzipped: bool):
+  if gzipped:
+    # nível 6: quase o mesmo tamanho do 9, bem mais rápido
+    return io.TextIOWrapper(gzip.open(path, mode + 'b', compresslevel=6), encoding='utf-8', newline='')
+  return open(path, mode, encoding='utf-8', newline='', buffering=1 << 20)
+
+
+def _pyarrow():
+  try:
+    import pyarrow
+    import pyarrow.parquet
+  except ImportError:
+    raise RuntimeError('Parquet requer o pyarrow (pip install pyarrow)') from None
+  return pyarrow
+
+
+### Tipos das colunas
+# Tipo de cada coluna do modelo do DAO (Optional[float] -> float), pelas anotações do dataclass
+def _column_types(dao: BaseDAO) -> Dict[str, type]:
+  model_type = _model_type(dao)
+  hints = get_type_hints(model_type)
+  types = {}
+  for f in fields(model_type):
+    kind = hints.get(f.name)
+    args = [a for a in get_args(kind) if a is not type(None)]
+    if args:
+      kind = args[0]
+    if isinstance(kind, type):
+      types[f.name] = kind
+  return types
+
+
+# Campos obrigatórios: sem valor padrão e sem Optional (ex.: cpf, pnome, unome)
+def _required_fields(dao: BaseDAO) -> List[str]:
+  model_type = _model_type(dao)
+  hints = get_type_hints(model_type)
+  return [
+    f.name for f in fields(model_type)
+    if f.default is MISSING and f.default_factory is MISSING and type(None) not in get_args(hints.get(f.name))
+  ]
+
+
+def _parse_bool(text: str) -> bool:
+  lowered = text.strip().lower()
+  if lowered in ('true', 't', '1', 'sim'):
+    return True
+  if lowered in ('false', 'f', '0', 'nao', 'não'):
+    return False
+  raise ValueError(text)
+
+
+# Conversores texto -> valor para as colunas do CSV; datas ficam em texto ISO (o from_dict
+# dos modelos converte created_at/updated_at e o banco aceita o texto nas demais)
+_FROM_TEXT: Dict[type, Callable[[str], Any]] = {
+  int: int,
+  float: float,
+  bool: _parse_bool,
+  date: lambda text: date.fromisoformat(text).isoformat(),
+  datetime: lambda text: datetime.fromisoformat(text).isoformat(),
+}
+
+
+### Exportação
+def export_table(dao: BaseDAO, path: str, format: Optional[str] = None, compress: Optional[bool] = None,
+                 where: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+                 page_size: int = DEFAULT_PAGE_SIZE, compression: str = 'snappy') -> ExportResult:
+  '''
+  Exporta a tabela do DAO para `path`, uma página por vez
+  * `where`/`columns` - filtros (formato do BaseDAO.find) e colunas (padrão: todas)
+  * `compress` - força (True) ou desliga (False) o gzip; padrão: pela extensão .gz
+  * `compression` - codec interno do Parquet ('snappy', 'zstd', 'gzip', 'none')
+  '''
+  format, gzipped = _resolve(path, format, compress)
+  selected = list(columns) if columns else None
+  if selected and dao.id_field not in selected:
+    # a paginação por chave precisa da chave primária em cada página
+    selected.append(dao.id_field)
+  pages = dao._iter_pages(page_size, columns=','.join(selected) if selected else '*', where=where)
+  writer = {'jsonl': _write_jsonl, 'csv': _write_csv, 'parquet': _write_parquet}[format]
+  # grava em um arquivo temporário: uma exportação interrompida não deixa um arquivo parcial
+  # com o nome final
+  partial = path + '.partial'
+  try:
+    if format == 'parquet':
+      rows, count = writer(partial, pages, _column_types(dao), compression)
+    else:
+      with _open_text(partial, 'w', gzipped) as out:
+        rows, count = writer(out, pages)
+    os.replace(partial, path)
+  except BaseException:
+    if os.path.exists(partial):
+      os.remove(partial)
+    raise
+  return ExportResult(path, format, rows, count)
+
+
+# Datas em texto ISO, como o PostgREST devolve
+def _json_default(value: Any) -> Any:
+  if isinstance(value, (date, datetime)):
+    return value.isoformat()
+  return str(value)
+
+
+# Cada página vira um único write (o texto da página inteira)
+def _write_jsonl(out, pages: Iterator[List[Dict[str, Any]]]) -> Tuple[int, int]:
+  encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default).encode
+  rows = count = 0
+  for page in pages:
+    out.write('\n'.join(map(encode, page)) + '\n')
+    rows += len(page)
+    count += 1
+  return rows, count
+
+
+def _write_csv(out, pages: Iterator[List[Dict[str, Any]]]) -> Tuple[int, int]:
+  rows = count = 0
+  writer = None
+  buffer = io.StringIO()
+  for page in pages:
+    if writer is None:
+      # cabeçalho pelas colunas da primeira página (todas as páginas têm as mesmas colunas)
+      writer = csv.DictWriter(buffer, fieldnames=list(page[0]), extrasaction='ignore', lineterminator='\n')
+      writer.writeheader()
+    # nulos viram célula vazia
+    writer.writerows(page)
+    out.write(buffer.getvalue())
+    buffer.seek(0)
+    buffer.truncate()
+    rows += len(page)
+    count += 1
+  return rows, count
+
+
+_ARROW_TYPES = {int: 'int64', float: 'float64', bool: 'bool_'}
+
+
+def _write_parquet(path: str, pages: Iterator[List[Dict[str, Any]]], types: Dict[str, type],
+                   compression: str) -> Tuple[int, int]:
+  pa = _pyarrow()
+  rows = count = 0
+  writer = None
+  schema = None
+  pending: List[Dict[str, Any]] = []
+
+  def flush():
+    writer.write_table(pa.Table.from_pylist(pending, schema=schema))
+    pending.clear()
+
+  try:
+    for page in pages:
+      if writer is None:
+        # esquema pelas anotações do modelo: números e booleanos tipados, o resto (texto, datas)
+        # em texto ISO, como trafega no PostgREST
+        schema = pa.schema([
+          (name, getattr(pa, _ARROW_TYPES.get(types.get(name), 'string'))()) for name in page[0]
+        ])
+        writer = pa.parquet.ParquetWriter(path, schema, compression=compression)
+      text_columns = [f.name for f in schema if f.type == pa.string()]
+      for row in page:
+        for name in text_columns:
+          value = row.get(name)
+          if value is not None and not isinstance(value, str):
+            row[name] = value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+      pending.extend(page)
+      if len(pending) >= PARQUET_ROW_GROUP:
+        flush()
+      rows += len(page)
+      count += 1
+    if writer is None:
+      # tabela vazia: arquivo válido, sem colunas
+      writer = pa.parquet.ParquetWriter(path, pa.schema([]), compression=compression)
+    elif pending:
+      flush()
+  finally:
+    if writer is not None:
+      writer.close()
+  return rows, count
+
+
+### Importação
+def import_table(dao: BaseDAO, path: str, format: Optional[str] = None, compress: Optional[bool] = None,
+                 mode: str = 'upsert', batch_size: int = DEFAULT_BATCH_SIZE,
+                 checkpoint: Optional[str] = None, rejects: Optional[str] = None) -> ImportResult:
+  '''
+  Importa `path` para a tabela do DAO, `batch_size` registros por requisição
+  * `mode` - 'upsert' (padrão: reexecutar é seguro) ou 'insert' (create_many; falha em chaves
+    já existentes)
+  * `checkpoint` - arquivo JSON com o progresso, gravado depois de cada lote; se já existir
+    (e for do mesmo arquivo de origem), os registros já gravados são pulados. É removido
+    quando a importação termina
+  * `rejects` - arquivo JSONL que recebe as linhas rejeitadas na validação, com o motivo
+  Se um lote falhar, a BulkWriteError do DAO é propagada e o checkpoint fica no último lote
+  gravado.
+  '''
+  if mode not in ('upsert', 'insert'):
+    raise ValueError(f'mode deve ser upsert ou insert, não {mode}')
+  if batch_size < 1:
+    raise ValueError('batch_size deve ser maior que zero')
+  format, gzipped = _resolve(path, format, compress)
+  write = dao.upsert_many if mode == 'upsert' else dao.create_many
+  types = _column_types(dao)
+  required = _required_fields(dao)
+  result = ImportResult()
+
+  state = _load_checkpoint(checkpoint, path, dao.table_name)
+  done = state['records']
+  result.skipped = done
+  reject_file = open(rejects, 'a' if done else 'w', encoding='utf-8') if rejects else None
+  try:
+    records = _read_records(path, format, gzipped, batch_size)
+    for chunk in records:
+      first = chunk[0][0]
+      if first + len(chunk) - 1 <= done:
+        continue
+      chunk = [item for item in chunk if item[0] > done]
+      valid_numbers, valid_rows = [], []
+      for number, row, error in chunk:
+        if error is None and format == 'csv':
+          row, error = _from_text(row, types)
+        if error is None:
+          valid_numbers.append(number)
+          valid_rows.append(row)
+        else:
+          _reject(result, reject_file, number, error, row)
+      models = []
+      for number, row, model in zip(valid_numbers, valid_rows, dao.to_models(valid_rows)):
+        missing = [name for name in required if getattr(model, name, None) in (None, '')]
+        if missing:
+          _reject(result, reject_file, number, f'campo(s) obrigatório(s) vazio(s): {", ".join(missing)}', row)
+        else:
+          models.append(model)
+      if models:
+        write(models, batch_size=batch_size)
+      result.read += len(chunk)
+      result.written += len(models)
+      done = chunk[-1][0]
+      if reject_file is not None:
+        reject_file.flush()
+      if checkpoint:
+        state.update(records=done, written=state['written'] + len(models),
+                     rejected=state['rejected'] + len(chunk) - len(models))
+        _save_checkpoint(checkpoint, state)
+  finally:
+    if reject_file is not None:
+      reject_file.close()
+  if checkpoint and os.path.exists(checkpoint):
+    os.remove(checkpoint)
+  return result
+
+
+def _reject(result: ImportResult, reject_file, number: int, reason: str, row: Any) -> None:
+  result.rejected += 1
+  if len(result.reasons) < MAX_REASONS:
+    result.reasons[number] = reason
+  if reject_file is not None:
+    reject_file.write(json.dumps({'record': number, 'reason': reason, 'row': row},
+                                 ensure_ascii=False, default=_json_default) + '\n')
+
+
+# Converte as células de texto do CSV pelos tipos do modelo; célula vazia vira None
+def _from_text(row: Dict[str, Any], types: Dict[str, type]) -> Tuple[Dict[str, Any], Optional[str]]:
+  converted = {}
+  for name, text in row.items():
+    if text is None or text == '':
+      converted[name] = None
+      continue
+    parse = _FROM_TEXT.get(types.get(name))
+    if parse is None:
+      converted[name] = text
+      continue
+    try:
+      converted[name] = parse(text)
+    except ValueError:
+      return row, f'{name}: valor inválido {text!r}'
+  return converted, None
+
+
+# Blocos de até `size` itens (nº do registro, linha, erro de leitura ou None)
+def _read_records(path: str, format: str, gzipped: bool, size: int) -> Iterator[List[Tuple[int, Any, Optional[str]]]]:
+  if format == 'parquet':
+    pq = _pyarrow().parquet
+    number = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=size):
+      chunk = []
+      for row in batch.to_pylist():
+        number += 1
+        chunk.append((number, row, None))
+      yield chunk
+    return
+  with _open_text(path, 'r', gzipped) as source:
+    if format == 'csv':
+      items = ((row, None) for row in csv.DictReader(source))
+    else:
+      items = _parse_jsonl(source)
+    chunk = []
+    for number, (row, error) in enumerate(items, 1):
+      chunk.append((number, row, error))
+      if len(chunk) >= size:
+        yield chunk
+        chunk = []
+    if chunk:
+      yield chunk
+
+
+def _parse_jsonl(source) -> Iterator[Tuple[Any, Optional[str]]]:
+  for line in source:
+    line = line.strip()
+    if not line:
+      continue
+    try:
+      row = json.loads(line)
+    except ValueError as e:
+      yield line, f'JSON inválido: {e}'
+      continue
+    if isinstance(row, dict):
+      yield row, None
+    else:
+      yield row, 'a linha não é um objeto JSON'
+
+
+### Checkpoint
+def _source_id(path: str) -> Dict[str, Any]:
+  stat = os.stat(path)
+  return {'source': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _load_checkpoint(checkpoint: Optional[str], path: str, table: str) -> Dict[str, Any]:
+  state = dict(_source_id(path), table=table, records=0, written=0, rejected=0)
+  if not checkpoint or not os.path.exists(checkpoint):
+    return state
+  with open(checkpoint, encoding='utf-8') as f:
+    saved = json.load(f)
+  for key in ('source', 'size', 'mtime_ns', 'table'):
+    if saved.get(key) != state[key]:
+      raise ValueError(f'O checkpoint {checkpoint} é de outra importação ({key} diferente); '
+                       'remova-o para começar do início')
+  return saved
+
+
+# Gravação atômica: o checkpoint nunca fica pela metade
+def _save_checkpoint(checkpoint: str, state: Dict[str, Any]) -> None:
+  partial = checkpoint + '.partial'
+  with open(partial, 'w', encoding='utf-8') as f:
+    json.dump(state, f)
+  os.replace(partial, checkpoint)
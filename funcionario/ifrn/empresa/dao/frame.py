@@ -0,0 +1,302 @@
+'''
+  *** ColumnFrame ***
+  Resultado de consulta em formato colunar: um array por coluna em vez de um objeto por linha
+  * Colunas numéricas - int64/float64 (NumPy quando instalado, senão módulo `array`)
+  * Demais colunas (texto, datas, booleanos) - codificadas por dicionário: códigos int32 + categorias
+  * Valores nulos ficam marcados em uma máscara por coluna
+  * GroupBy com sum/mean/count vetorizados (np.bincount) ou em laço simples sem NumPy
+'''
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+  import numpy as np
+except ImportError:  # NumPy é opcional
+  np = None
+
+# Tipos de coluna
+INT = 'int'
+FLOAT = 'float'
+CATEGORY = 'category'
+
+_TYPECODES = {INT: 'q', FLOAT: 'd', CATEGORY: 'i'}
+_DTYPES = {INT: 'int64', FLOAT: 'float64', CATEGORY: 'int32'}
+
+
+class _ColumnBuilder:
+  '''Acumula os valores de uma coluna, promovendo o tipo quando necessário (int -> float -> category)'''
+
+  def __init__(self):
+    self.kind: Optional[str] = None
+    self.data = array('q')
+    self.nulls: Optional[array] = None
+    self.categories: List[Any] = []
+    self.codes: Dict[tuple, int] = {}
+    self.length = 0
+
+  def append(self, value: Any) -> None:
+    if value is None:
+      self._mark_null()
+      if self.kind == CATEGORY:
+        self.data.append(self._code(None))
+      else:
+        self.data.append(0)
+      self.length += 1
+      return
+    kind = self._kind_of(value)
+    if self.kind is None:
+      self._start(kind)
+    elif kind != self.kind and self.kind != CATEGORY:
+      if kind == CATEGORY:
+        self._to_category()
+      elif kind == FLOAT:
+        self._to_float()
+    if self.kind == CATEGORY:
+      self.data.append(self._code(value))
+    else:
+      self.data.append(value)
+    if self.nulls is not None:
+      self.nulls.append(0)
+    self.length += 1
+
+  @staticmethod
+  def _kind_of(value: Any) -> str:
+    cls = value.__class__
+    if cls is int:
+      return INT
+    if cls is float:
+      return FLOAT
+    return CATEGORY
+
+  def _start(self, kind: str) -> None:
+    # só havia nulos até aqui: o array ainda está vazio de valores reais
+    self.kind = kind
+    if kind == CATEGORY:
+      self.data = array('i', [self._code(None)] * self.length)
+    else:
+      self.data = array(_TYPECODES[kind], [0] * self.length)
+
+  def _mark_null(self) -> None:
+    if self.nulls is None:
+      self.nulls = array('b', [0] * self.length)
+    self.nulls.append(1)
+
+  def _code(self, value: Any) -> int:
+    # a classe entra na chave para que True e 1 (iguais no dict) não se misturem
+    key = (value.__class__, value)
+    code = self.codes.get(key)
+    if code is None:
+      code = len(self.categories)
+      self.codes[key] = code
+      self.categories.append(value)
+    return code
+
+  def _to_float(self) -> None:
+    self.data = array('d', self.data)
+    self.kind = FLOAT
+
+  def _to_category(self) -> None:
+    nulls = self.nulls
+    values = self.data
+    self.data = array('i', (
+      self._code(None if nulls is not None and nulls[i] else values[i]) for i in range(len(values))
+    ))
+    self.kind = CATEGORY
+
+  def build(self) -> 'Column':
+    if self.kind is None:
+      # coluna vazia ou só com nulos: sem tipo, vira FLOAT com todos marcados como nulos,
+      # para que sum/mean/count funcionem (em vez de falhar como coluna por dicionário)
+      self._start(FLOAT)
+    data, nulls = self.data, self.nulls
+    if self.kind == CATEGORY:
+      # nas colunas por dicionário o nulo já é uma categoria
+      nulls = None
+    if np is not None:
+      data = np.frombuffer(data, dtype=_DTYPES[self.kind]) if len(data) else np.zeros(0, _DTYPES[self.kind])
+      if nulls is not None:
+        nulls = np.frombuffer(nulls, dtype='int8').astype(bool)
+    return Column(self.kind, data, nulls, self.categories if self.kind == CATEGORY else None)
+
+
+class Column:
+  '''
+  Uma coluna do frame
+  * `kind` - INT, FLOAT ou CATEGORY
+  * `data` - valores (numéricas) ou códigos das categorias (CATEGORY)
+  * `nulls` - máscara de nulos das colunas numéricas (None se não houver nulos)
+  * `categories` - valores distintos das colunas CATEGORY, indexados pelo código
+  '''
+
+  __slots__ = ['kind', 'data', 'nulls', 'categories']
+
+  def __init__(self, kind: str, data, nulls, categories: Optional[List[Any]]):
+    self.kind = kind
+    self.data = data
+    self.nulls = nulls
+    self.categories = categories
+
+  def __len__(self) -> int:
+    return len(self.data)
+
+  def is_null(self, i: int) -> bool:
+    if self.kind == CATEGORY:
+      return self.categories[self.data[i]] is None
+    return self.nulls is not None and bool(self.nulls[i])
+
+  def to_list(self) -> List[Any]:
+    if self.kind == CATEGORY:
+      categories = self.categories
+      return [categories[c] for c in self.data]
+    values = self.data.tolist()
+    if self.nulls is not None:
+      return [None if n else v for v, n in zip(values, self.nulls.tolist())]
+    return values
+
+
+class ColumnFrameBuilder:
+  '''Monta um ColumnFrame a partir de páginas de linhas (dicts), sem guardar as linhas'''
+
+  def __init__(self, columns: Sequence[str]):
+    self._columns = list(columns)
+    self._builders = {name: _ColumnBuilder() for name in self._columns}
+
+  def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+    for name, builder in self._builders.items():
+      append = builder.append
+      for row in rows:
+        append(row.get(name))
+
+  def build(self) -> 'ColumnFrame':
+    return ColumnFrame({name: b.build() for name, b in self._builders.items()})
+
+
+class ColumnFrame:
+  '''
+  Conjunto de colunas com o mesmo número de linhas
+  * frame['salario'] - array de valores (ou de códigos, nas colunas por dicionário)
+  * frame.column('salario') - objeto Column com tipo, máscara de nulos e categorias
+  * frame.groupby('numero_departamento').sum('salario')
+  '''
+
+  def __init__(self, columns: Dict[str, Column]):
+    self._columns = columns
+    lengths = {len(c) for c in columns.values()}
+    if len(lengths) > 1:
+      raise ValueError('Todas as colunas precisam ter o mesmo tamanho')
+    self._length = lengths.pop() if lengths else 0
+
+  @classmethod
+  def from_rows(cls, rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> 'ColumnFrame':
+    builder = ColumnFrameBuilder(columns)
+    builder.extend(rows if isinstance(rows, list) else list(rows))
+    return builder.build()
+
+  def __len__(self) -> int:
+    return self._length
+
+  def __contains__(self, name: str) -> bool:
+    return name in self._columns
+
+  def __getitem__(self, name: str):
+    return self._columns[name].data
+
+  @property
+  def columns(self) -> List[str]:
+    return list(self._columns)
+
+  def column(self, name: str) -> Column:
+    return self._columns[name]
+
+  def to_list(self, name: str) -> List[Any]:
+    return self._columns[name].to_list()
+
+  def groupby(self, key: str) -> 'GroupBy':
+    return GroupBy(self, key)
+
+
+class GroupBy:
+  '''Agrupamento de um ColumnFrame por uma coluna; resultados como {valor da chave: agregado}'''
+
+  def __init__(self, frame: ColumnFrame, key: str):
+    self._frame = frame
+    self._codes, self._keys = self._factorize(frame.column(key))
+
+  @staticmethod
+  def _factorize(column: Column):
+    if column.kind == CATEGORY:
+      return column.data, list(column.categories)
+    if np is not None and column.nulls is None:
+      keys, codes = np.unique(column.data, return_inverse=True)
+      return codes, keys.tolist()
+    # numéricas com nulos (ou sem NumPy): códigos na ordem em que as chaves aparecem
+    values = column.to_list()
+    mapping: Dict[Any, int] = {}
+    codes = array('i', (mapping.setdefault(v, len(mapping)) for v in values))
+    return (np.frombuffer(codes, dtype='int32') if np is not None and len(codes) else codes), list(mapping)
+
+  @property
+  def keys(self) -> List[Any]:
+    return list(self._keys)
+
+  def _valid(self, column: Column):
+    '''Máscara das linhas não nulas da coluna (None = todas válidas)'''
+    if column.kind == CATEGORY:
+      raise TypeError('Agregações numéricas não se aplicam a colunas por dicionário')
+    return column.nulls
+
+  def _bincount(self, weights=None) -> List[float]:
+    k = len(self._keys)
+    if np is not None:
+      return np.bincount(self._codes, weights=weights, minlength=k).tolist()
+    totals = [0] * k
+    if weights is None:
+      for code in self._codes:
+        totals[code] += 1
+    else:
+      for code, w in zip(self._codes, weights):
+        totals[code] += w
+    return totals
+
+  def _sums_and_counts(self, name: str):
+    column = self._frame.column(name)
+    nulls = self._valid(column)
+    if np is not None:
+      values = column.data.astype('float64')
+      if nulls is not None:
+        values = np.where(nulls, 0.0, values)
+        counts = self._bincount((~nulls).astype('float64'))
+      else:
+        counts = self._bincount()
+      return self._bincount(values), counts
+    values = column.data
+    if nulls is not None:
+      values = [0 if n else v for v, n in zip(values, nulls)]
+      counts = self._bincount([0 if n else 1 for n in nulls])
+    else:
+      counts = self._bincount()
+    return self._bincount(values), counts
+
+  def _result(self, values, counts=None) -> Dict[Any, Any]:
+    group_sizes = counts if counts is not None else self._bincount()
+    return {key: value for key, value, size in zip(self._keys, values, group_sizes) if size}
+
+  # Soma de `name` por grupo (nulos ignorados)
+  def sum(self, name: str) -> Dict[Any, float]:
+    sums, _ = self._sums_and_counts(name)
+    return self._result(sums)
+
+  # Média de `name` por grupo (nulos ignorados; None se o grupo só tiver nulos)
+  def mean(self, name: str) -> Dict[Any, Optional[float]]:
+    sums, counts = self._sums_and_counts(name)
+    means = [s / c if c else None for s, c in zip(sums, counts)]
+    return self._result(means)
+
+  # Linhas por grupo ou, com `name`, valores não nulos de `name` por grupo
+  def count(self, name: Optional[str] = None) -> Dict[Any, int]:
+    sizes = [int(c) for c in self._bincount()]
+    if name is None:
+      return self._result(sizes)
+    _, counts = self._sums_and_counts(name)
+    return self._result([int(c) for c in counts], sizes)
@@ -1,14 +1,167 @@
-from supabase import Client
-from empresa.dao.base_dao import BaseDAO
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from empresa.dao.base_dao import DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE, BaseDAO, BulkWriteError
+from empresa.dao.metrics import Metrics
 from empresa.models.funcionario import Funcionario
 
+if TYPE_CHECKING:
+  from supabase import Client
+  from empresa.dao.hierarchy import Hierarchy
+
 class FuncionarioDAO(BaseDAO[Funcionario]):
 
-  def __init__(self, client: Client):
-    super().__init__(client, 'funcionario')
+  # Relações aceitas em `include`: nome do atributo -> coluna com a chave
+  RELATIONS = {'departamento': 'numero_departamento', 'supervisor': 'cpf_supervisor'}
+
+  def __init__(self, client: 'Client', metrics: Optional[Metrics] = None):
+    super().__init__(client, 'funcionario', id_field='cpf', metrics=metrics)
+    self._hierarchy: Optional['Hierarchy'] = None
 
   def to_model(self, data: dict) -> Funcionario:
     return Funcionario.from_dict(data)
 
   def to_dict(self, model: Funcionario) -> dict:
-    return model.to_dict()
\ No newline at end of file
+    return model.to_dict()
+
+  def to_models(self, rows: List[dict]) -> List[Funcionario]:
+    return Funcionario.from_dicts(rows)
+
+  def to_dicts(self, models: List[Funcionario]) -> List[dict]:
+    return Funcionario.to_dicts(models)
+
+  ### Read com relações
+  # `include` - relações a carregar junto (RELATIONS), ex.: ['departamento', 'supervisor'].
+  # Cada relação custa uma consulta `in` com as chaves distintas do resultado (por página,
+  # em iter_all), não uma por funcionário.
+  def read_all(self, include: Optional[Sequence[str]] = None) -> List[Funcionario]:
+    return self.include(super().read_all(), include)
+
+  def find(self, where: Optional[Dict[str, Any]] = None, columns: Optional[Sequence[str]] = None,
+           order_by: Optional[Union[str, Sequence[str]]] = None, limit: Optional[int] = None,
+           include: Optional[Sequence[str]] = None) -> List[Funcionario]:
+    return self.include(super().find(where, columns, order_by, limit), include)
+
+  def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE, order_by: Optional[str] = None,
+               include: Optional[Sequence[str]] = None) -> Iterator[Funcionario]:
+    for rows in self._iter_pages(page_size, order_by):
+      yield from self.include(self.to_models(rows), include)
+
+  # include - carrega as relações em modelos já lidos
+  # * supervisores que estão entre os próprios modelos não são buscados de novo
+  def include(self, models: List[Funcionario], relations: Optional[Sequence[str]]) -> List[Funcionario]:
+    for name in relations or ():
+      if name == 'departamento':
+        from empresa.dao.departamento_dao import DepartamentoDAO
+        related = DepartamentoDAO(self._client, metrics=self._metrics)
+        self.load_related(models, self.RELATIONS[name], related, name)
+      elif name == 'supervisor':
+        self.load_related(models, self.RELATIONS[name], self, name, known=models)
+      else:
+        raise ValueError(f'Relação desconhecida: {name} (use {", ".join(self.RELATIONS)})')
+    return models
+
+  ### Hierarquia (cpf_supervisor)
+  # hierarchy - organograma indexado (ver empresa/dao/hierarchy.py), montado na primeira chamada
+  # lendo só cpf e cpf_supervisor e mantido pelas escritas feitas por este DAO (create, update,
+  # delete e as versões em massa). Alterações feitas por outros DAOs/processos só aparecem com
+  # `refresh=True`.
+  def hierarchy(self, refresh: bool = False) -> 'Hierarchy':
+    if self._hierarchy is None or refresh:
+      from empresa.dao.hierarchy import Hierarchy
+      self._hierarchy = Hierarchy.from_dao(self)
+    return self._hierarchy
+
+  def create(self, model: Funcionario) -> Optional[Funcionario]:
+    created = super().create(model)
+    if created is not None:
+      self._track([created])
+    return created
+
+  # create_many e upsert_many (inclusive os lotes gravados antes de uma BulkWriteError)
+  def _write_many(self, operation: str, models: Iterable[Funcionario], batch_size: int, build) -> List[Funcionario]:
+    try:
+      created = super()._write_many(operation, models, batch_size, build)
+    except BulkWriteError as e:
+      self._track(e.created)
+      raise
+    self._track(created)
+    return created
+
+  def update(self, id_value, model: Funcionario, id_field: Optional[str] = None) -> Optional[Funcionario]:
+    updated = super().update(id_value, model, id_field)
+    if updated is not None and self._hierarchy is not None:
+      if (id_field or self._id_field) != self._id_field:
+        self._hierarchy = None  # não dá para saber qual cpf mudou: remonta na próxima consulta
+      else:
+        if id_value != updated.cpf:
+          self._hierarchy.remove(id_value)
+        self._track([updated])
+    return updated
+
+  def update_fields(self, id_values: Iterable[Any], fields: Dict[str, Any], id_field: Optional[str] = None,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> List[Funcionario]:
+    if 'cpf' in fields:
+      self._hierarchy = None
+    if 'cpf_supervisor' not in fields:
+      return super().update_fields(id_values, fields, id_field, batch_size)
+    try:
+      updated = super().update_fields(id_values, fields, id_field, batch_size)
+    except BulkWriteError as e:
+      self._track(e.created)
+      raise
+    self._track(updated)
+    return updated
+
+  def delete(self, id_value, id_field: Optional[str] = None) -> bool:
+    removed = super().delete(id_value, id_field)
+    if removed:
+      self._untrack(id_field, [id_value])
+    return removed
+
+  def delete_many(self, id_values: Iterable[Any], id_field: Optional[str] = None,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> List[Any]:
+    try:
+      removed = super().delete_many(id_values, id_field, batch_size)
+    except BulkWriteError as e:
+      self._untrack(id_field, e.created)
+      raise
+    self._untrack(id_field, removed)
+    return removed
+
+  def _track(self, models: Iterable[Funcionario]) -> None:
+    if self._hierarchy is not None:
+      for model in models:
+        self._hierarchy.add(model.cpf, model.cpf_supervisor)
+
+  def _untrack(self, id_field: Optional[str], id_values: Iterable[Any]) -> None:
+    if self._hierarchy is None:
+      return
+    if (id_field or self._id_field) != self._id_field:
+      self._hierarchy = None
+      return
+    for cpf in id_values:
+      self._hierarchy.remove(cpf)
+
+  # Funcionários de um departamento
+  def by_departamento(self, numero: int, columns: Optional[Sequence[str]] = None) -> List[Funcionario]:
+    return self.find(where={'numero_departamento': numero}, columns=columns, order_by='cpf')
+
+  # Subordinados diretos de um supervisor
+  def by_supervisor(self, cpf_supervisor: str, columns: Optional[Sequence[str]] = None) -> List[Funcionario]:
+    return self.find(where={'cpf_supervisor': cpf_supervisor}, columns=columns, order_by='cpf')
+
+  # Funcionários com salário acima de `valor`, do maior para o menor
+  def by_salario_acima(self, valor: float, columns: Optional[Sequence[str]] = None) -> List[Funcionario]:
+    return self.find(where={'salario': ('gt', valor)}, columns=columns, order_by='-salario')
+
+  # Folha por departamento: {numero_departamento: {'total', 'media', 'quantidade'}}
+  # * Agregado no servidor (aggregate): volta uma linha por departamento, não os funcionários
+  def salarios_por_departamento(self, where: Optional[Dict[str, Any]] = None) -> Dict[Any, Dict[str, Any]]:
+    linhas = self.aggregate('numero_departamento', {'salario': ['sum', 'avg'], '*': ['count']}, where=where)
+    return {
+      linha['numero_departamento']: {
+        'total': linha['salario_sum'] or 0.0,
+        'media': linha['salario_avg'],
+        'quantidade': linha['count'],
+      }
+      for linha in linhas
+    }
\ No newline at end of file
@@ -0,0 +1,242 @@
+'''
+  *** Hierarchy (organograma) ***
+  Índice em memória da árvore definida por funcionario.cpf_supervisor
+  * Montado uma vez lendo só as colunas cpf e cpf_supervisor (FuncionarioDAO.hierarchy())
+  * Lista de adjacência (chefe -> subordinados diretos) e o tamanho de cada subárvore, mantido
+    a cada alteração: headcount em O(1), subordinados/subárvore em O(k), cadeia de chefes em
+    O(profundidade)
+  * add/move/remove atualizam só os chefes acima do funcionário alterado, sem remontar o índice
+  * Um funcionário cujo supervisor não está na tabela é raiz; se os dados tiverem um ciclo
+    (A chefia B, que chefia A), o vínculo de um dos funcionários é ignorado e ele fica em `cycles`
+'''
+
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from empresa.dao.base_dao import DEFAULT_PAGE_SIZE, BaseDAO
+
+SUPERVISOR_FIELD = 'cpf_supervisor'
+
+
+class Hierarchy:
+  '''
+  Organograma indexado por cpf.
+  Uso:
+    org = FuncionarioDAO(client).hierarchy()
+    org.subtree('11111111111')          # todos abaixo do gerente, em profundidade
+    org.headcount('11111111111')        # quantos são (O(1))
+    org.ancestors('22222222222')        # chefe imediato, o chefe dele, ... até a raiz
+    org.apply_headcounts(gerentes)      # recalcula qtd_gerenciaveis de vários gerentes
+  '''
+
+  def __init__(self, links: Iterable[Tuple[Any, Any]] = ()):
+    self._lock = threading.RLock()
+    self._parent: Dict[Any, Any] = {}                 # cpf -> cpf_supervisor (como está na tabela)
+    self._children: Dict[Any, Dict[Any, None]] = {}   # cpf_supervisor -> subordinados (conjunto ordenado)
+    self._size: Dict[Any, int] = {}                   # cpf -> tamanho da subárvore (com ele mesmo)
+    self._cut: Set[Any] = set()                       # vínculos ignorados para quebrar ciclos
+    for cpf, supervisor in links:
+      self._parent[cpf] = supervisor
+      if supervisor is not None:
+        self._children.setdefault(supervisor, {})[cpf] = None
+    self._compute_sizes()
+
+  # Monta o índice lendo só cpf e cpf_supervisor, página por página
+  @classmethod
+  def from_dao(cls, dao: BaseDAO, page_size: int = DEFAULT_PAGE_SIZE) -> 'Hierarchy':
+    key = dao.id_field
+    rows = dao._iter_rows(page_size, columns=f'{key},{SUPERVISOR_FIELD}')
+    return cls((row[key], row.get(SUPERVISOR_FIELD)) for row in rows)
+
+  def __contains__(self, cpf) -> bool:
+    return cpf in self._parent
+
+  def __len__(self) -> int:
+    return len(self._parent)
+
+  # Funcionários cujo vínculo com o supervisor foi ignorado por formar um ciclo
+  @property
+  def cycles(self) -> List[Any]:
+    with self._lock:
+      return list(self._cut)
+
+  ### Consultas
+  # supervisor - chefe imediato (None para raízes)
+  def supervisor(self, cpf) -> Optional[Any]:
+    with self._lock:
+      return self._up(cpf) if cpf in self._parent else None
+
+  # reports - subordinados diretos
+  def reports(self, cpf) -> List[Any]:
+    with self._lock:
+      return list(self._kids(cpf))
+
+  # subtree - todos os subordinados, diretos e indiretos (pré-ordem, sem o próprio cpf)
+  def subtree(self, cpf) -> List[Any]:
+    with self._lock:
+      result = []
+      stack = list(reversed(list(self._kids(cpf))))
+      while stack:
+        node = stack.pop()
+        result.append(node)
+        stack.extend(reversed(list(self._kids(node))))
+      return result
+
+  # ancestors - chefe imediato, o chefe dele, ... até a raiz
+  def ancestors(self, cpf) -> List[Any]:
+    with self._lock:
+      return list(self._ancestors(cpf))
+
+  # headcount - quantos estão abaixo de `cpf` (`direct=True`: só os diretos)
+  def headcount(self, cpf, direct: bool = False) -> int:
+    with self._lock:
+      if direct:
+        return sum(1 for _ in self._kids(cpf))
+      size = self._size.get(cpf)
+      return size - 1 if size is not None else 0
+
+  # is_under - se `cpf` está abaixo de `manager` (em qualquer nível)
+  def is_under(self, cpf, manager) -> bool:
+    with self._lock:
+      return any(a == manager for a in self._ancestors(cpf))
+
+  def roots(self) -> List[Any]:
+    with self._lock:
+      return [cpf for cpf in self._parent if self._up(cpf) is None]
+
+  # headcounts - {cpf: subordinados} de todos os que têm ao menos um subordinado
+  def headcounts(self, direct: bool = False) -> Dict[Any, int]:
+    with self._lock:
+      if direct:
+        counts: Dict[Any, int] = {}
+        for cpf in self._parent:
+          boss = self._up(cpf)
+          if boss is not None:
+            counts[boss] = counts.get(boss, 0) + 1
+        return counts
+      return {cpf: size - 1 for cpf, size in self._size.items() if size > 1}
+
+  # apply_headcounts - atualiza `qtd_gerenciaveis` de objetos com `cpf` (ex.: Gerente) pelo
+  # índice, sem consultar o banco; retorna quantos mudaram
+  def apply_headcounts(self, gerentes: Iterable[Any], direct: bool = False) -> int:
+    changed = 0
+    with self._lock:
+      for gerente in gerentes:
+        count = self.headcount(gerente.cpf, direct)
+        if gerente.qtd_gerenciaveis != count:
+          gerente.qtd_gerenciaveis = count
+          changed += 1
+    return changed
+
+  ### Manutenção incremental
+  # add - funcionário novo (ou troca de supervisor, se já existir)
+  # * subordinados já cadastrados com cpf_supervisor = cpf passam a ficar abaixo dele
+  def add(self, cpf, supervisor=None) -> None:
+    with self._lock:
+      if cpf in self._parent:
+        self.move(cpf, supervisor)
+        return
+      self._parent[cpf] = supervisor
+      self._size[cpf] = 1 + sum(self._size[kid] for kid in self._kids(cpf))
+      if supervisor is not None:
+        self._children.setdefault(supervisor, {})[cpf] = None
+      self._attach(cpf)
+
+  # move - troca o supervisor de `cpf` (a subárvore dele vai junto)
+  def move(self, cpf, supervisor) -> None:
+    with self._lock:
+      if cpf not in self._parent:
+        self.add(cpf, supervisor)
+        return
+      if self._parent[cpf] == supervisor:
+        return
+      self._detach(cpf)
+      self._parent[cpf] = supervisor
+      if supervisor is not None:
+        self._children.setdefault(supervisor, {})[cpf] = None
+      self._attach(cpf)
+      self._retry_cuts()
+
+  # remove - funcionário excluído; os subordinados dele viram raízes
+  def remove(self, cpf) -> None:
+    with self._lock:
+      if cpf not in self._parent:
+        return
+      self._detach(cpf)
+      del self._parent[cpf]
+      del self._size[cpf]
+      # a lista de subordinados de `cpf` fica: se ele for cadastrado de novo, eles voltam
+      self._retry_cuts()
+
+  ### Internos
+  # Supervisor efetivo: None se não estiver na tabela ou se o vínculo foi cortado
+  def _up(self, cpf) -> Optional[Any]:
+    supervisor = self._parent.get(cpf)
+    if supervisor is None or cpf in self._cut or supervisor not in self._parent:
+      return None
+    return supervisor
+
+  def _kids(self, cpf) -> Iterator[Any]:
+    for kid in self._children.get(cpf, ()):
+      if kid not in self._cut:
+        yield kid
+
+  def _ancestors(self, cpf) -> Iterator[Any]:
+    node = self._up(cpf) if cpf in self._parent else None
+    while node is not None:
+      yield node
+      node = self._up(node)
+
+  # Liga `cpf` (com a subárvore) ao supervisor: soma o tamanho nos chefes acima, ou corta o
+  # vínculo se o supervisor estiver dentro da própria subárvore
+  def _attach(self, cpf) -> None:
+    if any(a == cpf for a in self._ancestors(cpf)):
+      self._cut.add(cpf)
+      return
+    size = self._size[cpf]
+    for boss in self._ancestors(cpf):
+      self._size[boss] += size
+
+  def _detach(self, cpf) -> None:
+    size = self._size[cpf]
+    for boss in self._ancestors(cpf):
+      self._size[boss] -= size
+    self._cut.discard(cpf)
+    supervisor = self._parent[cpf]
+    siblings = self._children.get(supervisor)
+    if siblings is not None:
+      siblings.pop(cpf, None)
+      if not siblings:
+        del self._children[supervisor]
+
+  # Depois de uma mudança, vínculos cortados podem não formar mais ciclo
+  def _retry_cuts(self) -> None:
+    for cpf in list(self._cut):
+      self._cut.discard(cpf)
+      self._attach(cpf)
+
+  # Tamanhos das subárvores a partir das raízes (pós-ordem, sem recursão); o que sobrar sem
+  # tamanho está em um ciclo ou abaixo de um: corta o ciclo e continua a partir dele
+  def _compute_sizes(self) -> None:
+    for root in [cpf for cpf in self._parent if self._up(cpf) is None]:
+      self._fill_sizes(root)
+    for cpf in self._parent:
+      if cpf in self._size:
+        continue
+      seen = set()
+      node = cpf
+      while node not in seen:
+        seen.add(node)
+        node = self._up(node)
+      self._cut.add(node)
+      self._fill_sizes(node)
+
+  def _fill_sizes(self, root) -> None:
+    stack: List[Tuple[Any, bool]] = [(root, False)]
+    while stack:
+      node, done = stack.pop()
+      if done:
+        self._size[node] = 1 + sum(self._size[kid] for kid in self._kids(node))
+      else:
+        stack.append((node, True))
+        stack.extend((kid, False) for kid in self._kids(node))
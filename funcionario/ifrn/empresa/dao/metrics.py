@@ -0,0 +1,249 @@
+'''
+  *** Métricas dos DAOs ***
+  Instrumentação por tabela e operação (create, read_all, update, ...)
+  * Metrics - padrão sem efeito (custo de uma chamada de método por operação)
+  * InMemoryMetrics - contagens, erros, histograma de latência (p50/p95/p99), bytes enviados
+    e linhas retornadas, exportados em texto do Prometheus ou em um snapshot JSON
+'''
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Limites superiores (segundos) dos buckets do histograma de latência: 50us a ~105s, fator 2
+DEFAULT_BUCKETS: Tuple[float, ...] = tuple(0.00005 * 2 ** i for i in range(22))
+
+
+class _NoopOperation:
+  '''Operação sem registro: o mesmo objeto é reutilizado em todas as chamadas'''
+
+  __slots__ = ()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+  def payload(self, data: Any) -> None:
+    pass
+
+  def rows(self, count: int) -> None:
+    pass
+
+
+_NOOP = _NoopOperation()
+
+
+class Metrics:
+  '''
+  Interface de instrumentação usada pelo BaseDAO (e padrão sem efeito).
+  Cada operação é envolvida por um context manager:
+    with metrics.operation('funcionario', 'create') as op:
+      op.payload(payload)   # dados enviados (tamanho em bytes)
+      op.rows(len(data))    # linhas retornadas
+  Uma exceção que atravesse o `with` é contada como erro da operação.
+  '''
+
+  def operation(self, table: str, operation: str):
+    return _NOOP
+
+
+class _Histogram:
+  '''Histograma de buckets fixos, com estimativa de quantis por interpolação no bucket'''
+
+  __slots__ = ['bounds', 'counts', 'count', 'sum', 'max']
+
+  def __init__(self, bounds: Sequence[float]):
+    self.bounds = bounds
+    self.counts = [0] * (len(bounds) + 1)  # o último é o bucket +Inf
+    self.count = 0
+    self.sum = 0.0
+    self.max = 0.0
+
+  def observe(self, value: float) -> None:
+    self.counts[bisect_left(self.bounds, value)] += 1
+    self.count += 1
+    self.sum += value
+    if value > self.max:
+      self.max = value
+
+  def quantile(self, q: float) -> float:
+    if not self.count:
+      return 0.0
+    rank = q * self.count
+    seen = 0
+    for i, n in enumerate(self.counts):
+      if n and seen + n >= rank:
+        lower = self.bounds[i - 1] if i else 0.0
+        upper = self.bounds[i] if i < len(self.bounds) else self.max
+        return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+      seen += n
+    return self.max
+
+
+class _OperationStats:
+  __slots__ = ['calls', 'errors', 'error_types', 'latency', 'payload_bytes', 'rows']
+
+  def __init__(self, buckets: Sequence[float]):
+    self.calls = 0
+    self.errors = 0
+    self.error_types: Dict[str, int] = {}
+    self.latency = _Histogram(buckets)
+    self.payload_bytes = 0
+    self.rows = 0
+
+
+class _TimedOperation:
+  __slots__ = ['_metrics', '_key', '_start', '_payloads', '_rows']
+
+  def __init__(self, metrics: 'InMemoryMetrics', key: Tuple[str, str]):
+    self._metrics = metrics
+    self._key = key
+    self._payloads: List[Any] = []
+    self._rows = 0
+
+  def __enter__(self):
+    self._start = self._metrics._clock()
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    elapsed = self._metrics._clock() - self._start
+    # o tamanho é medido fora do tempo da operação: serializar o lote de novo não entra na latência
+    payload_bytes = sum(_payload_size(data) for data in self._payloads)
+    self._metrics._record(self._key, elapsed, payload_bytes, self._rows, exc_type)
+    return False
+
+  # guarda só a referência; o tamanho é calculado no __exit__, depois de medir o tempo
+  def payload(self, data: Any) -> None:
+    self._payloads.append(data)
+
+  def rows(self, count: int) -> None:
+    self._rows += count
+
+
+# Tamanho aproximado do corpo enviado ao PostgREST (JSON compacto)
+def _payload_size(data: Any) -> int:
+  try:
+    return len(json.dumps(data, separators=(',', ':'), default=str).encode('utf-8'))
+  except (TypeError, ValueError):
+    return 0
+
+
+class InMemoryMetrics(Metrics):
+  '''
+  Métricas em memória, seguras entre threads, agregadas por (tabela, operação)
+  * `buckets` - limites (segundos) do histograma de latência
+  * `clock` - função de tempo (padrão time.perf_counter), substituível em testes
+  '''
+
+  def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, clock=time.perf_counter):
+    self._buckets = tuple(sorted(buckets))
+    self._clock = clock
+    self._lock = threading.Lock()
+    self._stats: Dict[Tuple[str, str], _OperationStats] = {}
+
+  def operation(self, table: str, operation: str) -> _TimedOperation:
+    return _TimedOperation(self, (table, operation))
+
+  def _record(self, key: Tuple[str, str], elapsed: float, payload_bytes: int, rows: int, exc_type) -> None:
+    with self._lock:
+      stats = self._stats.get(key)
+      if stats is None:
+        stats = self._stats[key] = _OperationStats(self._buckets)
+      stats.calls += 1
+      stats.latency.observe(elapsed)
+      stats.payload_bytes += payload_bytes
+      stats.rows += rows
+      if exc_type is not None:
+        stats.errors += 1
+        stats.error_types[exc_type.__name__] = stats.error_types.get(exc_type.__name__, 0) + 1
+
+  def reset(self) -> None:
+    with self._lock:
+      self._stats.clear()
+
+  ### Exportação
+  # snapshot - dict serializável: {'tabela.operação': {calls, errors, p50/p95/p99 em segundos, ...}}
+  def snapshot(self) -> Dict[str, Dict[str, Any]]:
+    with self._lock:
+      result = {}
+      for (table, operation), stats in sorted(self._stats.items()):
+        latency = stats.latency
+        result[f'{table}.{operation}'] = {
+          'table': table,
+          'operation': operation,
+          'calls': stats.calls,
+          'errors': stats.errors,
+          'error_types': dict(stats.error_types),
+          'latency_seconds': {
+            'sum': latency.sum,
+            'avg': latency.sum / latency.count if latency.count else 0.0,
+            'max': latency.max,
+            'p50': latency.quantile(0.50),
+            'p95': latency.quantile(0.95),
+            'p99': latency.quantile(0.99),
+          },
+          'payload_bytes': stats.payload_bytes,
+          'rows': stats.rows,
+        }
+      return result
+
+  def to_json(self, indent: Optional[int] = 2) -> str:
+    return json.dumps(self.snapshot(), indent=indent)
+
+  # to_prometheus - formato texto de exposição do Prometheus (para um endpoint /metrics)
+  def to_prometheus(self, prefix: str = 'dao') -> str:
+    lines = []
+
+    def header(name, kind, help_text):
+      lines.append(f'# HELP {prefix}_{name} {help_text}')
+      lines.append(f'# TYPE {prefix}_{name} {kind}')
+
+    with self._lock:
+      items = sorted(self._stats.items())
+      header('operation_seconds', 'histogram', 'Latência das operações do DAO')
+      for (table, operation), stats in items:
+        labels = _labels(table=table, operation=operation)
+        cumulative = 0
+        for bound, n in zip(self._buckets + (math.inf,), stats.latency.counts):
+          cumulative += n
+          le = '+Inf' if bound == math.inf else repr(bound)
+          lines.append(f'{prefix}_operation_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{prefix}_operation_seconds_sum{{{labels}}} {stats.latency.sum!r}')
+        lines.append(f'{prefix}_operation_seconds_count{{{labels}}} {stats.latency.count}')
+      for name, help_text, value in (
+        ('operations_total', 'Operações executadas', lambda s: s.calls),
+        ('operation_errors_total', 'Operações que terminaram em exceção', lambda s: s.errors),
+        ('payload_bytes_total', 'Bytes enviados (JSON) nas operações de escrita', lambda s: s.payload_bytes),
+        ('rows_total', 'Linhas retornadas pelas operações', lambda s: s.rows),
+      ):
+        header(name, 'counter', help_text)
+        for (table, operation), stats in items:
+          lines.append(f'{prefix}_{name}{{{_labels(table=table, operation=operation)}}} {value(stats)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _labels(**labels: str) -> str:
+  return ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _escape(value: Any) -> str:
+  return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+### Métricas padrão
+# Usadas pelos DAOs criados sem `metrics`; trocar o padrão vale também para os DAOs já criados
+_default: Metrics = Metrics()
+
+
+def get_default_metrics() -> Metrics:
+  return _default
+
+
+def set_default_metrics(metrics: Optional[Metrics]) -> None:
+  global _default
+  _default = metrics if metrics is not None else Metrics()
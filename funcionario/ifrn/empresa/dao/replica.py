@@ -0,0 +1,178 @@
+'''
+  *** Replica ***
+  Cópia local de uma tabela, atualizada de forma incremental por updated_at
+  * sync() - busca só as linhas alteradas depois da marca d'água (BaseDAO.read_since) e as
+    aplica na cópia; linhas com `deleted_at` preenchido viram lápides (tombstones)
+  * reconcile() - detecta remoções físicas lendo só a chave primária da tabela
+  * get/find/all - leituras locais, sem ir ao banco (find usa os índices informados)
+'''
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Set, TypeVar
+
+from empresa.dao.base_dao import DEFAULT_PAGE_SIZE, UPDATED_AT, BaseDAO
+from empresa.models._conversao import format_datetime, parse_datetime
+
+T = TypeVar('T')
+
+# Coluna de exclusão lógica: uma linha com deleted_at preenchido é tratada como removida
+DELETED_AT = 'deleted_at'
+
+
+class Replica(Generic[T]):
+  '''
+  Réplica em memória de um BaseDAO.
+  * `indexes` - campos com índice local para find() (ex.: ['numero_departamento'])
+  * `overlap` - segundos subtraídos da marca d'água em cada sync, para não perder linhas
+    gravadas com updated_at um pouco anterior ao último visto (relógios/transações em
+    andamento); o próprio instante da marca d'água é sempre relido. As linhas repetidas
+    são ignoradas
+  Uso:
+    replica = Replica(FuncionarioDAO(client), indexes=['numero_departamento'])
+    replica.sync()                    # primeira carga: tabela inteira
+    ...
+    replica.sync()                    # depois: só o que mudou
+    replica.find(numero_departamento=3)
+  '''
+
+  def __init__(self, dao: BaseDAO[T], indexes: Sequence[str] = (), overlap: float = 0.0,
+               page_size: int = DEFAULT_PAGE_SIZE):
+    self._dao = dao
+    self._overlap = overlap
+    self._page_size = page_size
+    self._lock = threading.RLock()
+    self._rows: Dict[Any, T] = {}                                   # chave -> modelo
+    self._versions: Dict[Any, Any] = {}                             # chave -> updated_at aplicado
+    self._indexes: Dict[str, Dict[Any, Set[Any]]] = {f: {} for f in indexes}
+    self._tombstones: Dict[Any, Any] = {}                           # chave -> instante da remoção
+    self._watermark: Optional[str] = None
+
+  @property
+  def dao(self) -> BaseDAO[T]:
+    return self._dao
+
+  # Maior updated_at já aplicado (texto ISO, como vem do banco); None antes do primeiro sync
+  @property
+  def watermark(self) -> Optional[str]:
+    return self._watermark
+
+  @property
+  def tombstones(self) -> Dict[Any, Any]:
+    with self._lock:
+      return dict(self._tombstones)
+
+  ### Sincronização
+  # sync - aplica as alterações desde a marca d'água; retorna {'upserts': n, 'deletes': n}
+  def sync(self) -> Dict[str, int]:
+    since = self._since()
+    stats = {'upserts': 0, 'deletes': 0}
+    # >= na marca d'água: linhas gravadas no mesmo instante depois do último sync também vêm
+    for rows in self._dao._iter_since(since, self._page_size, inclusive=True):
+      with self._lock:
+        self._apply(rows, stats)
+    return stats
+
+  def _since(self) -> Optional[str]:
+    if self._watermark is None or not self._overlap:
+      return self._watermark
+    instant = parse_datetime(self._watermark)
+    if not isinstance(instant, datetime):
+      return self._watermark
+    return format_datetime(instant - timedelta(seconds=self._overlap))
+
+  def _apply(self, rows: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+    models = self._dao.to_models(rows)
+    for row, model in zip(rows, models):
+      key = self._dao.id_of(model)
+      version = row.get(UPDATED_AT)
+      if version is not None and (self._watermark is None or version > self._watermark):
+        self._watermark = version
+      previous = self._versions.get(key)
+      if previous is not None and version is not None and version <= previous:
+        continue  # linha repetida pela sobreposição: esta versão (ou uma mais nova) já foi aplicada
+      if row.get(DELETED_AT) is not None:
+        if self._remove(key):
+          stats['deletes'] += 1
+        self._tombstones[key] = row.get(DELETED_AT)
+        self._versions[key] = version
+        continue
+      self._remove(key)
+      self._tombstones.pop(key, None)
+      self._rows[key] = model
+      self._versions[key] = version
+      for field, index in self._indexes.items():
+        index.setdefault(getattr(model, field, None), set()).add(key)
+      stats['upserts'] += 1
+
+  def _remove(self, key) -> bool:
+    model = self._rows.pop(key, None)
+    if model is None:
+      return False
+    for field, index in self._indexes.items():
+      value = getattr(model, field, None)
+      bucket = index.get(value)
+      if bucket is not None:
+        bucket.discard(key)
+        if not bucket:
+          del index[value]
+    return True
+
+  # reconcile - remove da cópia as chaves que não existem mais na tabela (exclusão física,
+  # invisível para read_since); lê só a coluna da chave primária. Retorna quantas removeu.
+  def reconcile(self) -> int:
+    key_field = self._dao.id_field
+    remote = set()
+    for row in self._dao._iter_rows(self._page_size, columns=key_field):
+      remote.add(row[key_field])
+    removed = 0
+    now = format_datetime(datetime.now().astimezone())
+    with self._lock:
+      for key in [k for k in self._rows if k not in remote]:
+        self._remove(key)
+        self._versions.pop(key, None)
+        self._tombstones[key] = now
+        removed += 1
+    return removed
+
+  # purge_tombstones - descarta lápides anteriores a `before` (todas, se None)
+  def purge_tombstones(self, before=None) -> int:
+    before = format_datetime(before)
+    with self._lock:
+      keys = [k for k, at in self._tombstones.items() if before is None or (at is not None and at < before)]
+      for key in keys:
+        del self._tombstones[key]
+        if key not in self._rows:
+          self._versions.pop(key, None)
+      return len(keys)
+
+  ### Leituras locais
+  def get(self, key) -> Optional[T]:
+    with self._lock:
+      return self._rows.get(key)
+
+  def __contains__(self, key) -> bool:
+    return key in self._rows
+
+  def __len__(self) -> int:
+    return len(self._rows)
+
+  def all(self) -> List[T]:
+    with self._lock:
+      return list(self._rows.values())
+
+  # find - igualdade em um ou mais campos; usa o índice mais seletivo entre os informados
+  def find(self, **where: Any) -> List[T]:
+    with self._lock:
+      candidates: Optional[Iterable[Any]] = None
+      for field, value in where.items():
+        index = self._indexes.get(field)
+        if index is not None:
+          keys = index.get(value, ())
+          if candidates is None or len(keys) < len(candidates):
+            candidates = keys
+      if candidates is None:
+        models = self._rows.values()
+      else:
+        models = (self._rows[k] for k in candidates)
+      return [m for m in models if all(getattr(m, f, None) == v for f, v in where.items())]
@@ -0,0 +1,273 @@
+'''
+  *** Session (unidade de trabalho) ***
+  Acumula as alterações feitas nos modelos e as envia em lote no commit
+  * Modelos carregados pela sessão ficam com uma cópia (snapshot) do to_dict; no commit só os
+    campos alterados são enviados, não importa quantas vezes o modelo mudou
+  * Registros com as mesmas alterações (mesmos campos e valores) vão em um único
+    `update ... in (ids)`; inserts usam create_many e remoções delete_many
+  * Inserts seguem a ordem dos DAOs (departamento antes de funcionario) e remoções a ordem inversa
+  * Um campo pode receber outro modelo da sessão (ex.: funcionario.numero_departamento = dep);
+    no commit ele é trocado pela chave do modelo, já gravada
+'''
+
+import json
+from dataclasses import fields, is_dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, get_args
+
+from empresa.dao.base_dao import DEFAULT_BATCH_SIZE, BaseDAO
+
+if TYPE_CHECKING:
+  from supabase import Client
+
+T = TypeVar('T')
+
+
+class _Tracked:
+  __slots__ = ['model', 'dao', 'snapshot', 'key']
+
+  def __init__(self, model, dao: BaseDAO, snapshot: Dict[str, Any]):
+    self.model = model
+    self.dao = dao
+    self.snapshot = snapshot
+    # chave com que o registro está gravado (mesmo que o modelo troque a chave primária)
+    self.key = snapshot.get(dao.id_field)
+
+
+# Tipo do modelo de um DAO concreto (ex.: FuncionarioDAO(BaseDAO[Funcionario]) -> Funcionario)
+def _model_type(dao: BaseDAO) -> type:
+  for cls in type(dao).__mro__:
+    for base in getattr(cls, '__orig_bases__', ()):
+      args = get_args(base)
+      if args and isinstance(args[0], type):
+        return args[0]
+  raise TypeError(f'Não foi possível descobrir o modelo de {type(dao).__name__}; use Session({{Modelo: dao}})')
+
+
+class Session:
+  '''
+  Unidade de trabalho sobre um conjunto de DAOs.
+  * `daos` - lista de DAOs em ordem de dependência (os tipos de modelo vêm dos genéricos, ex.:
+    BaseDAO[Funcionario]) ou um dict {Modelo: dao} na mesma ordem
+  Uso:
+    with Session.for_client(client) as session:
+      f = session.get(Funcionario, '12345678900')
+      f.pnome = 'Ana'
+      f.salario = 5000.0       # as duas mudanças viram um único update com 2 campos
+    # commit ao sair do bloco (rollback se houver exceção)
+  Se um lote falhar, a BulkWriteError do DAO é propagada; as etapas já concluídas ficam
+  gravadas e as seguintes continuam pendentes na sessão.
+  '''
+
+  def __init__(self, daos):
+    if isinstance(daos, dict):
+      pairs = list(daos.items())
+    else:
+      pairs = [(_model_type(dao), dao) for dao in daos]
+    self._daos: List[BaseDAO] = [dao for _, dao in pairs]
+    self._dao_by_type: Dict[type, BaseDAO] = dict(pairs)
+    self._tracked: Dict[int, _Tracked] = {}               # id(modelo) -> estado
+    self._identity: Dict[Tuple[str, Any], Any] = {}       # (tabela, chave) -> modelo
+    self._new: Dict[int, Any] = {}                        # id(modelo) -> modelo a inserir
+    self._deleted: Dict[int, _Tracked] = {}               # id(modelo) -> estado a remover
+    self._columns: Dict[type, Tuple[str, ...]] = {}       # tipo -> campos persistidos
+
+  # Sessão com os DAOs da aplicação (departamento antes de funcionario)
+  @classmethod
+  def for_client(cls, client: 'Client') -> 'Session':
+    from empresa.dao.departamento_dao import DepartamentoDAO
+    from empresa.dao.funcionario_dao import FuncionarioDAO
+    return cls([DepartamentoDAO(client), FuncionarioDAO(client)])
+
+  def dao_for(self, model_or_type) -> BaseDAO:
+    model_type = model_or_type if isinstance(model_or_type, type) else type(model_or_type)
+    dao = self._dao_by_type.get(model_type)
+    if dao is None:
+      raise TypeError(f'Nenhum DAO na sessão para {model_type.__name__}')
+    return dao
+
+  def __enter__(self) -> 'Session':
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    if exc_type is None:
+      self.commit()
+    else:
+      self.rollback()
+    return False
+
+  ### Carregar
+  # get - modelo pela chave primária; a mesma chave devolve sempre o mesmo objeto
+  def get(self, model_type: Type[T], id_value) -> Optional[T]:
+    dao = self.dao_for(model_type)
+    model = self._identity.get((dao.table_name, id_value))
+    if model is None:
+      model = dao.read(id_value)
+      if model is not None:
+        model = self.track(model)
+    return model
+
+  # find - repassa ao DAO.find e acompanha os modelos retornados
+  def find(self, model_type: Type[T], **kwargs) -> List[T]:
+    return self.track_all(self.dao_for(model_type).find(**kwargs))
+
+  # track - passa a acompanhar um modelo já gravado (ex.: vindo de read_all)
+  # Se a sessão já tem um objeto com a mesma chave, devolve esse objeto
+  def track(self, model: T) -> T:
+    if id(model) in self._tracked:
+      return model
+    dao = self.dao_for(model)
+    key = (dao.table_name, dao.id_of(model))
+    existing = self._identity.get(key)
+    if existing is not None:
+      return existing
+    self._tracked[id(model)] = _Tracked(model, dao, dao.to_dict(model))
+    self._identity[key] = model
+    return model
+
+  def track_all(self, models: Iterable[T]) -> List[T]:
+    return [self.track(model) for model in models]
+
+  ### Alterar
+  # add - novo registro, inserido no commit
+  def add(self, model: T) -> T:
+    self.dao_for(model)
+    if id(model) not in self._tracked:
+      self._new[id(model)] = model
+    return model
+
+  def add_all(self, models: Iterable[T]) -> List[T]:
+    return [self.add(model) for model in models]
+
+  # delete - remove no commit (um modelo ainda não inserido só sai da sessão)
+  def delete(self, model) -> None:
+    if self._new.pop(id(model), None) is not None:
+      return
+    state = self._tracked.get(id(model))
+    if state is None:
+      state = self._tracked.get(id(self.track(model)))
+    self._deleted[id(state.model)] = state
+
+  # changes - campos alterados de um modelo acompanhado ({coluna: novo valor})
+  def changes(self, model) -> Dict[str, Any]:
+    state = self._tracked.get(id(model))
+    if state is None:
+      return {}
+    self._resolve_references(model)
+    current = state.dao.to_dict(model)
+    snapshot = state.snapshot
+    return {k: v for k, v in current.items() if k not in snapshot or snapshot[k] != v}
+
+  @property
+  def dirty(self) -> List[Any]:
+    return [s.model for k, s in self._tracked.items() if k not in self._deleted and self.changes(s.model)]
+
+  @property
+  def new(self) -> List[Any]:
+    return list(self._new.values())
+
+  @property
+  def deleted(self) -> List[Any]:
+    return [s.model for s in self._deleted.values()]
+
+  ### Commit / rollback
+  # commit - envia inserts, updates e remoções; retorna a quantidade de requisições por tipo
+  def commit(self) -> Dict[str, int]:
+    requests = {'insert': 0, 'update': 0, 'delete': 0}
+    for dao in self._daos:
+      requests['insert'] += self._flush_inserts(dao)
+    for dao in self._daos:
+      requests['update'] += self._flush_updates(dao)
+    for dao in reversed(self._daos):
+      requests['delete'] += self._flush_deletes(dao)
+    return requests
+
+  flush = commit
+
+  # rollback - desfaz as alterações dos modelos acompanhados e descarta inserts/remoções pendentes
+  def rollback(self) -> None:
+    for state in self._tracked.values():
+      self._copy_columns(state.model, state.dao.to_model(state.snapshot))
+    self._new.clear()
+    self._deleted.clear()
+
+  # Campos do modelo que são colunas (estão no to_dict); relações carregadas ficam de fora
+  def _columns_of(self, model) -> Tuple[str, ...]:
+    columns = self._columns.get(type(model))
+    if columns is None:
+      names = self.dao_for(model).to_dict(model).keys()
+      columns = self._columns[type(model)] = tuple(f.name for f in fields(model) if f.name in names)
+    return columns
+
+  def _copy_columns(self, target, source) -> None:
+    if is_dataclass(target):
+      for name in self._columns_of(target):
+        setattr(target, name, getattr(source, name))
+
+  # Troca referências a modelos da sessão, nas colunas, pela chave primária deles
+  def _resolve_references(self, model) -> None:
+    if not is_dataclass(model):
+      return
+    for name in self._columns_of(model):
+      value = getattr(model, name)
+      if is_dataclass(value) and type(value) in self._dao_by_type:
+        setattr(model, name, self._dao_by_type[type(value)].id_of(value))
+
+  def _flush_inserts(self, dao: BaseDAO) -> int:
+    pending = [m for m in self._new.values() if self._dao_by_type.get(type(m)) is dao]
+    if not pending:
+      return 0
+    for model in pending:
+      self._resolve_references(model)
+    created = dao.create_many(pending)
+    # valores gerados pelo banco (ex.: numero do departamento) voltam para os objetos originais
+    for model, row in zip(pending, created):
+      self._copy_columns(model, row)
+      del self._new[id(model)]
+      self.track(model)
+    return _batches(len(pending))
+
+  def _flush_updates(self, dao: BaseDAO) -> int:
+    groups: Dict[str, Tuple[Dict[str, Any], List[_Tracked]]] = {}
+    for key, state in self._tracked.items():
+      if state.dao is not dao or key in self._deleted:
+        continue
+      changed = self.changes(state.model)
+      if changed:
+        signature = json.dumps(changed, sort_keys=True, default=str)
+        groups.setdefault(signature, (changed, []))[1].append(state)
+    requests = 0
+    for changed, states in groups.values():
+      updated = dao.update_fields([s.key for s in states], changed)
+      requests += _batches(len(states))
+      by_key = {dao.id_of(m): m for m in updated}
+      for state in states:
+        row = by_key.get(dao.id_of(state.model))
+        if row is not None:
+          # campos atualizados pelo banco (ex.: updated_at) também voltam para o modelo
+          self._copy_columns(state.model, row)
+        self._rekey(state)
+    return requests
+
+  def _flush_deletes(self, dao: BaseDAO) -> int:
+    states = [s for s in self._deleted.values() if s.dao is dao]
+    if not states:
+      return 0
+    dao.delete_many([s.key for s in states])
+    for state in states:
+      del self._deleted[id(state.model)]
+      del self._tracked[id(state.model)]
+      self._identity.pop((dao.table_name, state.key), None)
+    return _batches(len(states))
+
+  # Atualiza o snapshot (e a chave, se a chave primária mudou) depois de gravar
+  def _rekey(self, state: _Tracked) -> None:
+    dao = state.dao
+    self._identity.pop((dao.table_name, state.key), None)
+    state.snapshot = dao.to_dict(state.model)
+    state.key = state.snapshot.get(dao.id_field)
+    self._identity[(dao.table_name, state.key)] = state.model
+
+
+# Requisições feitas por uma operação em massa com `n` registros
+def _batches(n: int) -> int:
+  return -(-n // DEFAULT_BATCH_SIZE)
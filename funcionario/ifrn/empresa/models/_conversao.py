@@ -0,0 +1,18 @@
+# Conversões de campos compartilhadas pelos modelos (to_dict/from_dict)
+from datetime import datetime
+from typing import Any
+
+
+# Converte texto ISO em datetime; outros valores (None, datetime, texto inválido) passam direto
+def parse_datetime(value: Any) -> Any:
+    if value.__class__ is str:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+# Converte datetime em texto ISO para envio ao supabase
+def format_datetime(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
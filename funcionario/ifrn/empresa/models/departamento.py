@@ -1,8 +1,11 @@
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime
 
-@dataclass
+from ._conversao import format_datetime, parse_datetime
+
+
+@dataclass(slots=True)
 class Departamento:
     numero: Optional[int]
     nome: str
@@ -11,41 +14,70 @@ class Departamento:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+    # Campos escritos um a um (sem dataclasses.asdict, que copia recursivamente)
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        # Converter datetimes para ISO strings para envio ao supabase, se necessário
-        if data.get('created_at') and isinstance(data['created_at'], datetime):
-            data['created_at'] = data['created_at'].isoformat()
-        if data.get('updated_at') and isinstance(data['updated_at'], datetime):
-            data['updated_at'] = data['updated_at'].isoformat()
-        return data
+        return {
+            'numero': self.numero,
+            'nome': self.nome,
+            'localizacao': self.localizacao,
+            'gerente_cpf': self.gerente_cpf,
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Departamento':
         if data is None:
             return None
-        created = data.get('created_at')
-        updated = data.get('updated_at')
-        # Tentar parsear strings ISO para datetime quando aplicável
-        try:
-            if isinstance(created, str):
-                created = datetime.fromisoformat(created)
-        except Exception:
-            created = created
-        try:
-            if isinstance(updated, str):
-                updated = datetime.fromisoformat(updated)
-        except Exception:
-            updated = updated
-
+        get = data.get
         return cls(
-            numero=data.get('numero') or data.get('id') or None,
-            nome=data.get('nome') or data.get('descricao') or '',
-            localizacao=data.get('localizacao'),
-            gerente_cpf=data.get('gerente_cpf') or data.get('cpf_gerente') or None,
-            created_at=created,
-            updated_at=updated,
+            get('numero') or get('id') or None,
+            get('nome') or get('descricao') or '',
+            get('localizacao'),
+            get('gerente_cpf') or get('cpf_gerente') or None,
+            parse_datetime(get('created_at')),
+            parse_datetime(get('updated_at')),
         )
 
+    # Conversão em lote: os nomes alternativos das colunas (id/numero, descricao/nome,
+    # cpf_gerente/gerente_cpf) são resolvidos uma vez pela primeira linha, já que todas
+    # as linhas de uma mesma consulta têm as mesmas colunas
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> List['Departamento']:
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return []
+        first = rows[0]
+        numero_key = 'numero' if 'numero' in first else 'id'
+        nome_key = 'nome' if 'nome' in first else 'descricao'
+        gerente_key = 'gerente_cpf' if 'gerente_cpf' in first else 'cpf_gerente'
+        parse = parse_datetime
+        return [
+            cls(
+                row.get(numero_key) or None,
+                row.get(nome_key) or '',
+                row.get('localizacao'),
+                row.get(gerente_key) or None,
+                parse(row.get('created_at')),
+                parse(row.get('updated_at')),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def to_dicts(models: Iterable['Departamento']) -> List[Dict[str, Any]]:
+        fmt = format_datetime
+        return [
+            {
+                'numero': m.numero,
+                'nome': m.nome,
+                'localizacao': m.localizacao,
+                'gerente_cpf': m.gerente_cpf,
+                'created_at': fmt(m.created_at),
+                'updated_at': fmt(m.updated_at),
+            }
+            for m in models
+        ]
+
     def __str__(self) -> str:
         return f"Departamento(numero={self.numero}, nome={self.nome})"
@@ -1,9 +1,12 @@
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Iterable, List
 from datetime import datetime, date
 
+from ._conversao import format_datetime, parse_datetime
+from .departamento import Departamento
 
-@dataclass
+
+@dataclass(slots=True)
 class Funcionario:
     cpf: str
     pnome: str
@@ -16,45 +19,95 @@ class Funcionario:
     numero_departamento: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # Relações - não são colunas (ficam fora do to_dict); preenchidas por
+    # FuncionarioDAO.read_all/find/iter_all(include=['departamento', 'supervisor'])
+    departamento: Optional[Departamento] = field(default=None, repr=False, compare=False)
+    supervisor: Optional['Funcionario'] = field(default=None, repr=False, compare=False)
 
+    # Campos escritos um a um (sem dataclasses.asdict, que copia recursivamente)
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        if data.get('created_at') and isinstance(data['created_at'], datetime):
-            data['created_at'] = data['created_at'].isoformat()
-        if data.get('updated_at') and isinstance(data['updated_at'], datetime):
-            data['updated_at'] = data['updated_at'].isoformat()
-        return data
+        return {
+            'cpf': self.cpf,
+            'pnome': self.pnome,
+            'unome': self.unome,
+            'data_nasc': self.data_nasc,
+            'endereco': self.endereco,
+            'salario': self.salario,
+            'sexo': self.sexo,
+            'cpf_supervisor': self.cpf_supervisor,
+            'numero_departamento': self.numero_departamento,
+            'created_at': format_datetime(self.created_at),
+            'updated_at': format_datetime(self.updated_at),
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Funcionario':
         if data is None:
             return None
-        created = data.get('created_at')
-        updated = data.get('updated_at')
-        try:
-            if isinstance(created, str):
-                created = datetime.fromisoformat(created)
-        except Exception:
-            created = created
-        try:
-            if isinstance(updated, str):
-                updated = datetime.fromisoformat(updated)
-        except Exception:
-            updated = updated
-
+        get = data.get
         return cls(
-            cpf=data.get('cpf') or data.get('id'),
-            pnome=data.get('pnome') or data.get('primeiro_nome') or '',
-            unome=data.get('unome') or data.get('ultimo_nome') or '',
-            data_nasc=data.get('data_nasc'),
-            endereco=data.get('endereco'),
-            salario=data.get('salario'),
-            sexo=data.get('sexo'),
-            cpf_supervisor=data.get('cpf_supervisor'),
-            numero_departamento=data.get('numero_departamento'),
-            created_at=created,
-            updated_at=updated,
+            get('cpf') or get('id'),
+            get('pnome') or get('primeiro_nome') or '',
+            get('unome') or get('ultimo_nome') or '',
+            get('data_nasc'),
+            get('endereco'),
+            get('salario'),
+            get('sexo'),
+            get('cpf_supervisor'),
+            get('numero_departamento'),
+            parse_datetime(get('created_at')),
+            parse_datetime(get('updated_at')),
         )
 
+    # Conversão em lote: os nomes alternativos das colunas (id/cpf, primeiro_nome/pnome,
+    # ultimo_nome/unome) são resolvidos uma vez pela primeira linha, já que todas as
+    # linhas de uma mesma consulta têm as mesmas colunas
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> List['Funcionario']:
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return []
+        first = rows[0]
+        cpf_key = 'cpf' if 'cpf' in first else 'id'
+        pnome_key = 'pnome' if 'pnome' in first else 'primeiro_nome'
+        unome_key = 'unome' if 'unome' in first else 'ultimo_nome'
+        parse = parse_datetime
+        return [
+            cls(
+                row.get(cpf_key),
+                row.get(pnome_key) or '',
+                row.get(unome_key) or '',
+                row.get('data_nasc'),
+                row.get('endereco'),
+                row.get('salario'),
+                row.get('sexo'),
+                row.get('cpf_supervisor'),
+                row.get('numero_departamento'),
+                parse(row.get('created_at')),
+                parse(row.get('updated_at')),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def to_dicts(models: Iterable['Funcionario']) -> List[Dict[str, Any]]:
+        fmt = format_datetime
+        return [
+            {
+                'cpf': m.cpf,
+                'pnome': m.pnome,
+                'unome': m.unome,
+                'data_nasc': m.data_nasc,
+                'endereco': m.endereco,
+                'salario': m.salario,
+                'sexo': m.sexo,
+                'cpf_supervisor': m.cpf_supervisor,
+                'numero_departamento': m.numero_departamento,
+                'created_at': fmt(m.created_at),
+                'updated_at': fmt(m.updated_at),
+            }
+            for m in models
+        ]
+
     def __str__(self) -> str:
         return f"Funcionario(cpf={self.cpf}, nome={self.pnome} {self.unome})"
@@ -1,13 +1,126 @@
 import datetime
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# Códigos das operações registradas
+DEPOSITO = 1
+SAQUE = 2
+SAQUE_NEGADO = 3
+EXTRATO = 4
+TRANSFERENCIA = 5
+LIQUIDACAO = 6
+
+# Texto de cada operação, montado só quando o histórico é lido
+_FORMATOS = {
+  DEPOSITO: lambda t: f"✅ Depósito de R$ {t.valor:.2f}",
+  SAQUE: lambda t: f"⛔ Saque de R$ {t.valor:.2f}",
+  SAQUE_NEGADO: lambda t: f"❌ Saldo insuficiente. Saque: R$ {t.valor:.2f} - Saldo R$ {t.saldo:.2f}",
+  EXTRATO: lambda t: f"❗ Extrato. Saldo R$ {t.saldo:.2f}",
+  TRANSFERENCIA: lambda t: f"❗ Transferência para {t.contraparte}",
+  LIQUIDACAO: lambda t: f"🔄 Liquidação {t.contraparte}: R$ {t.valor:+.2f} - Saldo R$ {t.saldo:.2f}",
+}
+
+Transacao = namedtuple('Transacao', ['op', 'valor', 'saldo', 'data', 'contraparte'])
 
 class Historico:
+  '''
+  Histórico compacto: cada transação ocupa uma posição em arrays paralelos
+  (código da operação, valor, saldo no momento, instante e contraparte), sem
+  montar texto. As mensagens só são formatadas em imprime(), transacoes ou na iteração.
+  '''
+
   def __init__(self):
     self.data_abertura = datetime.datetime.today()
-    self.transacoes = []
+    self._ops = array('B')
+    self._valores = array('d')
+    self._saldos = array('d')
+    self._instantes = array('d')
+    self._contrapartes = array('i')
+    # nomes das contrapartes, guardados uma vez cada: id -> nome
+    self._nomes = []
+    self._ids_nomes = {}
+
+  # registra - acrescenta uma transação (instante atual)
+  def registra(self, op, valor=0.0, saldo=0.0, contraparte=None):
+    self._ops.append(op)
+    self._valores.append(valor)
+    self._saldos.append(saldo)
+    # mantém os instantes crescentes mesmo se o relógio do sistema voltar
+    agora = time.time()
+    if self._instantes and agora < self._instantes[-1]:
+      agora = self._instantes[-1]
+    self._instantes.append(agora)
+    self._contrapartes.append(self._id_contraparte(contraparte))
+
+  def _id_contraparte(self, nome):
+    if nome is None:
+      return -1
+    id_nome = self._ids_nomes.get(nome)
+    if id_nome is None:
+      id_nome = self._ids_nomes[nome] = len(self._nomes)
+      self._nomes.append(nome)
+    return id_nome
+
+  def __len__(self):
+    return len(self._ops)
+
+  def _transacao(self, i):
+    id_nome = self._contrapartes[i]
+    return Transacao(
+      self._ops[i],
+      self._valores[i],
+      self._saldos[i],
+      datetime.datetime.fromtimestamp(self._instantes[i]),
+      self._nomes[id_nome] if id_nome >= 0 else None,
+    )
+
+  @staticmethod
+  def formata(transacao):
+    return _FORMATOS[transacao.op](transacao)
+
+  # Iterar devolve as mensagens formatadas, como a antiga lista de strings
+  def __iter__(self):
+    for i in range(len(self._ops)):
+      yield self.formata(self._transacao(i))
+
+  # Mensagens formatadas (somente leitura; use registra() para acrescentar)
+  @property
+  def transacoes(self):
+    return list(self)
+
+  def _faixa(self, inicio, fim):
+    # os instantes são crescentes: a faixa é localizada por busca binária
+    ini = 0 if inicio is None else bisect_left(self._instantes, _timestamp(inicio))
+    end = len(self._instantes) if fim is None else bisect_right(self._instantes, _timestamp(fim))
+    return range(ini, end)
+
+  # filtra - transações (Transacao) da operação `op` (ou de todas) entre `inicio` e `fim`
+  # (datetime ou timestamp, inclusivos)
+  def filtra(self, op=None, inicio=None, fim=None):
+    for i in self._faixa(inicio, fim):
+      if op is None or self._ops[i] == op:
+        yield self._transacao(i)
+
+  # total - soma dos valores da operação `op` entre `inicio` e `fim`
+  # ex.: total de saques no mês - historico.total(SAQUE, inicio, fim)
+  def total(self, op, inicio=None, fim=None):
+    ops, valores = self._ops, self._valores
+    return sum(valores[i] for i in self._faixa(inicio, fim) if ops[i] == op)
+
+  # quantidade - número de transações da operação `op` entre `inicio` e `fim`
+  def quantidade(self, op, inicio=None, fim=None):
+    ops = self._ops
+    return sum(1 for i in self._faixa(inicio, fim) if ops[i] == op)
 
   def imprime(self):
     print(f'Data de abertura: {self.data_abertura}')
     print('Transações:')
-    for t in self.transacoes:
+    for t in self:
       print('-', t)
-    print('-----------------------------------')
\ No newline at end of file
+    print('-----------------------------------')
+
+
+def _timestamp(instante):
+  return instante.timestamp() if isinstance(instante, datetime.datetime) else instante
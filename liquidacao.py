@@ -0,0 +1,275 @@
+import csv
+import gzip
+import json
+import math
+from array import array
+from collections import deque
+from conta import Conta
+from historico import LIQUIDACAO
+
+try:
+  import numpy as np
+except ImportError:  # NumPy é opcional: sem ele o saldo líquido é somado em laço
+  np = None
+
+# Diferença abaixo da qual o saldo líquido é considerado zero (erros de arredondamento)
+TOLERANCIA = 1e-9
+
+SALDO_INSUFICIENTE = 'saldo insuficiente'
+CONTA_INEXISTENTE = 'conta inexistente'
+VALOR_INVALIDO = 'valor inválido'
+INSTRUCAO_INVALIDA = 'instrução inválida'
+
+
+# chave - (agencia, numero) a partir de [agencia, numero], {'agencia', 'numero'} ou 'agencia/numero'
+def chave(valor):
+  if isinstance(valor, dict):
+    valor = (valor['agencia'], valor['numero'])
+  elif isinstance(valor, str):
+    valor = valor.split('/')
+  agencia, numero = valor
+  return _inteiro(agencia), _inteiro(numero)
+
+
+def _inteiro(valor):
+  if isinstance(valor, str):
+    valor = valor.strip()
+    if valor.lstrip('-').isdigit():
+      return int(valor)
+  return valor
+
+
+def _abre(caminho):
+  if caminho.endswith('.gz'):
+    return gzip.open(caminho, 'rt', encoding='utf-8', newline='')
+  return open(caminho, 'r', encoding='utf-8', newline='')
+
+
+def _formato(caminho):
+  nome = caminho[:-3] if caminho.endswith('.gz') else caminho
+  if nome.endswith('.csv'):
+    return 'csv'
+  if nome.endswith('.jsonl') or nome.endswith('.ndjson'):
+    return 'jsonl'
+  raise ValueError(f'Formato não reconhecido: {caminho} (use formato="jsonl" ou "csv")')
+
+
+# le_instrucoes - lê o arquivo em streaming: (linha, origem, destino, valor) por instrução
+# * JSONL - {"origem": [1, 123], "destino": "2/234", "valor": 10.5}
+# * CSV - cabeçalho origem,destino,valor com as contas no formato agencia/numero
+# * Linhas malformadas saem com origem None e o erro em `valor`
+def le_instrucoes(caminho, formato=None):
+  formato = formato or _formato(caminho)
+  with _abre(caminho) as f:
+    if formato == 'jsonl':
+      for linha, texto in enumerate(f, 1):
+        if not texto.strip():
+          continue
+        try:
+          dados = json.loads(texto)
+          yield linha, dados['origem'], dados['destino'], dados['valor']
+        except (ValueError, KeyError, TypeError) as e:
+          yield linha, None, None, e
+    elif formato == 'csv':
+      for linha, dados in enumerate(csv.DictReader(f), 2):
+        try:
+          yield linha, dados['origem'], dados['destino'], dados['valor']
+        except KeyError as e:
+          yield linha, None, None, e
+    else:
+      raise ValueError(f'Formato desconhecido: {formato}')
+
+
+class ResultadoLiquidacao:
+  '''
+  Resultado de Liquidacao.liquida
+  * aceitas / rejeitadas - quantidade de instruções
+  * motivos - {linha: motivo} das instruções rejeitadas
+  * deltas - {(agencia, numero): saldo líquido aplicado} (contas sem movimento ficam de fora)
+  * volume - soma dos valores das instruções aceitas
+  '''
+
+  __slots__ = ['aceitas', 'motivos', 'deltas', 'volume']
+
+  def __init__(self):
+    self.aceitas = 0
+    self.motivos = {}
+    self.deltas = {}
+    self.volume = 0.0
+
+  @property
+  def rejeitadas(self):
+    return len(self.motivos)
+
+  def __str__(self):
+    linhas = [f'Aceitas: {self.aceitas} (R$ {self.volume:.2f})', f'Rejeitadas: {self.rejeitadas}']
+    por_motivo = {}
+    for motivo in self.motivos.values():
+      por_motivo[motivo] = por_motivo.get(motivo, 0) + 1
+    linhas.extend(f'- {motivo}: {n}' for motivo, n in por_motivo.items())
+    linhas.append(f'Contas movimentadas: {len(self.deltas)}')
+    return '\n'.join(linhas)
+
+
+class Liquidacao:
+  '''
+  Motor de liquidação de um lote de transferências
+  * As instruções ficam em arrays paralelos (índice da conta de origem, de destino, valor e linha)
+  * O saldo líquido de cada conta é calculado de uma vez (np.bincount ou um laço sem NumPy)
+  * Se alguma conta ficaria negativa (mesma regra de saca), seus débitos são rejeitados do
+    último para o primeiro até o saldo voltar a ser >= 0; como isso tira créditos de outras
+    contas, repete até nenhuma conta ficar negativa - o resultado depende só da ordem do arquivo
+  * Os saldos são aplicados com todas as contas travadas (Conta.trava) e cada conta recebe
+    uma única entrada LIQUIDACAO no histórico, em vez de uma por instrução
+  '''
+
+  def __init__(self, lote='lote'):
+    self.lote = lote
+    self._contas = []     # índice -> Conta
+    self._indices = {}    # (agencia, numero) -> índice
+    self._por_texto = {}  # 'agencia/numero' -> índice
+    self._origens = array('i')
+    self._destinos = array('i')
+    self._valores = array('d')
+    self._linhas = array('q')
+    self._motivos = {}
+
+  def __len__(self):
+    return len(self._valores)
+
+  def _indice(self, conta):
+    # as contas costumam se repetir no arquivo: o texto já visto vai direto ao índice
+    if isinstance(conta, str):
+      indice = self._por_texto.get(conta)
+      if indice is None:
+        indice = self._por_texto[conta] = self._indice(chave(conta))
+      return indice
+    if isinstance(conta, Conta):
+      chave_conta = (conta.agencia, conta.numero)
+    else:
+      chave_conta = chave(conta)
+    indice = self._indices.get(chave_conta)
+    if indice is None:
+      encontrada = conta if isinstance(conta, Conta) else Conta.busca(*chave_conta)
+      if encontrada is None:
+        return None
+      indice = self._indices[chave_conta] = len(self._contas)
+      self._contas.append(encontrada)
+    return indice
+
+  # adiciona - acrescenta uma instrução (contas como Conta, [agencia, numero] ou 'agencia/numero')
+  # Retorna False (e guarda o motivo) se a instrução for rejeitada já na leitura
+  def adiciona(self, origem, destino, valor, linha=None):
+    linha = len(self._valores) + len(self._motivos) + 1 if linha is None else linha
+    try:
+      i_origem = self._indice(origem)
+      i_destino = self._indice(destino)
+    except (ValueError, KeyError, TypeError):
+      self._motivos[linha] = INSTRUCAO_INVALIDA
+      return False
+    if i_origem is None or i_destino is None:
+      self._motivos[linha] = CONTA_INEXISTENTE
+      return False
+    try:
+      valor = float(valor)
+    except (ValueError, TypeError):
+      valor = math.nan
+    if not valor > 0 or math.isinf(valor):
+      self._motivos[linha] = VALOR_INVALIDO
+      return False
+    self._origens.append(i_origem)
+    self._destinos.append(i_destino)
+    self._valores.append(valor)
+    self._linhas.append(linha)
+    return True
+
+  # carrega - lê as instruções de um arquivo JSONL ou CSV (opcionalmente .gz) em streaming
+  def carrega(self, caminho, formato=None):
+    adiciona = self.adiciona
+    for linha, origem, destino, valor in le_instrucoes(caminho, formato):
+      if origem is None:
+        self._motivos[linha] = INSTRUCAO_INVALIDA
+      else:
+        adiciona(origem, destino, valor, linha)
+    return self
+
+  # Saldo líquido por conta (créditos - débitos) de todas as instruções
+  def _liquidos(self):
+    n = len(self._contas)
+    if np is not None and self._valores:
+      valores = np.frombuffer(self._valores, dtype='float64')
+      creditos = np.bincount(np.frombuffer(self._destinos, dtype='int32'), valores, n)
+      debitos = np.bincount(np.frombuffer(self._origens, dtype='int32'), valores, n)
+      return (creditos - debitos).tolist()
+    liquidos = [0.0] * n
+    for origem, destino, valor in zip(self._origens, self._destinos, self._valores):
+      liquidos[origem] -= valor
+      liquidos[destino] += valor
+    return liquidos
+
+  # Índices das instruções de cada conta de origem, na ordem do arquivo
+  def _debitos_por_conta(self):
+    debitos = {}
+    for i, origem in enumerate(self._origens):
+      lista = debitos.get(origem)
+      if lista is None:
+        lista = debitos[origem] = []
+      lista.append(i)
+    return debitos
+
+  # Rejeita débitos até nenhuma conta ficar negativa; retorna os índices rejeitados
+  # (chamado com as contas travadas, pois depende dos saldos atuais)
+  def _resolve_saldos(self, finais):
+    negativas = deque(i for i, saldo in enumerate(finais) if saldo < -TOLERANCIA)
+    if not negativas:
+      return set()
+    debitos = self._debitos_por_conta()
+    na_fila = set(negativas)
+    rejeitadas = set()
+    while negativas:
+      conta = negativas.popleft()
+      na_fila.discard(conta)
+      pendentes = debitos.get(conta, [])
+      while finais[conta] < -TOLERANCIA and pendentes:
+        j = pendentes.pop()
+        valor = self._valores[j]
+        destino = self._destinos[j]
+        rejeitadas.add(j)
+        finais[conta] += valor
+        finais[destino] -= valor
+        if finais[destino] < -TOLERANCIA and destino not in na_fila:
+          negativas.append(destino)
+          na_fila.add(destino)
+    return rejeitadas
+
+  # liquida - aplica o lote; retorna um ResultadoLiquidacao
+  def liquida(self):
+    resultado = ResultadoLiquidacao()
+    resultado.motivos.update(self._motivos)
+    liquidos = self._liquidos()
+    contas = self._contas
+    with Conta.trava(*contas), Conta._lock_totais:
+      finais = [c._saldo + d for c, d in zip(contas, liquidos)]
+      rejeitadas = self._resolve_saldos(finais)
+      for j in rejeitadas:
+        resultado.motivos[self._linhas[j]] = SALDO_INSUFICIENTE
+      movimentadas = set(self._origens) | set(self._destinos) if not rejeitadas else {
+        c for j in range(len(self._valores)) if j not in rejeitadas
+        for c in (self._origens[j], self._destinos[j])}
+      for i in sorted(movimentadas):
+        conta = contas[i]
+        # resíduos de arredondamento não podem deixar o saldo negativo
+        delta = max(finais[i], 0.0) - conta._saldo
+        if abs(delta) <= TOLERANCIA:
+          delta = 0.0
+        conta._ajusta_saldo(delta)
+        conta.historico.registra(LIQUIDACAO, delta, conta._saldo, self.lote)
+        resultado.deltas[(conta.agencia, conta.numero)] = delta
+    resultado.aceitas = len(self._valores) - len(rejeitadas)
+    resultado.volume = math.fsum(self._valores) - math.fsum(self._valores[j] for j in rejeitadas)
+    return resultado
+
+
+# liquida_arquivo - atalho: carrega um arquivo de instruções e liquida o lote
+def liquida_arquivo(caminho, formato=None, lote=None):
+  return Liquidacao(lote or caminho).carrega(caminho, formato).liquida()
@@ -3,10 +3,10 @@
 Este script tenta conectar ao Supabase usando `SupabaseConnection`.
 Se as variáveis de ambiente não estiverem configuradas, usa um cliente mock em memória
 para demonstração dos métodos CRUD via `BaseDAO`/DAOs específicos.
+Com `LOCAL_STORE_PATH` definido, usa o `LocalClient`, que persiste os dados nesse diretório;
+com `--mock`, usa o mock direto, sem carregar o SDK do Supabase.
 """
 
-from datetime import datetime
-from typing import Any, Dict
 import os
 import sys
 
@@ -16,125 +16,51 @@ PACKAGE_ROOT = os.path.join(ROOT, 'funcionario', 'ifrn')
 if PACKAGE_ROOT not in sys.path:
     sys.path.insert(0, PACKAGE_ROOT)
 
-try:
-    from empresa.config.database import SupabaseConnection
-    from empresa.dao.funcionario_dao import FuncionarioDAO
-    from empresa.dao.departamento_dao import DepartamentoDAO
-    REAL_CLIENT = True
-except Exception:
-    # Se ocorrer erro ao importar (ex.: variáveis de ambiente ausentes), usaremos mock
-    REAL_CLIENT = False
-
-
-class _MockResponse:
-    def __init__(self, data=None, status_code=200):
-        self.data = data
-        self.status_code = status_code
-
-
-class _MockTable:
-    def __init__(self, client: 'MockClient', name: str):
-        self.client = client
-        self.name = name
-        self._operation = None
-        self._payload = None
-        self._eq_field = None
-        self._eq_value = None
-
-    def select(self, *args, **kwargs):
-        self._operation = 'select'
-        return self
-
-    def insert(self, payload: Dict[str, Any]):
-        self._operation = 'insert'
-        self._payload = payload
-        return self
-
-    def update(self, payload: Dict[str, Any]):
-        self._operation = 'update'
-        self._payload = payload
-        return self
-
-    def delete(self):
-        self._operation = 'delete'
-        return self
-
-    def eq(self, field: str, value: Any):
-        self._eq_field = field
-        self._eq_value = value
-        return self
-
-    def execute(self):
-        store = self.client._store.setdefault(self.name, [])
-        if self._operation == 'select':
-            # retorna todos os registros
-            return _MockResponse(list(store))
-
-        if self._operation == 'insert':
-            item = dict(self._payload)
-            # atribui id incremental quando aplicável (numero) ou mantém cpf
-            if 'numero' in item and not item.get('numero'):
-                # next number
-                next_num = (max((r.get('numero') or 0) for r in store) + 1) if store else 1
-                item['numero'] = next_num
-            store.append(item)
-            return _MockResponse([item], 201)
-
-        if self._operation == 'update':
-            updated = []
-            for idx, r in enumerate(store):
-                if self._eq_field and r.get(self._eq_field) == self._eq_value:
-                    new = dict(r)
-                    new.update(self._payload)
-                    store[idx] = new
-                    updated.append(new)
-            return _MockResponse(updated)
-
-        if self._operation == 'delete':
-            removed = []
-            new_store = []
-            for r in store:
-                if self._eq_field and r.get(self._eq_field) == self._eq_value:
-                    removed.append(r)
-                else:
-                    new_store.append(r)
-            self.client._store[self.name] = new_store
-            return _MockResponse(removed)
-
-
-class MockClient:
-    def __init__(self):
-        self._store = {}
-
-    def table(self, name: str) -> _MockTable:
-        return _MockTable(self, name)
+from empresa.config.mock_client import MockClient
 
 
 def _print_section(title: str):
     print('\n' + '=' * 10 + ' ' + title + ' ' + '=' * 10)
 
 
-def main():
-    # obter client real ou mock
-    if REAL_CLIENT:
-        client = SupabaseConnection().client
-        # testar se a conexão é realmente utilizável; se houver erro (ex: chave inválida), usar mock
-        try:
-            probe = client.table('departamento').select('*').execute()
-            # se responder com status_code 401/403 ou payload de erro, considere inválido
-            bad_status = getattr(probe, 'status_code', None) in (401, 403)
-            bad_data = isinstance(getattr(probe, 'data', None), dict) and probe.data.get('code') in (401, 403)
-            if bad_status or bad_data:
-                raise Exception('Supabase probe retornou erro')
-            print('Usando Supabase real (variáveis de ambiente detectadas)')
-        except Exception:
-            print('Aviso: não foi possível usar Supabase real — usando mock para demonstração')
-            client = MockClient()
-    else:
-        client = MockClient()
+def _parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Exemplos de CRUD para funcionario e departamento.')
+    parser.add_argument('--mock', action='store_true', help='usa o cliente mock em memória sem testar o Supabase')
+    return parser.parse_args(argv)
+
+
+def _get_client(args):
+    # obter client local persistente, real ou mock
+    # * o SDK do Supabase só é importado quando há credenciais e o teste de conexão
+    #   (guardado em cache por alguns minutos) foi bem-sucedido
+    # * o .env é lido antes de tudo: LOCAL_STORE_PATH também pode vir dele
+    from empresa.config.database import load_environment
+    load_environment()
+    local_store = os.getenv('LOCAL_STORE_PATH')
+    if local_store:
+        from empresa.config.local_client import LocalClient
+        print(f'Usando armazenamento local em {local_store}')
+        return LocalClient(local_store)
+    if args.mock:
+        print('Usando cliente mock (modo demonstração)')
+        return MockClient()
+
+    from empresa.config.database import SupabaseConnection
+    if not SupabaseConnection.configured():
         print('Usando cliente mock (modo demonstração)')
+        return MockClient()
+    if SupabaseConnection.probe():
+        print('Usando Supabase real (variáveis de ambiente detectadas)')
+        return SupabaseConnection().client
+    print('Aviso: não foi possível usar Supabase real — usando mock para demonstração')
+    return MockClient()
+
+
+def main(argv=None):
+    client = _get_client(_parse_args(argv))
 
-    # importar DAOs (evita erro caso import anterior falhe)
+    # importar DAOs
     from empresa.dao.departamento_dao import DepartamentoDAO
     from empresa.dao.funcionario_dao import FuncionarioDAO
 
@@ -0,0 +1,96 @@
+"""Verifica o custo de inicialização de `main.py` com `python -X importtime`.
+
+Para cada cenário (`main.py --help` e `import main`) mede o tempo total de imports
+(soma da coluna "self" do importtime, mediana de várias execuções) e falha se:
+
+* algum módulo proibido (SDK do Supabase, dotenv, httpx, ...) for importado, ou
+* o tempo passar do orçamento (`--budget-ms`) ou do baseline salvo (`--baseline`)
+  com a tolerância de `--tolerance`.
+
+Uso:
+    python scripts/check_startup.py                          # só orçamento e módulos
+    python scripts/check_startup.py --write-baseline base.json
+    python scripts/check_startup.py --baseline base.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'main --help': [os.path.join(ROOT, 'main.py'), '--help'],
+    'import main': ['-c', 'import main'],
+}
+# módulos que o caminho do mock e o --help nunca devem carregar
+FORBIDDEN = ('supabase', 'dotenv', 'httpx', 'postgrest', 'gotrue', 'realtime', 'storage3')
+DEFAULT_BUDGET_MS = 100.0
+
+
+def measure(args, runs):
+    totals = []
+    modules = set()
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=ROOT,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise SystemExit(f'Falha ao executar {args}:\n{proc.stderr}')
+        total_us = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, _, name = line[len('import time:'):].split('|')
+            total_us += int(self_us)
+            modules.add(name.strip())
+        totals.append(total_us / 1000)
+    return statistics.median(totals), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--baseline', help='JSON gerado com --write-baseline para comparar')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='aumento aceito sobre o baseline (0.25 = 25%%)')
+    parser.add_argument('--write-baseline', help='grava os tempos medidos neste JSON')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    for name, cmd in SCENARIOS.items():
+        total_ms, modules = measure(cmd, args.runs)
+        results[name] = round(total_ms, 2)
+        loaded = sorted(m for m in modules if m.split('.')[0] in FORBIDDEN)
+        status = 'OK'
+        if loaded:
+            failures.append(f'{name}: importou {", ".join(loaded)}')
+            status = 'FALHA'
+        if total_ms > args.budget_ms:
+            failures.append(f'{name}: {total_ms:.1f} ms acima do orçamento de {args.budget_ms:.1f} ms')
+            status = 'FALHA'
+        if name in baseline and total_ms > baseline[name] * (1 + args.tolerance):
+            failures.append(f'{name}: {total_ms:.1f} ms contra baseline de {baseline[name]:.1f} ms')
+            status = 'FALHA'
+        print(f'{status:5} {name:12} {total_ms:8.1f} ms  ({len(modules)} módulos)')
+
+    if args.write_baseline:
+        with open(args.write_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f'Baseline gravado em {args.write_baseline}')
+
+    for failure in failures:
+        print('-', failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Exporta e importa as tabelas `funcionario`/`departamento` em JSONL, CSV ou Parquet.
+
+Usa `empresa/dao/export.py`: a exportação lê uma página por vez e a importação grava em lotes,
+então a memória não cresce com o tamanho da tabela. O formato vem da extensão do arquivo
+(.jsonl, .csv, .parquet; .gz para comprimir JSONL/CSV).
+
+    python scripts/export_import.py export funcionario funcionario.jsonl.gz
+    python scripts/export_import.py import funcionario funcionario.jsonl.gz --checkpoint f.ckpt
+    python scripts/export_import.py --local dados/ export departamento departamento.csv
+    python scripts/export_import.py --mock --generate 100000 export funcionario teste.parquet
+
+Sem `--mock`/`--local`, usa o Supabase configurado no `.env`. Com `--checkpoint`, uma
+importação interrompida continua de onde parou ao repetir o mesmo comando.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'funcionario', 'ifrn'))
+
+TABLES = ('funcionario', 'departamento')
+
+
+def get_client(args):
+    if args.local:
+        from empresa.config.local_client import LocalClient
+        return LocalClient(args.local)
+    if args.mock:
+        from empresa.config.mock_client import MockClient
+        return MockClient()
+    from empresa.config.database import SupabaseConnection
+    if not SupabaseConnection.configured():
+        raise SystemExit('SUPABASE_URL/SUPABASE_KEY não configurados (use --mock ou --local)')
+    return SupabaseConnection().client
+
+
+def get_dao(client, table):
+    if table == 'funcionario':
+        from empresa.dao.funcionario_dao import FuncionarioDAO
+        return FuncionarioDAO(client)
+    from empresa.dao.departamento_dao import DepartamentoDAO
+    return DepartamentoDAO(client)
+
+
+# Linhas sintéticas para testar a exportação sobre o MockClient
+def generate(dao, n):
+    from empresa.models import Departamento, Funcionario
+    if dao.table_name == 'departamento':
+        models = (Departamento(numero=i, nome=f'Departamento {i}', localizacao='Bloco A') for i in range(1, n + 1))
+    else:
+        models = (
+            Funcionario(cpf=f'{i:011d}', pnome='Ana', unome='Silva', data_nasc='1990-01-01', endereco='Rua A',
+                        salario=1000.0 + i % 5000, sexo='F', numero_departamento=i % 50)
+            for i in range(n)
+        )
+    dao.create_many(models)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mock', action='store_true', help='usa o MockClient em memória')
+    parser.add_argument('--local', help='usa o LocalClient persistido neste diretório')
+    parser.add_argument('--generate', type=int, default=0, help='com --mock, cria N linhas antes de exportar')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    exp = sub.add_parser('export', help='tabela -> arquivo')
+    exp.add_argument('table', choices=TABLES)
+    exp.add_argument('path')
+    exp.add_argument('--columns', help='colunas separadas por vírgula (padrão: todas)')
+    exp.add_argument('--page-size', type=int, default=1000)
+    exp.add_argument('--compression', default='snappy', help='codec do Parquet (snappy, zstd, gzip, none)')
+
+    imp = sub.add_parser('import', help='arquivo -> tabela')
+    imp.add_argument('table', choices=TABLES)
+    imp.add_argument('path')
+    imp.add_argument('--mode', choices=['upsert', 'insert'], default='upsert')
+    imp.add_argument('--batch-size', type=int, default=500)
+    imp.add_argument('--checkpoint', help='arquivo de progresso para continuar uma importação interrompida')
+    imp.add_argument('--rejects', help='JSONL com as linhas rejeitadas e o motivo')
+
+    args = parser.parse_args(argv)
+    if args.generate and not args.mock:
+        parser.error('--generate só vale com --mock')
+
+    from empresa.dao.export import export_table, import_table
+
+    client = get_client(args)
+    dao = get_dao(client, args.table)
+    start = time.perf_counter()
+    if args.command == 'export':
+        if args.generate:
+            generate(dao, args.generate)
+            start = time.perf_counter()
+        columns = args.columns.split(',') if args.columns else None
+        result = export_table(dao, args.path, columns=columns, page_size=args.page_size,
+                              compression=args.compression)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(args.path)
+        print(f'{result.rows} linhas em {result.pages} páginas -> {args.path} '
+              f'({result.format}, {size / 1e6:.1f} MB) em {elapsed:.2f} s')
+    else:
+        result = import_table(dao, args.path, mode=args.mode, batch_size=args.batch_size,
+                              checkpoint=args.checkpoint, rejects=args.rejects)
+        elapsed = time.perf_counter() - start
+        print(f'{result.written} gravadas, {result.rejected} rejeitadas, {result.skipped} puladas '
+              f'(checkpoint) de {args.path} em {elapsed:.2f} s')
+        for number, reason in list(result.reasons.items())[:10]:
+            print(f'  registro {number}: {reason}')
+    if hasattr(client, 'close'):
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Invalidação do `CachedDAO` em escritas concorrentes e em leituras por outros campos.
+
+    python -m unittest discover tests      # ou: python -m pytest tests
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'funcionario', 'ifrn'))
+
+from empresa.config.mock_client import MockClient  # noqa: E402
+from empresa.dao.cache import CachedDAO  # noqa: E402
+from empresa.dao.departamento_dao import DepartamentoDAO  # noqa: E402
+from empresa.models import Departamento  # noqa: E402
+
+
+class _LeituraLenta(DepartamentoDAO):
+    '''read que, depois de buscar a linha, espera a escrita concorrente terminar'''
+
+    def __init__(self, client):
+        super().__init__(client)
+        self.lida = threading.Event()
+        self.continua = threading.Event()
+
+    def read(self, id_value, id_field=None):
+        model = super().read(id_value, id_field)
+        if self.continua is not None:
+            self.lida.set()
+            self.continua.wait(5)
+        return model
+
+
+class CachedDAOInvalidacaoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = _LeituraLenta(MockClient())
+        self.dao.continua = None
+        self.dao.create(Departamento(numero=1, nome='Antigo', localizacao='Bloco A'))
+        self.cached = CachedDAO(self.dao)
+
+    def test_leitura_concorrente_nao_guarda_linha_antiga(self):
+        self.dao.continua = threading.Event()
+        leitor = threading.Thread(target=self.cached.read, args=(1,))
+        leitor.start()
+        self.assertTrue(self.dao.lida.wait(5))           # o leitor já tem a linha antiga
+        self.cached.update(1, Departamento(numero=1, nome='Novo', localizacao='Bloco A'))
+        self.dao.continua.set()
+        leitor.join(5)
+        self.dao.continua = None
+        self.assertEqual(self.cached.read(1).nome, 'Novo')
+
+    def test_delete_concorrente(self):
+        self.dao.continua = threading.Event()
+        leitor = threading.Thread(target=self.cached.read, args=(1,))
+        leitor.start()
+        self.assertTrue(self.dao.lida.wait(5))
+        self.cached.delete(1)
+        self.dao.continua.set()
+        leitor.join(5)
+        self.dao.continua = None
+        self.assertIsNone(self.cached.read(1))
+
+    def test_entrada_por_outro_campo(self):
+        self.assertEqual(self.cached.read('Antigo', id_field='nome').numero, 1)
+        self.cached.update_fields([1], {'localizacao': 'Bloco B'})
+        self.assertEqual(self.cached.read('Antigo', id_field='nome').localizacao, 'Bloco B')
+        self.cached.delete(1)
+        self.assertIsNone(self.cached.read('Antigo', id_field='nome'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Totais incrementais de `Conta` conferidos por `Conta.verifica_consistencia`.
+
+    python -m unittest discover tests      # ou: python -m pytest tests
+"""
+
+import gc
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cliente import Cliente  # noqa: E402
+from conta import Conta  # noqa: E402
+
+
+class VerificaConsistenciaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.contas = [Conta(Cliente(f'Cliente {i}', f'{i:011d}'), 900 + i % 2, i, f'pix{i}', 100.0)
+                       for i in range(4)]
+
+    def tearDown(self):
+        for conta in self.contas:
+            conta.encerra()
+        self.contas = []
+        gc.collect()
+
+    def test_operacoes_mantem_os_totais(self):
+        a, b, c, d = self.contas
+        a.deposita(50.0)
+        b.saca(30.0)
+        b.saca(1000.0)          # negado: não altera nada
+        a.transfere(b, 70.0)    # entre agências
+        c.transfere(a, 20.0)
+        d.transfere(c, 500.0)   # negada
+        self.assertEqual(Conta.verifica_consistencia(), [])
+        d.encerra()
+        self.assertEqual(Conta.verifica_consistencia(), [])
+        # conta coletada sai dos totais
+        self.contas.remove(c)
+        del c
+        gc.collect()
+        self.assertEqual(Conta.verifica_consistencia(), [])
+        self.assertEqual(Conta.get_saldo_agencia(900), a.saldo)
+
+    def test_detecta_total_por_agencia_corrompido(self):
+        with Conta._lock_totais:
+            Conta._saldo_por_agencia[901] += 10.0
+        try:
+            divergencias = Conta.verifica_consistencia()
+        finally:
+            with Conta._lock_totais:
+                Conta._saldo_por_agencia[901] -= 10.0
+        self.assertEqual(len(divergencias), 1)
+        self.assertIn('saldo da agência 901', divergencias[0])
+        self.assertEqual(Conta.verifica_consistencia(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""`ColumnFrame`/`GroupBy` com colunas vazias ou só com nulos.
+
+    python -m unittest discover tests      # ou: python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'funcionario', 'ifrn'))
+
+from empresa.config.mock_client import MockClient  # noqa: E402
+from empresa.dao.frame import FLOAT, ColumnFrame  # noqa: E402
+from empresa.dao.funcionario_dao import FuncionarioDAO  # noqa: E402
+
+
+class GroupBySemValoresTest(unittest.TestCase):
+
+    def test_tabela_vazia(self):
+        frame = FuncionarioDAO(MockClient()).read_columns(['numero_departamento', 'salario'])
+        self.assertEqual(len(frame), 0)
+        grupos = frame.groupby('numero_departamento')
+        self.assertEqual(grupos.sum('salario'), {})
+        self.assertEqual(grupos.mean('salario'), {})
+        self.assertEqual(grupos.count(), {})
+        self.assertEqual(grupos.count('salario'), {})
+
+    def test_coluna_so_com_nulos(self):
+        rows = [
+            {'numero_departamento': 1, 'salario': None},
+            {'numero_departamento': 2, 'salario': None},
+            {'numero_departamento': 1, 'salario': None},
+        ]
+        frame = ColumnFrame.from_rows(rows, ['numero_departamento', 'salario'])
+        self.assertEqual(frame.column('salario').kind, FLOAT)
+        self.assertEqual(frame.to_list('salario'), [None, None, None])
+        grupos = frame.groupby('numero_departamento')
+        self.assertEqual(grupos.sum('salario'), {1: 0, 2: 0})
+        self.assertEqual(grupos.mean('salario'), {1: None, 2: None})
+        self.assertEqual(grupos.count(), {1: 2, 2: 1})
+        self.assertEqual(grupos.count('salario'), {1: 0, 2: 0})
+
+    def test_chave_so_com_nulos(self):
+        rows = [{'numero_departamento': None, 'salario': 1.0}, {'numero_departamento': None, 'salario': 2.0}]
+        grupos = ColumnFrame.from_rows(rows, ['numero_departamento', 'salario']).groupby('numero_departamento')
+        self.assertEqual(grupos.sum('salario'), {None: 3.0})
+        self.assertEqual(grupos.count(), {None: 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Sincronização incremental da `Replica` sobre o `MockClient`.
+
+    python -m unittest discover tests      # ou: python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'funcionario', 'ifrn'))
+
+from empresa.config.mock_client import ManualClock, MockClient  # noqa: E402
+from empresa.dao.departamento_dao import DepartamentoDAO  # noqa: E402
+from empresa.dao.replica import Replica  # noqa: E402
+from empresa.models import Departamento  # noqa: E402
+
+
+def departamento(numero):
+    return Departamento(numero=numero, nome=f'Departamento {numero}', localizacao='Bloco A')
+
+
+class ReplicaSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = ManualClock()
+        self.dao = DepartamentoDAO(MockClient(clock=self.clock))
+        self.replica = Replica(self.dao)
+
+    def numeros(self):
+        return sorted(d.numero for d in self.replica.all())
+
+    def test_linha_gravada_no_mesmo_instante_da_marca_dagua(self):
+        self.dao.create(departamento(1))
+        self.replica.sync()
+        # mesmo updated_at da marca d'água, gravada depois do sync
+        self.dao.create(departamento(2))
+        self.assertEqual(self.replica.sync(), {'upserts': 1, 'deletes': 0})
+        self.clock.advance()
+        self.dao.create(departamento(3))
+        self.replica.sync()
+        self.assertEqual(self.numeros(), [1, 2, 3])
+
+    def test_sync_sem_alteracoes_nao_reaplica_linhas(self):
+        for numero in (1, 2):
+            self.dao.create(departamento(numero))
+        self.replica.sync()
+        self.assertEqual(self.replica.sync(), {'upserts': 0, 'deletes': 0})
+        self.assertEqual(self.numeros(), [1, 2])
+
+    def test_instante_maior_que_a_pagina(self):
+        self.replica = Replica(self.dao, page_size=2)
+        for numero in range(1, 6):
+            self.dao.create(departamento(numero))
+        self.replica.sync()
+        self.dao.create(departamento(6))
+        self.replica.sync()
+        self.assertEqual(self.numeros(), [1, 2, 3, 4, 5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()